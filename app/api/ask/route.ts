@@ -10,7 +10,14 @@ import {
   buildPracticeModePrompt,
   buildAnimationModePrompt,
 } from "@/utils/prompts";
-import { findClosestAnimation, getAnimationUrl } from "@/lib/animation-library";
+import {
+  ANIMATION_LIBRARY,
+  AnimationManifest,
+  applyManifest,
+  findClosestAnimation,
+  getAnimationUrl,
+  loadAnimationManifest,
+} from "@/lib/animation-library";
 
 import { TranscriptChunk } from "@/lib/types";
 
@@ -81,8 +88,18 @@ export async function POST(request: NextRequest) {
     // (AI can still answer general questions)
     // For animation mode, check pre-rendered library first
     let prerenderedMatch = null;
+    let animationManifest: AnimationManifest | undefined;
     if (mode === "animation") {
-      prerenderedMatch = findClosestAnimation(question);
+      // Durations come from the pre-render manifest when it loads
+      animationManifest = await loadAnimationManifest(
+        process.env.NEXT_PUBLIC_SUPABASE_URL!,
+      );
+      prerenderedMatch = findClosestAnimation(
+        question,
+        animationManifest
+          ? applyManifest(animationManifest)
+          : ANIMATION_LIBRARY,
+      );
       console.log(
         "Pre-rendered match:",
         prerenderedMatch ? prerenderedMatch.entry.title : "none",
@@ -107,6 +124,7 @@ export async function POST(request: NextRequest) {
               title: prerenderedMatch.entry.title,
               description: prerenderedMatch.entry.description,
               filename: prerenderedMatch.entry.filename,
+              duration: prerenderedMatch.entry.duration,
             }
             : null,
         );
@@ -154,6 +172,7 @@ export async function POST(request: NextRequest) {
           const animationUrl = getAnimationUrl(
             supabaseUrl,
             animationSpec.prerendered_filename,
+            animationManifest,
           );
 
           answer.animation_url = animationUrl;
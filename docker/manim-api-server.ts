@@ -1,7 +1,7 @@
 import express, { Request, Response } from 'express';
 import cors from 'cors';
 import { generateManimCode, createFallbackAnimation } from '../utils/manim-generator';
-import { executeManimCode } from '../utils/manim-executor';
+import { executeManimCode, executeTemplate, getWorkerFallbacks } from '../utils/manim-executor';
 
 const app = express();
 const PORT = process.env.PORT || 3001;
@@ -58,6 +58,8 @@ app.get('/health', (req: Request, res: Response) => {
     service: 'manim-api',
     timestamp: new Date().toISOString(),
     uptime: process.uptime(),
+    // Renders that bypassed the warm worker; a growing count means it is down
+    renderWorker: getWorkerFallbacks(),
   });
 });
 
@@ -163,6 +165,61 @@ app.post('/generate', async (req: Request, res: Response) => {
   }
 });
 
+// Render a production template from JSON parameters (no code generation).
+// The render worker validates the params against the template's JSON Schema.
+app.post('/render-template', async (req: Request, res: Response) => {
+  try {
+    const { template, params, quality = 'low' } = req.body;
+
+    if (typeof template !== 'string' || !/^[A-Za-z0-9_]+$/.test(template)) {
+      return res.status(400).json({
+        error: 'A valid template name is required',
+      });
+    }
+
+    if (!params || typeof params !== 'object' || Array.isArray(params)) {
+      return res.status(400).json({
+        error: 'Params must be a JSON object',
+      });
+    }
+
+    if (!['low', 'medium', 'high'].includes(quality)) {
+      return res.status(400).json({
+        error: 'Quality must be low, medium or high',
+      });
+    }
+
+    console.log('\n🎬 Rendering template:', template);
+    const outputName = `animation_${Date.now()}`;
+    const result = await executeTemplate(template, params, outputName, quality);
+
+    if (!result.success) {
+      console.error('❌ Template rendering failed');
+      return res.status(result.invalidParams ? 400 : 500).json({
+        error: result.error || 'Failed to render template',
+        logs: result.logs,
+      });
+    }
+
+    console.log('✅ Template rendered successfully!');
+    console.log('📹 Video URL:', result.videoPath);
+
+    res.json({
+      success: true,
+      videoUrl: result.videoPath,
+      message: 'Animation generated successfully',
+      template,
+      params,
+    });
+  } catch (error) {
+    console.error('❌ Render template API error:', error);
+    res.status(500).json({
+      error: error instanceof Error ? error.message : 'Internal server error',
+      stack: process.env.NODE_ENV === 'development' ? (error as Error).stack : undefined,
+    });
+  }
+});
+
 // Start server
 app.listen(PORT, () => {
   console.log('🚀 Manim API Server started');
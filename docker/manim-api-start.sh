@@ -0,0 +1,17 @@
+#!/bin/sh
+# Start the render worker under a restart loop, then the API server.
+# A worker that crashes or is OOM-killed comes back within a second instead of
+# leaving every render on the slow CLI fallback; the image's HEALTHCHECK
+# also probes the worker, so an orchestrator notices one that keeps failing.
+
+cd /app/manim-sandbox || exit 1
+
+(
+  while true; do
+    python -m render_worker serve --port 8000
+    echo "Render worker exited with status $?; restarting" >&2
+    sleep 1
+  done
+) &
+
+cd /app && exec node dist/docker/manim-api-server.js
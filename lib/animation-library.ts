@@ -11,6 +11,28 @@ export interface AnimationEntry {
   duration?: number; // seconds
 }
 
+/**
+ * manim-sandbox/pre-rendered/manifest.json, written by
+ * `python -m render_worker prerender-library` and uploaded next to the videos
+ */
+export interface AnimationManifestEntry {
+  filename: string;
+  file: string;      // Scene file, relative to manim-sandbox/
+  scene: string;     // Scene class
+  quality: string;
+  key: string;       // Hash of the scene source, quality and manim version
+  bytes: number;
+  sha256: string;
+  duration: number;  // seconds
+  rendered_at: string;
+}
+
+export interface AnimationManifest {
+  quality: string;
+  manim_version: string;
+  animations: { [name: string]: AnimationManifestEntry };
+}
+
 export interface AnimationLibrary {
   [category: string]: {
     [variation: string]: AnimationEntry;
@@ -152,12 +174,15 @@ export const ANIMATION_LIBRARY: AnimationLibrary = {
 };
 
 /**
- * Get all animations as a flat list
+ * Get all animations as a flat list (of `library`, e.g. one with durations
+ * from applyManifest)
  */
-export function getAllAnimations(): Array<AnimationEntry & { category: string; variation: string }> {
+export function getAllAnimations(
+  library: AnimationLibrary = ANIMATION_LIBRARY
+): Array<AnimationEntry & { category: string; variation: string }> {
   const result: Array<AnimationEntry & { category: string; variation: string }> = [];
 
-  for (const [category, variations] of Object.entries(ANIMATION_LIBRARY)) {
+  for (const [category, variations] of Object.entries(library)) {
     for (const [variation, entry] of Object.entries(variations)) {
       result.push({ ...entry, category, variation });
     }
@@ -171,10 +196,11 @@ export function getAllAnimations(): Array<AnimationEntry & { category: string; v
  * Returns { category, variation, entry } or null
  */
 export function findClosestAnimation(
-  query: string
+  query: string,
+  library: AnimationLibrary = ANIMATION_LIBRARY
 ): { category: string; variation: string; entry: AnimationEntry } | null {
   const queryLower = query.toLowerCase();
-  const allAnimations = getAllAnimations();
+  const allAnimations = getAllAnimations(library);
 
   // Score each animation by keyword matches
   const scored = allAnimations.map((anim) => {
@@ -223,17 +249,88 @@ export function findClosestAnimation(
 }
 
 /**
- * Get animation URL from Supabase Storage
+ * Get animation URL from Supabase Storage. With a manifest, the URL carries
+ * the video's hash so CDN caches pick up re-rendered videos.
+ */
+export function getAnimationUrl(
+  supabaseUrl: string,
+  filename: string,
+  manifest?: AnimationManifest
+): string {
+  const url = `${supabaseUrl}/storage/v1/object/public/animations/${filename}`;
+  const entry = manifest?.animations[filename.replace(/\.mp4$/, '')];
+  return entry ? `${url}?v=${entry.sha256.substring(0, 12)}` : url;
+}
+
+const MANIFEST_TTL_MS = 5 * 60 * 1000;
+// The manifest is optional; a slow storage response must not hold up an answer
+const MANIFEST_TIMEOUT_MS = 3000;
+let manifestCache: { manifest?: AnimationManifest; fetchedAt: number } | undefined;
+
+/**
+ * The manifest uploaded next to the videos (scripts/upload-animations.ts),
+ * refetched every few minutes. Undefined if it can't be loaded in time;
+ * callers then use ANIMATION_LIBRARY as it is.
+ */
+export async function loadAnimationManifest(
+  supabaseUrl: string
+): Promise<AnimationManifest | undefined> {
+  if (manifestCache && Date.now() - manifestCache.fetchedAt < MANIFEST_TTL_MS) {
+    return manifestCache.manifest;
+  }
+
+  let manifest: AnimationManifest | undefined;
+  try {
+    const response = await fetch(getAnimationUrl(supabaseUrl, 'manifest.json'), {
+      signal: AbortSignal.timeout(MANIFEST_TIMEOUT_MS),
+    });
+    if (response.ok) {
+      manifest = await response.json();
+    }
+  } catch (error) {
+    console.warn('Could not load animation manifest:', error);
+  }
+  manifestCache = { manifest, fetchedAt: Date.now() };
+  return manifest;
+}
+
+/**
+ * A copy of the library with durations filled in from the pre-render
+ * manifest. Entries the manifest doesn't list (not rendered yet) are copied
+ * as they are; ANIMATION_LIBRARY itself is never modified.
+ */
+export function applyManifest(
+  manifest: AnimationManifest,
+  library: AnimationLibrary = ANIMATION_LIBRARY
+): AnimationLibrary {
+  const merged: AnimationLibrary = {};
+  for (const [category, variations] of Object.entries(library)) {
+    merged[category] = {};
+    for (const [variation, entry] of Object.entries(variations)) {
+      const rendered = manifest.animations[entry.filename.replace(/\.mp4$/, '')];
+      merged[category][variation] = rendered ? { ...entry, duration: rendered.duration } : { ...entry };
+    }
+  }
+  return merged;
+}
+
+/**
+ * Library filenames that the manifest has no video for
  */
-export function getAnimationUrl(supabaseUrl: string, filename: string): string {
-  return `${supabaseUrl}/storage/v1/object/public/animations/${filename}`;
+export function missingFromManifest(manifest: AnimationManifest): string[] {
+  return getAllAnimations()
+    .map((anim) => anim.filename)
+    .filter((filename) => !manifest.animations[filename.replace(/\.mp4$/, '')]);
 }
 
 /**
  * Search animations by multiple keywords
  */
-export function searchAnimations(keywords: string[]): AnimationEntry[] {
-  const allAnimations = getAllAnimations();
+export function searchAnimations(
+  keywords: string[],
+  library: AnimationLibrary = ANIMATION_LIBRARY
+): AnimationEntry[] {
+  const allAnimations = getAllAnimations(library);
   const keywordsLower = keywords.map((k) => k.toLowerCase());
 
   return allAnimations
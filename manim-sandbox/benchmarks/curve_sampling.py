@@ -0,0 +1,83 @@
+"""
+Benchmark: curve sampling
+
+Renders SineWave, CubicFunction and ParabolaDerivative with uniform
+(axes.plot) and adaptive (templates/sampling.py) sampling, and reports the
+Bezier points of every plotted curve and the render time.
+
+Usage (inside the sandbox container):
+  docker-compose run --rm manim python benchmarks/curve_sampling.py [--quality low_quality] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SANDBOX_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SANDBOX_DIR / "templates"))
+
+from manim import ParametricFunction, tempconfig  # noqa: E402
+
+from calculus_derivative import ParabolaDerivative  # noqa: E402
+from function_graph import CubicFunction, SineWave  # noqa: E402
+
+
+SCENES = [SineWave, CubicFunction, ParabolaDerivative]
+
+
+def variant(scene_cls, adaptive):
+    """Subclass that toggles sampling and records every curve added to the scene."""
+    def add(self, *mobjects):
+        for mobject in mobjects:
+            for member in mobject.get_family():
+                if isinstance(member, ParametricFunction):
+                    self.curves[id(member)] = len(member.points)
+        return scene_cls.add(self, *mobjects)
+
+    def setup(self):
+        self.curves = {}
+        scene_cls.setup(self)
+
+    return type(scene_cls.__name__, (scene_cls,), {
+        "adaptive_sampling": adaptive,
+        "add": add,
+        "setup": setup,
+    })
+
+
+def run(scene_cls, adaptive, quality, repeat):
+    times = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="bench_") as media_dir:
+            with tempconfig({
+                "quality": quality,
+                "media_dir": media_dir,
+                "disable_caching": True,
+                "progress_bar": "none",
+                "verbosity": "WARNING",
+            }):
+                scene = variant(scene_cls, adaptive)()
+                started = time.perf_counter()
+                scene.render()
+                times.append(time.perf_counter() - started)
+    return sum(scene.curves.values()), len(scene.curves), min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--quality", default="low_quality")
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of N renders")
+    args = parser.parse_args(argv)
+
+    print(f"{'scene':<20} {'sampling':<9} {'curves':>6} {'points':>7} {'render s':>9}")
+    for scene_cls in SCENES:
+        for adaptive in (False, True):
+            points, curves, seconds = run(scene_cls, adaptive, args.quality, args.repeat)
+            label = "adaptive" if adaptive else "uniform"
+            print(f"{scene_cls.__name__:<20} {label:<9} {curves:>6} {points:>7} {seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
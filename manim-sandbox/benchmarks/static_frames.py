@@ -0,0 +1,63 @@
+"""
+Benchmark: static frames
+
+Renders scenes with and without "static_frames" (render_worker/
+static_frames.py) and reports the render time of each: scenes that hold
+still behind an updater, where repeats are skipped, and scenes that keep
+moving, where every frame pays for the fingerprint and none is repeated.
+
+Usage (inside the sandbox container):
+  docker-compose run --rm manim python benchmarks/static_frames.py [--quality low] [--repeat 3]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+SANDBOX_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SANDBOX_DIR))
+
+from render_worker.render import run_job  # noqa: E402
+from render_worker.settings import QUALITIES  # noqa: E402
+
+
+SCENES = [
+    ("attention_mechanism", "AttentionMechanism"),
+    ("bayes_theorem_fixed", "BayesTheoremFixed"),
+    ("function_graph", "SineWave"),
+    ("vector_addition", "VectorAdditionScene"),
+]
+
+
+def run(template, scene, static, quality, repeat):
+    times = []
+    for _ in range(repeat):
+        result = run_job({
+            "template": template,
+            "scene": scene,
+            "quality": quality,
+            "static_frames": static,
+            # Every play is rendered, none comes from the partial movie cache
+            "movie_cache": False,
+        })
+        if not result["success"]:
+            raise SystemExit(f"{scene}: {result['error']}")
+        times.append(result["render_time"])
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--quality", default="low", choices=list(QUALITIES))
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of N renders")
+    args = parser.parse_args(argv)
+
+    print(f"{'scene':<22} {'direct s':>9} {'static s':>9} {'speedup':>8}")
+    for template, scene in SCENES:
+        direct = run(template, scene, False, args.quality, args.repeat)
+        static = run(template, scene, True, args.quality, args.repeat)
+        print(f"{scene:<22} {direct:>9.2f} {static:>9.2f} {direct / static:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
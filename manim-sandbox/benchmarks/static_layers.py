@@ -0,0 +1,117 @@
+"""
+Benchmark: static layers
+
+Renders scenes whose settled mobjects sit after a moving one in drawing
+order, with and without "static_layers" (render_worker/layers.py), and
+reports the render time of each. It also compares the raw frames of the two
+renders (every --every'th frame, before encoding) and reports the largest
+per-channel difference; compositing a layer rounds differently from drawing
+onto the frame, so antialiased edges may move by a level or two. A scene
+whose difference exceeds TOLERANCE fails the run.
+
+Usage (inside the sandbox container):
+  docker-compose run --rm manim python benchmarks/static_layers.py [--quality low] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+SANDBOX_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SANDBOX_DIR))
+
+from render_worker.render import create_scene, job_config, run_job  # noqa: E402
+from render_worker.scenes import load_scene_class, resolve_scene_file  # noqa: E402
+from render_worker.settings import QUALITIES  # noqa: E402
+
+
+# Largest per-channel difference (of 255) a layered frame may show
+TOLERANCE = 2
+
+SCENES = [
+    ("ols_visual", "OLSVisual"),
+    ("vector_addition", "VectorAdditionScene"),
+    ("linear_regression", "LinearRegression"),
+    ("function_graph", "SineWave"),
+]
+
+
+def run(template, scene, layers, quality, repeat):
+    times = []
+    for _ in range(repeat):
+        result = run_job({
+            "template": template,
+            "scene": scene,
+            "quality": quality,
+            "static_layers": layers,
+            # Every play is rendered, none comes from the partial movie cache
+            "movie_cache": False,
+        })
+        if not result["success"]:
+            raise SystemExit(f"{scene}: {result['error']}")
+        times.append(result["render_time"])
+    return min(times)
+
+
+def sampled_frames(template, scene, layers, quality, every):
+    """Every `every`th frame the renderer hands to the file writer."""
+    from manim import tempconfig
+
+    job = {"template": template, "scene": scene, "quality": quality,
+           "static_layers": layers, "movie_cache": False}
+    frames = []
+    with tempfile.TemporaryDirectory(prefix="bench_layers_") as work_dir:
+        scene_file, scene_name = resolve_scene_file(job, work_dir)
+        with tempconfig(job_config(job, scene_file, Path(work_dir) / "media")):
+            instance = create_scene(load_scene_class(scene_file, scene_name), job)
+            renderer = instance.renderer
+            add_frame = renderer.add_frame
+            count = [0]
+
+            def sampling_add_frame(frame, num_frames=1):
+                if count[0] % every == 0:
+                    frames.append(frame.copy())
+                count[0] += num_frames
+                add_frame(frame, num_frames)
+
+            renderer.add_frame = sampling_add_frame
+            instance.render()
+    return frames
+
+
+def max_difference(template, scene, quality, every):
+    import numpy as np
+
+    direct = sampled_frames(template, scene, False, quality, every)
+    layered = sampled_frames(template, scene, True, quality, every)
+    if len(direct) != len(layered):
+        raise SystemExit(f"{scene}: {len(direct)} sampled frames direct, {len(layered)} layered")
+    return max(
+        (int(np.abs(a.astype(np.int16) - b.astype(np.int16)).max()) for a, b in zip(direct, layered)),
+        default=0,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--quality", default="low", choices=list(QUALITIES))
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of N renders")
+    parser.add_argument("--every", type=int, default=5, help="Compare every Nth frame")
+    args = parser.parse_args(argv)
+
+    print(f"{'scene':<22} {'direct s':>9} {'layers s':>9} {'speedup':>8} {'max diff':>9}")
+    failed = []
+    for template, scene in SCENES:
+        direct = run(template, scene, False, args.quality, args.repeat)
+        layered = run(template, scene, True, args.quality, args.repeat)
+        difference = max_difference(template, scene, args.quality, args.every)
+        if difference > TOLERANCE:
+            failed.append(scene)
+        print(f"{scene:<22} {direct:>9.2f} {layered:>9.2f} {direct / layered:>7.2f}x {difference:>9}")
+    if failed:
+        raise SystemExit(f"Layered frames differ by more than {TOLERANCE}/255: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
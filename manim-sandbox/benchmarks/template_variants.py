@@ -0,0 +1,104 @@
+"""
+Benchmark: template variant batches
+
+Renders families of template variants two ways on the same warm pool: as
+independent parallel jobs (what separate requests get) and as one variant
+batch (render_worker/variants.py, POST /render-variants). Reports the plays
+each family shares, what the batch spent on playback and prefix renders, and
+the wall time of both, so a family is only sent as a batch when that pays.
+
+Usage (inside the sandbox container):
+  docker-compose run --rm manim python benchmarks/template_variants.py [--quality low] [--repeat 3]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SANDBOX_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SANDBOX_DIR))
+# A throwaway cache, so the partial movie cache can be emptied between runs
+os.environ["RENDER_CACHE_HOME"] = tempfile.mkdtemp(prefix="bench_variants_")
+
+from render_worker.pool import WarmPool  # noqa: E402
+from render_worker.render import run_job  # noqa: E402
+from render_worker.settings import MOVIE_CACHE_DIR, QUALITIES  # noqa: E402
+from render_worker.variants import render_variants  # noqa: E402
+
+
+FAMILIES = {
+    # Named subclasses: every variant has its own title
+    "tree scenes": [
+        {"template": "probability_tree", "scene": scene}
+        for scene in ("CoinFlipTree", "WeatherTree", "MedicalTestTree")
+    ],
+    # Personalised params under a common title
+    "tree params": [
+        {"template": "probability_tree", "params": {"tree": [
+            {"label": "A", "prob": p}, {"label": "B", "prob": round(1 - p, 2)},
+        ]}}
+        for p in (0.5, 0.3, 0.9)
+    ],
+    "graph params": [
+        {"template": "function_graph", "params": {"function": function}}
+        for function in ("x**2", "x**2 - 2*x", "0.5*x**2 + 1")
+    ],
+}
+
+
+def fresh_jobs(jobs, quality):
+    # Neither mode may be answered from the result cache
+    return [{**job, "quality": quality, "result_cache": False} for job in jobs]
+
+
+def independent(pool, jobs):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as threads:
+        results = list(threads.map(pool.render, jobs))
+    return {"success": all(result.get("success") for result in results)}
+
+
+def run(pool, family, quality, batch):
+    shutil.rmtree(MOVIE_CACHE_DIR, ignore_errors=True)
+    jobs = fresh_jobs(FAMILIES[family], quality)
+    started = time.perf_counter()
+    result = render_variants(jobs, pool) if batch else independent(pool, jobs)
+    seconds = time.perf_counter() - started
+    if not result["success"]:
+        raise SystemExit(f"{family}: {result.get('error') or 'a variant failed'}")
+    return seconds, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--quality", default="low", choices=list(QUALITIES))
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of N runs")
+    args = parser.parse_args(argv)
+
+    # Warm the Tex and Text caches, which both modes then share
+    for jobs in FAMILIES.values():
+        for job in fresh_jobs(jobs, args.quality):
+            run_job(job)
+
+    pool = WarmPool(size=max(len(jobs) for jobs in FAMILIES.values()))
+    try:
+        print(f"{'family':<14} {'shared':>6} {'playback s':>10} {'prefix s':>9} "
+              f"{'separate s':>10} {'batch s':>8}")
+        for family in FAMILIES:
+            separate = min(run(pool, family, args.quality, False)[0] for _ in range(args.repeat))
+            batches = [run(pool, family, args.quality, True) for _ in range(args.repeat)]
+            seconds, result = min(batches, key=lambda batch: batch[0])
+            shared = max((prefix["plays"] for prefix in result["shared_prefixes"]), default=0)
+            print(f"{family:<14} {shared:>6} {result['playback_time']:>10.2f} {result['prefix_time']:>9.2f} "
+                  f"{separate:>10.2f} {seconds:>8.2f}")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+Render Worker
+Long-lived Python process that renders Manim scenes for the Juliette API
+
+The worker imports manim once and keeps warm processes around, so a render
+request only pays for constructing and encoding its own scene instead of
+interpreter start-up and ``from manim import *`` every time.
+
+Run command:
+  docker-compose run --rm -p 8000:8000 manim python -m render_worker serve --host 0.0.0.0
+"""
@@ -0,0 +1,288 @@
+"""
+Render Worker command line
+
+Usage:
+  python -m render_worker serve [--mode pool|zygote] [--host HOST] [--port PORT] [--workers N]
+  python -m render_worker render --template function_graph --scene SineWave [--quality low]
+  python -m render_worker render --template function_graph --params '{"function": "x**3 - x"}'
+  python -m render_worker render --code-file scene.py [--scene GeneratedScene]
+  python -m render_worker preflight --code-file scene.py
+  python -m render_worker estimate --template binary_search_v2 --scene BinarySearchV2 [--timeline]
+  python -m render_worker render --template attention_mechanism --scene AttentionMechanism --sections
+  python -m render_worker render-variants --template probability_tree --scene CoinFlipTree --scene WeatherTree
+  python -m render_worker prerender-library [--workers N] [--force] [--only NAME ...]
+  python -m render_worker list-scenes [--dir templates] [--json | --modules]
+  python -m render_worker build-tex-format
+  python -m render_worker warm-text-cache
+  python -m render_worker bake-caches
+  python -m render_worker render --template vector_proj_3d --scene Projection3D --quality 4k --parallel-frames
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from . import settings
+
+
+def cmd_serve(args):
+    from .server import serve
+
+    if args.mode == "zygote":
+        from .zygote import ZygoteRenderer
+
+        renderer = ZygoteRenderer(size=args.workers, timeout=args.timeout)
+    else:
+        from .pool import WarmPool
+
+        renderer = WarmPool(
+            size=args.workers,
+            max_jobs_per_worker=args.max_jobs,
+            timeout=args.timeout,
+        )
+    serve(renderer, args.host, args.port)
+
+
+def cmd_build_tex_format(args):
+    from .tex_format import build_format
+
+    for path in build_format():
+        print(f"Built {path}")
+    return 0
+
+
+def cmd_warm_text_cache(args):
+    from .text_cache import prewarm
+
+    print(f"Pre-rendered {prewarm()} texts")
+    return 0
+
+
+def cmd_bake_caches(args):
+    from .bake import bake
+
+    summary = bake()
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+def cmd_list_scenes(args):
+    from .catalog import scan
+
+    scene_dirs = [settings.SANDBOX_DIR / name for name in args.dir] if args.dir else settings.SCENE_DIRS
+    scenes = scan(scene_dirs)
+    if args.json:
+        print(json.dumps(scenes, indent=2))
+    elif args.modules:
+        print("\n".join(dict.fromkeys(scene["module"] for scene in scenes)))
+    else:
+        for scene in scenes:
+            print(f"{scene['file']}:{scene['scene']}")
+    return 0
+
+
+def cmd_prerender_library(args):
+    from .library import prerender_library
+
+    summary = prerender_library(args.workers, quality=args.quality, force=args.force, only=args.only)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+def build_job(args):
+    job = {"quality": args.quality}
+    if args.code_file:
+        job["code"] = Path(args.code_file).read_text(encoding="utf-8")
+    else:
+        job["template"] = args.template
+    if args.scene:
+        job["scene"] = args.scene
+    if args.params:
+        # JSON, or @path to a JSON file
+        params = args.params
+        if params.startswith("@"):
+            params = Path(params[1:]).read_text(encoding="utf-8")
+        job["params"] = json.loads(params)
+    if args.media_dir:
+        job["media_dir"] = args.media_dir
+    if args.stream_id:
+        job["stream_id"] = args.stream_id
+    if args.single_pipe:
+        job["single_pipe"] = True
+    if args.renditions:
+        job["renditions"] = args.renditions
+    if args.static_frames:
+        job["static_frames"] = True
+    if args.static_layers:
+        job["static_layers"] = True
+    if args.parallel_frames:
+        job["parallel_frames"] = True
+        job["frame_workers"] = args.frame_workers
+    return job
+
+
+def cmd_render(args):
+    if args.sections:
+        from .pool import WarmPool
+        from .sections import render_sections
+
+        pool = WarmPool(size=args.workers)
+        try:
+            result = render_sections(build_job(args), pool, max_chunks=args.workers)
+        finally:
+            pool.close()
+    else:
+        from .render import run_job
+
+        result = run_job(build_job(args))
+    print(json.dumps(result, indent=2))
+    return 0 if result["success"] else 1
+
+
+def cmd_preflight(args):
+    from .render import run_job
+
+    result = run_job({**build_job(args), "action": "preflight"})
+    print(json.dumps(result, indent=2))
+    return 0 if result["success"] else 1
+
+
+def cmd_estimate(args):
+    from .registry import template_job
+    from .timeline import admission, analyze_job
+
+    job = build_job(args)
+    if job.get("params") is not None:
+        job = template_job(job)
+    analysis = analyze_job(job)
+    if not args.timeline:
+        del analysis["timeline"]
+    analysis["admission"] = admission(analysis, args.quality, busy=0, workers=1)
+    print(json.dumps(analysis, indent=2))
+    return 0
+
+
+def cmd_render_variants(args):
+    from .pool import WarmPool
+    from .variants import render_variants
+
+    base = {"template": args.template, "quality": args.quality}
+    jobs = [{**base, "scene": scene} for scene in args.scene or []]
+    for params in args.params or []:
+        if params.startswith("@"):
+            params = Path(params[1:]).read_text(encoding="utf-8")
+        jobs.append({**base, "params": json.loads(params)})
+    if not jobs:
+        print("Give at least one --scene or --params", file=sys.stderr)
+        return 2
+
+    pool = WarmPool(size=args.workers)
+    try:
+        result = render_variants(jobs, pool)
+    finally:
+        pool.close()
+    print(json.dumps(result, indent=2))
+    return 0 if result["success"] else 1
+
+
+def add_job_arguments(parser):
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--template", help="Template or example module name, e.g. function_graph")
+    source.add_argument("--code-file", help="Python file containing the scene")
+    parser.add_argument("--scene", help="Scene class name (default: GeneratedScene for code)")
+    parser.add_argument("--params", help="Template parameters as JSON (or @file.json), see GET /templates")
+    parser.add_argument("--quality", default=settings.DEFAULT_QUALITY, choices=list(settings.QUALITIES))
+    parser.add_argument("--media-dir", help="Where manim writes its output")
+    parser.add_argument("--stream-id", help="Also write a live HLS playlist to RENDER_STREAM_DIR/<id>/")
+    parser.add_argument("--single-pipe", action="store_true",
+                        help="Encode the whole scene through one encoder, without partial movie files")
+    parser.add_argument("--renditions", nargs="+", choices=list(settings.QUALITIES),
+                        help="Also encode these qualities from the same frames")
+    parser.add_argument("--static-frames", action="store_true",
+                        help="Draw frames that didn't change once and repeat them")
+    parser.add_argument("--static-layers", action="store_true",
+                        help="Paint settled mobjects from cached layers instead of redrawing them")
+    parser.add_argument("--parallel-frames", action="store_true",
+                        help="Split the frames of long animations across processes")
+    parser.add_argument("--frame-workers", type=int, help="Processes per animation (default: CPU count)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m render_worker")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the HTTP render worker")
+    serve_parser.add_argument("--host", default=settings.DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=settings.DEFAULT_PORT)
+    serve_parser.add_argument("--mode", default=settings.RENDER_MODE, choices=["pool", "zygote"],
+                              help="Warm long-lived processes, or one fork of a warm zygote per render")
+    serve_parser.add_argument("--workers", type=int, default=settings.DEFAULT_WORKERS,
+                              help="Pool size, or concurrent renders in zygote mode")
+    serve_parser.add_argument("--max-jobs", type=int, default=settings.MAX_JOBS_PER_WORKER,
+                              help="Recycle a worker process after this many renders")
+    serve_parser.add_argument("--timeout", type=float, default=settings.RENDER_TIMEOUT)
+    serve_parser.set_defaults(func=cmd_serve)
+
+    format_parser = commands.add_parser("build-tex-format",
+                                        help="Precompile the default Tex template preamble")
+    format_parser.set_defaults(func=cmd_build_tex_format)
+
+    text_parser = commands.add_parser("warm-text-cache",
+                                      help="Pre-render the library's Text labels into the shared cache")
+    text_parser.set_defaults(func=cmd_warm_text_cache)
+
+    bake_parser = commands.add_parser("bake-caches",
+                                      help="Fill the Tex, text and fontconfig caches from the scene library")
+    bake_parser.set_defaults(func=cmd_bake_caches)
+
+    render_parser = commands.add_parser("render", help="Render a single job in this process")
+    add_job_arguments(render_parser)
+    render_parser.add_argument("--sections", action="store_true",
+                               help="Render # SECTION blocks in parallel worker processes")
+    render_parser.add_argument("--workers", type=int, default=settings.DEFAULT_WORKERS)
+    render_parser.set_defaults(func=cmd_render)
+
+    preflight_parser = commands.add_parser("preflight",
+                                           help="Run a scene's construct() without rendering, to check it")
+    add_job_arguments(preflight_parser)
+    preflight_parser.set_defaults(func=cmd_preflight)
+
+    estimate_parser = commands.add_parser("estimate",
+                                          help="Estimate a scene's timeline and render time from its source")
+    add_job_arguments(estimate_parser)
+    estimate_parser.add_argument("--timeline", action="store_true", help="Include every play and wait")
+    estimate_parser.set_defaults(func=cmd_estimate)
+
+    list_parser = commands.add_parser("list-scenes",
+                                      help="List scenes by parsing the scene files (no manim import)")
+    list_parser.add_argument("--dir", action="append", help="Scene directory under manim-sandbox/ (repeatable)")
+    list_output = list_parser.add_mutually_exclusive_group()
+    list_output.add_argument("--json", action="store_true", help="Docstrings, attributes and render commands")
+    list_output.add_argument("--modules", action="store_true", help="Only the modules that define scenes")
+    list_parser.set_defaults(func=cmd_list_scenes)
+
+    library_parser = commands.add_parser("prerender-library",
+                                         help="Render the animation library's changed scenes into pre-rendered/")
+    library_parser.add_argument("--workers", type=int, default=settings.DEFAULT_WORKERS)
+    library_parser.add_argument("--quality", default="medium", choices=list(settings.QUALITIES))
+    library_parser.add_argument("--force", action="store_true", help="Re-render up-to-date animations too")
+    library_parser.add_argument("--only", nargs="+", metavar="NAME", help="Only these output names")
+    library_parser.set_defaults(func=cmd_prerender_library)
+
+    variants_parser = commands.add_parser("render-variants",
+                                          help="Render variants of a template, sharing their common opening")
+    variants_parser.add_argument("--template", required=True)
+    variants_parser.add_argument("--scene", action="append", help="A variant scene class (repeatable)")
+    variants_parser.add_argument("--params", action="append",
+                                 help="A variant's params as JSON or @file.json (repeatable)")
+    variants_parser.add_argument("--quality", default=settings.DEFAULT_QUALITY, choices=list(settings.QUALITIES))
+    variants_parser.add_argument("--workers", type=int, default=settings.DEFAULT_WORKERS)
+    variants_parser.set_defaults(func=cmd_render_variants)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -0,0 +1,86 @@
+"""
+Render Worker: cache baking
+
+Fills the caches a render would otherwise build on the fly (compiled LaTeX,
+Pango text SVGs, the fontconfig cache) by playing back every scene in
+templates/ and examples/ without rasterizing or encoding anything. Run at
+image build so new replicas start warm:
+
+    python -m render_worker bake-caches
+
+Template scenes that fail are reported and make the command exit non-zero:
+the worker renders templates by name, so a broken one is a real error.
+Examples are only a warm-up corpus; one that fails is listed under
+"skipped" and logged, and the bake goes on.
+"""
+
+import logging
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from .playback import play_scene
+from .scenes import load_module
+from .settings import SCENE_DIRS, TEMPLATES_DIR
+from .tex_batch import prepare_tex
+from .text_cache import prewarm
+from .warmup import warm
+
+
+logger = logging.getLogger("manim")
+
+
+def library_scenes(scene_dirs=SCENE_DIRS, failed=None):
+    """
+    [(file, scene class), ...] for every Scene defined in the scene
+    directories. Files that don't import are added to `failed`.
+    """
+    from manim import Scene
+
+    scenes = []
+    for path in sorted(path for scene_dir in scene_dirs for path in Path(scene_dir).glob("*.py")):
+        try:
+            module = load_module(path)
+        except Exception as error:
+            logger.warning(f"Skipping {path.name}: {error}")
+            if failed is not None:
+                failed.append(path.name)
+            continue
+        for value in vars(module).values():
+            if (
+                isinstance(value, type)
+                and issubclass(value, Scene)
+                and value.__module__ == module.__name__
+            ):
+                scenes.append((path, value))
+    return scenes
+
+
+def bake(scene_dirs=SCENE_DIRS, required_dirs=(TEMPLATES_DIR,)):
+    """
+    Warm every cache from the scene library. Returns a summary dict; scenes
+    in `required_dirs` that fail are "failed", any others "skipped".
+    """
+    from manim import tempconfig
+
+    warm()
+    # Pango will also write $XDG_CACHE_HOME/fontconfig (warm() points it at CACHE_HOME)
+    if shutil.which("fc-cache"):
+        subprocess.run(["fc-cache"], check=False)
+
+    required_dirs = {Path(scene_dir).resolve() for scene_dir in required_dirs}
+    summary = {"scenes": 0, "failed": [], "skipped": [], "texts": prewarm(scene_dirs), "tex_batched": 0}
+    with tempfile.TemporaryDirectory(prefix="bake_") as media_dir:
+        with tempconfig({"media_dir": media_dir}):
+            for scene_dir in scene_dirs:
+                failures = summary["failed" if Path(scene_dir).resolve() in required_dirs else "skipped"]
+                for path, scene_cls in library_scenes([scene_dir], failures):
+                    try:
+                        summary["tex_batched"] += prepare_tex(scene_cls)
+                        play_scene(scene_cls)
+                        summary["scenes"] += 1
+                    except Exception as error:
+                        logger.warning(f"Could not bake {path.name}:{scene_cls.__name__}: {error}")
+                        failures.append(f"{path.name}:{scene_cls.__name__}")
+    return summary
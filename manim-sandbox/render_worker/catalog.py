@@ -0,0 +1,177 @@
+"""
+Render Worker: scene catalog
+
+Lists every scene in templates/ and examples/ by parsing the files with
+``ast`` - nothing is imported, so listing doesn't pay for ``import manim``
+and works on a host without manim installed.
+
+A class is a scene if it derives (directly, or through other classes in the
+same file) from one of manim's Scene classes. For each scene the catalog
+records its docstring, its class attributes (the template parameters,
+inherited ones included) and the command that renders it.
+
+Parsed files are cached by mtime and size, in memory and in
+CACHE_HOME/scene_catalog.json, so repeated listings only re-parse files
+that changed.
+
+    python -m render_worker list-scenes [--dir templates] [--json]
+"""
+
+import ast
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from .settings import CACHE_HOME, SANDBOX_DIR, SCENE_DIRS
+
+
+CACHE_FILE = CACHE_HOME / "scene_catalog.json"
+CACHE_VERSION = 1
+
+SCENE_BASES = {
+    "Scene",
+    "ThreeDScene",
+    "SpecialThreeDScene",
+    "MovingCameraScene",
+    "ZoomedScene",
+    "VectorScene",
+    "LinearTransformationScene",
+}
+
+_memory = {}
+_lock = threading.Lock()
+
+
+def _attribute_value(node):
+    """A class attribute's value: the literal when it is one, else its source."""
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return {"expression": ast.unparse(node)}
+
+
+def _class_attributes(node):
+    attributes = {}
+    for item in node.body:
+        if isinstance(item, ast.Assign) and len(item.targets) == 1:
+            target, value = item.targets[0], item.value
+        elif isinstance(item, ast.AnnAssign) and item.value is not None:
+            target, value = item.target, item.value
+        else:
+            continue
+        # Public, lower-case attributes are parameters; CONSTANTS are layout
+        if isinstance(target, ast.Name) and not target.id.startswith("_") and not target.id.isupper():
+            attributes[target.id] = _attribute_value(value)
+    return attributes
+
+
+def _base_names(node):
+    names = []
+    for base in node.bases:
+        if isinstance(base, ast.Name):
+            names.append(base.id)
+        elif isinstance(base, ast.Attribute):
+            names.append(base.attr)
+    return names
+
+
+def parse_scenes(path):
+    """The scenes defined in one file, as a list of dicts."""
+    path = Path(path)
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+
+    def lineage(name, seen=()):
+        """Local classes from `name` up, and whether a manim Scene is reached."""
+        node = classes[name]
+        chain, is_scene = [node], False
+        for base in _base_names(node):
+            if base in SCENE_BASES:
+                is_scene = True
+            elif base in classes and base not in seen:
+                base_chain, base_is_scene = lineage(base, (*seen, name))
+                chain += base_chain
+                is_scene = is_scene or base_is_scene
+        return chain, is_scene
+
+    try:
+        relative = path.resolve().relative_to(SANDBOX_DIR).as_posix()
+    except ValueError:
+        relative = str(path)
+
+    scenes = []
+    for name, node in classes.items():
+        chain, is_scene = lineage(name)
+        if not is_scene:
+            continue
+        attributes = {}
+        for ancestor in reversed(chain):
+            attributes.update(_class_attributes(ancestor))
+        docstring = next((ast.get_docstring(ancestor) for ancestor in chain if ast.get_docstring(ancestor)), None)
+        scenes.append({
+            "scene": name,
+            "module": path.stem,
+            "file": relative,
+            "line": node.lineno,
+            "bases": _base_names(node),
+            "docstring": docstring,
+            "attributes": attributes,
+            "render_command": f"manim -pql {relative} {name}",
+        })
+    return scenes
+
+
+def _load_cache():
+    try:
+        cache = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return cache.get("files", {}) if cache.get("version") == CACHE_VERSION else {}
+
+
+def _save_cache(files):
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_FILE.parent, prefix=".scene_catalog-")
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            json.dump({"version": CACHE_VERSION, "files": files}, fp)
+        os.replace(tmp_name, CACHE_FILE)
+    except OSError:
+        # Read-only checkout: the in-memory cache still works
+        pass
+
+
+def scan(scene_dirs=SCENE_DIRS):
+    """Every scene in `scene_dirs`, re-parsing only files whose mtime changed."""
+    with _lock:
+        if not _memory:
+            _memory.update(_load_cache())
+
+        scenes = []
+        changed = False
+        for path in sorted(path for scene_dir in scene_dirs for path in Path(scene_dir).glob("*.py")):
+            stat = path.stat()
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            entry = _memory.get(str(path))
+            if entry is None or entry["stamp"] != stamp:
+                try:
+                    entry = {"stamp": stamp, "scenes": parse_scenes(path)}
+                except SyntaxError as error:
+                    entry = {"stamp": stamp, "scenes": [], "error": f"SyntaxError: {error}"}
+                _memory[str(path)] = entry
+                changed = True
+            scenes.extend(entry["scenes"])
+
+        if changed:
+            _save_cache(_memory)
+        return scenes
+
+
+def find_scene(module, scene_name, scene_dirs=SCENE_DIRS):
+    """The catalog entry for `module`.`scene_name`, or None."""
+    for scene in scan(scene_dirs):
+        if scene["module"] == module and scene["scene"] == scene_name:
+            return scene
+    return None
@@ -0,0 +1,227 @@
+"""
+Render Worker: frame-parallel rendering
+
+A single long self.play (a 3D camera move, a LaggedStart over hundreds of
+dots) is normally rasterized frame by frame on one core. In this mode the
+frames of one play are split into contiguous blocks, one per process:
+
+  1. The worker sets the play up as usual (begin_animations, static frame).
+  2. It forks one child per block. The fork is a copy-on-write snapshot of the
+     scene at the start of the play, so nothing has to be pickled.
+  3. Each child interpolates the animations at its own times (animations
+     are alpha-based, so any frame can be produced independently), rasterizes
+     them and encodes its block to MP4.
+  4. The blocks are joined in order into the play's partial movie file and
+     the parent jumps its scene to the end of the play.
+
+Only plays that are safe to split are parallelized: anything with updaters
+(which may depend on the previous frame) or a stop condition, frozen waits
+and plays shorter than FRAME_PARALLEL_MIN_FRAMES render serially.
+
+The blocks share the job's timeout (its "timeout", set by the pool or zygote
+that runs it). When one block fails, the others are killed before the play
+raises, so no child keeps rendering frames nobody will join.
+"""
+
+import os
+import select
+import signal
+import time
+import traceback
+from pathlib import Path
+
+from .media import VideoEncoder, concat_videos
+from .settings import FRAME_PARALLEL_MIN_FRAMES, RENDER_TIMEOUT
+
+
+def frame_workers(job):
+    """Number of processes a play is split across."""
+    return max(1, int(job.get("frame_workers") or os.cpu_count() or 1))
+
+
+def _has_updaters(scene):
+    if scene.updaters or scene.always_update_mobjects:
+        return True
+    return any(mobject.updaters for mobject in scene.get_mobject_family_members())
+
+
+def _split(times, blocks):
+    """Split `times` into at most `blocks` contiguous, non-empty blocks."""
+    import numpy as np
+
+    return [block for block in np.array_split(times, blocks) if len(block)]
+
+
+def _render_block(renderer, scene, times, path):
+    """Child process: render the frames at `times` into `path`."""
+    from manim import config
+
+    encoder = VideoEncoder(path, config.pixel_width, config.pixel_height, config.frame_rate)
+    scene.last_t = times[0]
+    for t in times:
+        scene.update_to_time(t)
+        renderer.update_frame(scene, scene.moving_mobjects)
+        encoder.write(renderer.get_frame())
+    encoder.close()
+
+
+def _fork_block(renderer, scene, times, path):
+    """
+    Fork a child that renders one block. Returns (pid, fd); the child writes
+    its traceback to fd on failure and exits non-zero.
+
+    os.fork rather than multiprocessing: pool and zygote workers are daemonic
+    processes, which multiprocessing doesn't allow to have children.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        status = 0
+        try:
+            _render_block(renderer, scene, times, path)
+        except BaseException:
+            os.write(write_fd, traceback.format_exc().encode("utf-8", "replace"))
+            status = 1
+        finally:
+            os._exit(status)
+    os.close(write_fd)
+    return pid, read_fd
+
+
+def _kill_block(pid):
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    os.waitpid(pid, 0)
+
+
+def _wait_block(pid, fd, deadline, timeout):
+    """Wait for a block child; returns None on success or an error message."""
+    chunks = []
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                _kill_block(pid)
+                return f"timed out after {timeout:.0f}s"
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+    _, status = os.waitpid(pid, 0)
+    if chunks:
+        return b"".join(chunks).decode("utf-8", "replace")
+    if status != 0:
+        return f"exited with status {status}"
+    return None
+
+
+def _wait_blocks(children, deadline, timeout):
+    """
+    Wait for every block child in order. On the first failure the rest are
+    killed; returns that failure's message, or None if all succeeded.
+    """
+    for index, (pid, fd) in enumerate(children):
+        error = _wait_block(pid, fd, deadline, timeout)
+        if error is not None:
+            for other_pid, other_fd in children[index + 1:]:
+                _kill_block(other_pid)
+                os.close(other_fd)
+            return f"frame block {index}: {error}"
+    return None
+
+
+class FrameParallelRenderer:
+    """CairoRenderer mixin that renders long plays across processes."""
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        serial_play_internal = scene.play_internal
+
+        def play_internal(skip_rendering=False):
+            times = self.parallel_times(scene, skip_rendering)
+            if times is None:
+                return serial_play_internal(skip_rendering)
+            return self.play_parallel(scene, times)
+
+        scene.play_internal = play_internal
+
+    def parallel_times(self, scene, skip_rendering):
+        """Frame times of the current play, or None if it must render serially."""
+        import numpy as np
+        from manim import config
+
+        if skip_rendering or self.skip_animations or scene.skip_animation_preview:
+            return None
+        if scene.stop_condition is not None or _has_updaters(scene):
+            return None
+        duration = scene.get_run_time(scene.animations)
+        times = np.arange(0, duration, 1 / config.frame_rate)
+        if len(times) < FRAME_PARALLEL_MIN_FRAMES:
+            return None
+        return times
+
+    def play_parallel(self, scene, times):
+        from manim import config
+
+        scene.duration = scene.get_run_time(scene.animations)
+        output_file = Path(self.file_writer.partial_movie_files[self.num_plays])
+        blocks = _split(times, min(frame_workers(self.job), len(times) // 2))
+        block_files = [
+            output_file.with_name(f"{output_file.stem}.block{index:03d}.mp4")
+            for index in range(len(blocks))
+        ]
+
+        children = [_fork_block(self, scene, block, path) for block, path in zip(blocks, block_files)]
+        timeout = self.job.get("timeout") or RENDER_TIMEOUT
+        error = _wait_blocks(children, time.monotonic() + timeout, timeout)
+        if error is not None:
+            for path in block_files:
+                path.unlink(missing_ok=True)
+            raise RuntimeError(f"Frame-parallel render failed:\n{error}")
+
+        concat_videos(block_files, output_file)
+        for path in block_files:
+            path.unlink(missing_ok=True)
+        self.file_writer.partial_movie_written = True
+
+        # Bring the parent's scene to where a serial play would leave it
+        scene.update_to_time(times[-1])
+        for animation in scene.animations:
+            animation.finish()
+            animation.clean_up_from_scene(scene)
+        scene.update_mobjects(0)
+        self.static_image = None
+        self.time += len(times) / config.frame_rate
+
+
+class FrameParallelFileWriter:
+    """
+    SceneFileWriter mixin that opens a play's stream on its first frame, so
+    plays whose partial movie file is written elsewhere never open one.
+    """
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        self.stream_pending = allow_write
+        self.pending_file_path = file_path
+        self.partial_movie_written = False
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if self.stream_pending:
+            super().begin_animation(True, self.pending_file_path)
+            self.stream_pending = False
+        super().write_frame(frame_or_renderer, num_frames)
+
+    def end_animation(self, allow_write=False):
+        if self.partial_movie_written:
+            return
+        if self.stream_pending:
+            # Nothing was written; still leave a (empty) partial movie file
+            super().begin_animation(True, self.pending_file_path)
+            self.stream_pending = False
+        super().end_animation(allow_write)
@@ -0,0 +1,168 @@
+"""
+Render Worker: cached static layers
+
+manim draws the mobjects a play doesn't touch into a background image once
+per play, but only those that come before the first moving mobject in
+drawing order. Everything after it is redrawn every frame: the axes and
+data dots added after an always_redraw line in OLSVisual, the NumberPlane of
+VectorAdditionScene once anything under it has an updater.
+
+LayeredRenderer splits each frame's drawing list (after manim's own z_index
+sorting) into runs of mobjects that changed since the previous frame and
+runs that didn't (same fingerprint as static_frames.py, whose states are
+reused when it has just computed them for the frame). A settled run with
+enough points to be worth it is drawn once into a transparent layer; while
+it stays settled, later frames paint that layer over the frame, clipped to
+what it covers, instead of drawing its mobjects again. Per-frame cost goes
+with what moves. Painting a premultiplied layer OVER the frame matches
+drawing its mobjects onto the frame in order up to rounding: the layer is
+stored at 8 bits per premultiplied channel before it is composited, so
+antialiased edges and translucent fills can land a level or two off.
+benchmarks/static_layers.py reports the largest difference per scene and
+fails above its TOLERANCE.
+
+Layers last one play and are dropped as soon as their run changes. Only
+plain VMobjects are layered (images, point clouds and background-image
+fills draw through numpy, without cairo's premultiplied alpha), frames
+where a MovingCamera moves draw everything directly, and ThreeDCamera
+scenes (depth sorting, shading) are left to manim.
+
+Off unless a job sets "static_layers": true, until benchmarks/static_layers.py
+shows it pays for the layers' extra surfaces and bookkeeping.
+"""
+
+import itertools
+
+from .settings import LAYER_MIN_POINTS
+from .static_frames import mobject_state
+
+
+class Layer:
+    """A run of settled mobjects drawn into a transparent frame-sized surface."""
+
+    def __init__(self, camera, mobjects):
+        import numpy as np
+
+        self.pixels = np.zeros_like(camera.pixel_array)
+        camera.display_multiple_vectorized_mobjects(mobjects, self.pixels)
+        self.surface = camera.get_cairo_context(self.pixels).get_target()
+        self.surface.flush()
+
+        # Pixel box of what the run covers (alpha is the 4th byte)
+        rows = np.flatnonzero(self.pixels[:, :, 3].any(axis=1))
+        columns = np.flatnonzero(self.pixels[:, :, 3].any(axis=0))
+        if len(rows):
+            self.box = (columns[0], rows[0], columns[-1] + 1 - columns[0], rows[-1] + 1 - rows[0])
+        else:
+            self.box = None
+
+    def paint(self, camera):
+        if self.box is None:
+            return
+        ctx = camera.get_cairo_context(camera.pixel_array)
+        ctx.save()
+        ctx.identity_matrix()
+        ctx.new_path()
+        ctx.rectangle(*(int(value) for value in self.box))
+        ctx.clip()
+        ctx.set_source_surface(self.surface, 0, 0)
+        ctx.paint()
+        ctx.restore()
+
+    def release(self, camera):
+        # Camera caches a cairo context per pixel array
+        cache = getattr(camera, "pixel_array_to_cairo_context", None)
+        if cache is not None:
+            cache.pop(id(self.pixels), None)
+
+
+def _layerable(mobject):
+    from manim import VMobject
+
+    return isinstance(mobject, VMobject) and mobject.get_background_image() is None
+
+
+class LayeredRenderer:
+    """CairoRenderer mixin that paints settled runs of mobjects from cached layers."""
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self.layering = False
+        self.layers = {}
+        self.member_states = {}
+        self.camera_state = None
+        play_internal = scene.play_internal
+
+        def play_internal_layered(skip_rendering=False):
+            self.layering = True
+            try:
+                return play_internal(skip_rendering)
+            finally:
+                self.layering = False
+                self.drop_layers()
+                self.member_states = {}
+
+        scene.play_internal = play_internal_layered
+
+    def drop_layers(self):
+        for layer in self.layers.values():
+            layer.release(self.camera)
+        self.layers = {}
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True, ignore_skipping=True, **kwargs):
+        from manim import ThreeDCamera
+        from manim.utils.iterables import list_update
+
+        if not self.layering or kwargs or not include_submobjects or isinstance(self.camera, ThreeDCamera):
+            return super().update_frame(scene, mobjects, include_submobjects, ignore_skipping, **kwargs)
+        if self.skip_animations and not ignore_skipping:
+            return
+        if not mobjects:
+            mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+        if self.static_image is not None:
+            self.camera.set_frame_to_background(self.static_image)
+        else:
+            self.camera.reset()
+        self.capture_layered(self.camera.get_mobjects_to_display(mobjects))
+
+    def state(self, member):
+        # Already computed for this frame when StaticFrameRenderer is on
+        states = getattr(self, "frame_states", None)
+        if states is not None and id(member) in states:
+            return states[id(member)]
+        return mobject_state(member)
+
+    def capture_layered(self, members):
+        camera = self.camera
+        frame = getattr(camera, "frame", None)
+        camera_state = tuple(self.state(member) for member in frame.get_family()) if frame else None
+        if camera_state != self.camera_state:
+            # The camera moved: every layer is drawn at the wrong place
+            self.camera_state = camera_state
+            self.drop_layers()
+            self.member_states = {}
+
+        states = [self.state(member) for member in members]
+        settled = [
+            _layerable(member) and self.member_states.get(id(member)) == state
+            for member, state in zip(members, states)
+        ]
+        self.member_states = {id(member): state for member, state in zip(members, states)}
+
+        layers = {}
+        for is_settled, run in itertools.groupby(range(len(members)), settled.__getitem__):
+            run = list(run)
+            run_mobjects = [members[index] for index in run]
+            key = tuple(states[index] for index in run)
+            if is_settled and (key in self.layers or
+                               sum(len(mobject.points) for mobject in run_mobjects) >= LAYER_MIN_POINTS):
+                layer = self.layers.pop(key, None) or Layer(camera, run_mobjects)
+                layer.paint(camera)
+                layers[key] = layer
+            else:
+                for group_type, group in itertools.groupby(run_mobjects, camera.type_or_raise):
+                    camera.display_funcs[group_type](list(group), camera.pixel_array)
+
+        # Runs that changed (or went away) lose their layer
+        self.drop_layers()
+        self.layers = layers
@@ -0,0 +1,238 @@
+"""
+Render Worker: animation library pre-render
+
+Builds pre-rendered/, the MP4s lib/animation-library.ts serves instantly,
+and pre-rendered/manifest.json describing them. Replaces the old
+pre-render-library.sh, which started a container per scene and rendered
+everything serially with caching disabled:
+
+    python -m render_worker prerender-library [--workers N] [--force] [--only NAME ...]
+
+  - One process, a WarmPool of render workers: scenes render in parallel and
+    nobody pays container or interpreter start-up more than once.
+  - Incremental: each animation is keyed by its scene file and the sibling
+    modules it imports (result_cache.source_hash), the scene class, quality
+    and manim version. Animations whose key matches the manifest and whose
+    MP4 is still there are skipped.
+  - The manifest is rewritten after every finished render, so an
+    interrupted build keeps its progress.
+
+scripts/upload-animations.ts uploads what the manifest lists (and only what
+changed since its last upload).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from pathlib import Path
+
+from .catalog import scan
+from .media import video_duration
+from .result_cache import source_hash
+from .settings import PRE_RENDERED_DIR, RENDER_ROOT, SANDBOX_DIR, SCENE_DIRS
+from .store import content_key
+
+
+MANIFEST_FILE = "manifest.json"
+LIBRARY_QUALITY = "medium"  # 720p30
+# Library scenes are long; a single render may take minutes
+LIBRARY_TIMEOUT = 1800
+
+# Output name of each library scene, by (module, scene class). The names
+# are lib/animation-library.ts's filenames and all differ from the class
+# names; the scene files come from the catalog.
+LIBRARY_NAMES = {
+    # Linear Regression
+    ("linear_regression", "LinearRegression"): "linear_regression_basic",
+    ("linear_regression", "LinearRegressionInteractive"): "linear_regression_interactive",
+
+    # OLS Method
+    ("ols_method", "OLSMethod"): "ols_method_main",
+    ("ols_method", "OLSMatrix"): "ols_method_matrix",
+    ("ols_visual", "OLSVisual"): "ols_visual_main",
+    ("ols_visual", "OLSAnimation"): "ols_visual_animated",
+
+    # Attention Mechanism
+    ("attention_mechanism", "AttentionMechanism"): "attention_mechanism_main",
+    ("attention_mechanism", "SelfAttentionVisual"): "attention_self_attention",
+
+    # Matrix Multiplication
+    ("matmul_v2", "MatMulV2"): "matrix_multiplication_visual",
+    ("matmul_v2", "MatMulVisual"): "matrix_multiplication_simple",
+
+    # Bayes Theorem
+    ("bayes_theorem_fixed", "BayesTheoremFixed"): "bayes_theorem_main",
+    ("bayes_theorem_fixed", "SpatialLayoutDemo"): "bayes_spatial_layout",
+
+    # Counting Problems
+    ("counting_problems", "CountingProblems"): "counting_problems_main",
+    ("counting_problems", "VisualCounting"): "counting_visual_combinations",
+
+    # Binary Search
+    ("binary_search_v2", "BinarySearchV2"): "binary_search_demo",
+
+    # Vector Projection
+    ("vector_proj_3d", "Projection3D"): "vector_projection_3d",
+}
+
+
+def library(scene_dirs=SCENE_DIRS):
+    """
+    The library as (scene file, scene class, output name), from the scene
+    catalog. Raises ValueError for names whose scene the catalog doesn't have.
+    """
+    found = {
+        (scene["module"], scene["scene"]): SANDBOX_DIR / scene["file"]
+        for scene in scan(scene_dirs)
+    }
+    entries = []
+    for (module, scene_name), name in LIBRARY_NAMES.items():
+        if (module, scene_name) not in found:
+            raise ValueError(f"{name}: no scene {scene_name} in {module}.py")
+        entries.append((found[(module, scene_name)], scene_name, name))
+    return entries
+
+
+def library_key(path, scene_name, quality):
+    """What an animation's MP4 depends on."""
+    return content_key(
+        "library",
+        metadata.version("manim"),
+        quality,
+        Path(path).relative_to(SANDBOX_DIR).as_posix(),
+        scene_name,
+        source_hash(path),
+    )
+
+
+def load_manifest(output_dir=PRE_RENDERED_DIR):
+    try:
+        return json.loads((Path(output_dir) / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"animations": {}}
+
+
+def write_manifest(manifest, output_dir=PRE_RENDERED_DIR):
+    """Atomically replace the manifest."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=output_dir, prefix=".manifest-")
+    with os.fdopen(fd, "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, indent=2, sort_keys=True)
+        fp.write("\n")
+    os.replace(tmp_name, output_dir / MANIFEST_FILE)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def plan(manifest, quality, output_dir=PRE_RENDERED_DIR, force=False, only=None):
+    """
+    Split the library into (to render, up to date). Each item is
+    (file, scene, name, key). Raises ValueError for library entries whose
+    file or class doesn't exist.
+    """
+    stale, fresh = [], []
+    for path, scene_name, name in library():
+        if only and name not in only:
+            continue
+        key = library_key(path, scene_name, quality)
+        entry = manifest["animations"].get(name, {})
+        up_to_date = entry.get("key") == key and (Path(output_dir) / f"{name}.mp4").exists()
+        (fresh if up_to_date and not force else stale).append((path, scene_name, name, key))
+    return stale, fresh
+
+
+def prerender_library(workers, quality=LIBRARY_QUALITY, output_dir=PRE_RENDERED_DIR,
+                      force=False, only=None):
+    """Render what changed in the library. Returns a summary dict."""
+    from .pool import WarmPool
+
+    started = time.time()
+    output_dir = Path(output_dir)
+    manifest = load_manifest(output_dir)
+    stale, fresh = plan(manifest, quality, output_dir, force, only)
+
+    # Drop animations that left the library
+    names = set(LIBRARY_NAMES.values())
+    manifest["animations"] = {
+        name: entry for name, entry in manifest["animations"].items() if name in names
+    }
+    manifest.update({"quality": quality, "manim_version": metadata.version("manim")})
+
+    summary = {
+        "rendered": [],
+        "up_to_date": [name for _, _, name, _ in fresh],
+        "failed": [],
+    }
+    if not stale:
+        write_manifest(manifest, output_dir)
+        summary["render_time"] = round(time.time() - started, 3)
+        return summary
+
+    build_dir = RENDER_ROOT / f"library_{uuid.uuid4().hex}"
+    lock = threading.Lock()
+
+    def render(item):
+        path, scene_name, name, key = item
+        result = pool.render({
+            "template": path.stem,
+            "scene": scene_name,
+            "quality": quality,
+            "media_dir": str(build_dir / name / "media"),
+        })
+        if not result.get("success"):
+            with lock:
+                summary["failed"].append({"name": name, "error": result.get("error")})
+            print(f"[library] ✗ {name}: {result.get('error')}", flush=True)
+            return
+
+        target = output_dir / f"{name}.mp4"
+        fd, tmp_name = tempfile.mkstemp(dir=output_dir, prefix=f".{name}-")
+        os.close(fd)
+        shutil.copyfile(result["video_path"], tmp_name)
+        os.replace(tmp_name, target)
+
+        entry = {
+            "filename": target.name,
+            "file": path.relative_to(SANDBOX_DIR).as_posix(),
+            "scene": scene_name,
+            "quality": quality,
+            "key": key,
+            "bytes": target.stat().st_size,
+            "sha256": file_sha256(target),
+            "duration": round(video_duration(target), 3),
+            "render_time": result.get("render_time"),
+            "rendered_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        with lock:
+            manifest["animations"][name] = entry
+            summary["rendered"].append(name)
+            write_manifest(manifest, output_dir)
+        print(f"[library] ✓ {name} ({entry['bytes'] / 1024 / 1024:.1f} MB, "
+              f"{result.get('render_time')}s)", flush=True)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pool = WarmPool(size=max(1, min(workers, len(stale))), timeout=LIBRARY_TIMEOUT)
+    try:
+        with ThreadPoolExecutor(max_workers=len(stale)) as threads:
+            list(threads.map(render, stale))
+    finally:
+        pool.close()
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    write_manifest(manifest, output_dir)
+    summary["render_time"] = round(time.time() - started, 3)
+    return summary
@@ -0,0 +1,106 @@
+"""
+Render Worker: media helpers
+
+Container-level operations on rendered MP4s. These use PyAV (already a
+manim dependency) the same way manim's own SceneFileWriter does, so they
+work in images that don't ship an ffmpeg binary.
+"""
+
+from pathlib import Path
+
+
+def concat_videos(input_files, output_file):
+    """
+    Join MP4 files that share codec settings into one file without
+    re-encoding (equivalent to ``ffmpeg -f concat -c copy``).
+    """
+    import av
+
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    list_file = output_file.with_suffix(".concat.txt")
+    with list_file.open("w", encoding="utf-8") as fp:
+        for input_file in input_files:
+            fp.write(f"file 'file:{Path(input_file).resolve().as_posix()}'\n")
+
+    source = av.open(str(list_file), format="concat", options={"safe": "0", "an": "1"})
+    target = av.open(str(output_file), mode="w")
+    try:
+        source_stream = source.streams.video[0]
+        target_stream = target.add_stream(codec_name=None, template=source_stream)
+        for packet in source.demux(source_stream):
+            # Skip the flushing packets demux() yields at the end
+            if packet.dts is None:
+                continue
+            # dts restarts in every input file; let libav recompute it
+            packet.dts = None
+            packet.stream = target_stream
+            target.mux(packet)
+    finally:
+        source.close()
+        target.close()
+        list_file.unlink(missing_ok=True)
+
+    return output_file
+
+
+def video_duration(path):
+    """Duration of a video file in seconds."""
+    import av
+
+    with av.open(str(path)) as container:
+        stream = container.streams.video[0]
+        if stream.duration is not None:
+            return float(stream.duration * stream.time_base)
+        return container.duration / av.time_base
+
+
+def encode_repeated(stream, container, frame, num_frames):
+    """
+    Encode an RGBA frame `num_frames` times into `stream`. The conversion to
+    the stream's pixel format is done once, not per repeat.
+    """
+    import av
+
+    if stream.pix_fmt == "yuv420p":
+        planes = av.VideoFrame.from_ndarray(frame, format="rgba").reformat(format="yuv420p").to_ndarray()
+        frame_format = "yuv420p"
+    else:
+        planes, frame_format = frame, "rgba"
+    for _ in range(num_frames):
+        # A VideoFrame can't be reused once encoded
+        av_frame = av.VideoFrame.from_ndarray(planes, format=frame_format)
+        for packet in stream.encode(av_frame):
+            container.mux(packet)
+
+
+class VideoEncoder:
+    """
+    Encodes RGBA frames (manim pixel arrays) into an MP4 with the same codec
+    settings manim uses for partial movie files, so the result can be
+    stream-copied together with manim's own segments.
+    """
+
+    def __init__(self, path, width, height, frame_rate, crf=23):
+        import av
+        from manim.scene.scene_file_writer import to_av_frame_rate
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.container = av.open(str(self.path), mode="w")
+        self.stream = self.container.add_stream(
+            "libx264",
+            rate=to_av_frame_rate(frame_rate),
+            options={"crf": str(crf)},
+        )
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = width
+        self.stream.height = height
+
+    def write(self, frame, num_frames=1):
+        encode_repeated(self.stream, self.container, frame, num_frames)
+
+    def close(self):
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
@@ -0,0 +1,67 @@
+"""
+Render Worker: shared partial movie cache
+
+manim names each animation's segment (partial movie file) after a hash of
+the play call, but only looks for it in the current media_dir, and every
+API render gets a fresh one. This file writer also looks the hash up in a
+ContentStore shared by all workers, and publishes every segment it renders
+there. An LLM retry or a near-identical scene then only renders the
+animations that changed.
+
+Entries are keyed by the animation hash plus everything the hash doesn't
+cover: output resolution, frame rate, file format and manim version.
+"""
+
+from .settings import MOVIE_CACHE_BYTES, MOVIE_CACHE_DIR
+from .store import ContentStore, content_key
+
+
+movie_store = ContentStore(MOVIE_CACHE_DIR, MOVIE_CACHE_BYTES)
+
+
+def segment_key(hash_animation):
+    """Store key for an animation hash under the current config."""
+    import manim
+    from manim import config
+
+    return content_key(
+        "partial-movie",
+        manim.__version__,
+        config.pixel_width,
+        config.pixel_height,
+        config.frame_rate,
+        config.movie_file_extension,
+        config.transparent,
+        hash_animation,
+    )
+
+
+def is_cacheable(hash_animation):
+    # With caching disabled manim uses "uncached_<n>", which isn't content
+    return bool(hash_animation) and not hash_animation.startswith("uncached_")
+
+
+class PartialMovieCacheFileWriter:
+    """SceneFileWriter mixin that shares partial movie files across renders."""
+
+    def is_already_cached(self, hash_invocation):
+        if super().is_already_cached(hash_invocation):
+            return True
+        if not hasattr(self, "partial_movie_directory") or not is_cacheable(hash_invocation):
+            return False
+
+        from manim import config
+
+        target = self.partial_movie_directory / f"{hash_invocation}{config.movie_file_extension}"
+        return movie_store.fetch(segment_key(hash_invocation), target)
+
+    def end_animation(self, allow_write=False):
+        super().end_animation(allow_write)
+        if not allow_write or not self.partial_movie_files:
+            return
+
+        # end_animation runs before renderer.num_plays is incremented
+        path = self.partial_movie_files[self.renderer.num_plays]
+        hash_animation = self.renderer.animations_hashes[self.renderer.num_plays]
+        if path and is_cacheable(hash_animation):
+            movie_store.put(segment_key(hash_animation), path)
@@ -0,0 +1,134 @@
+"""
+Render Worker: playback
+
+Runs a scene's construct() with every animation skipped and rasterization
+turned off, recording each self.play / self.wait call as it happens. The
+result is the scene's real timeline (including loops, helper methods and
+default run_times) at a tiny fraction of the cost of a render.
+
+With hashes=True each play also records manim's hash of the play call (the
+name of its partial movie file), which variants.py uses to find the plays
+variants have in common.
+
+The "preflight" action uses the same playback to check generated code before
+it takes a render slot: a scene that raises (bad kwarg, missing attribute)
+fails in about a second instead of after a full render, and one that runs
+reports its duration, play count and peak mobject count. For scenes that
+build Tex, the preflight's playback is also the batched LaTeX pass
+(tex_batch.py), so the render that follows doesn't repeat it.
+"""
+
+import sys
+
+from .registry import job_scene_class
+from .scenes import resolve_scene_file, load_scene_class
+from .settings import TEX_CACHE_BYTES
+
+
+def _construct_line(construct_code):
+    """Line in construct() that is (directly or via helpers) calling play."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code is construct_code:
+            return frame.f_lineno
+        frame = frame.f_back
+    return None
+
+
+def _disable_rasterization(renderer):
+    """Turn the Cairo renderer's drawing methods into no-ops."""
+    def skip(*args, **kwargs):
+        return None
+
+    renderer.update_frame = skip
+    renderer.render = skip
+    renderer.save_static_frame_data = skip
+    renderer.freeze_current_frame = skip
+
+
+def play_scene(scene_cls, hashes=False):
+    """
+    Construct `scene_cls` without rendering. Returns a list of plays:
+      {"index", "line", "duration", "is_wait", "mobjects"[, "hash"]}
+    where `line` is the line of construct() the play was issued from.
+    """
+    from manim import Wait, tempconfig
+    from manim.utils.hashing import get_hash_from_play_call
+
+    construct_code = scene_cls.construct.__code__
+    plays = []
+
+    with tempconfig({"dry_run": True, "progress_bar": "none"}):
+        scene = scene_cls(skip_animations=True)
+        renderer = scene.renderer
+        _disable_rasterization(renderer)
+        original_play = renderer.play
+        original_compile = scene.compile_animation_data
+        play_hashes = []
+
+        def hashing_compile(*args, **kwargs):
+            # Same point in play() where the renderer hashes the call
+            result = original_compile(*args, **kwargs)
+            play_hashes.append(get_hash_from_play_call(
+                scene, renderer.camera, scene.animations, scene.mobjects,
+            ))
+            return result
+
+        def recording_play(scene, *args, **kwargs):
+            line = _construct_line(construct_code)
+            original_play(scene, *args, **kwargs)
+            play = {
+                "index": len(plays),
+                "line": line,
+                "duration": float(scene.duration),
+                "is_wait": len(scene.animations) == 1 and isinstance(scene.animations[0], Wait),
+                "mobjects": len(scene.get_mobject_family_members()),
+            }
+            if hashes:
+                play["hash"] = play_hashes[-1]
+            plays.append(play)
+
+        renderer.play = recording_play
+        if hashes:
+            scene.compile_animation_data = hashing_compile
+        scene.render()
+
+    return plays
+
+
+def playback_job(job):
+    """Worker action: play back the job's scene and return its timeline."""
+    scene_file, scene_name = resolve_scene_file(job, job["work_dir"])
+    scene_cls = job_scene_class(load_scene_class(scene_file, scene_name), job)
+    plays = play_scene(scene_cls, hashes=bool(job.get("hashes")))
+    return {
+        "plays": plays,
+        "duration": round(sum(play["duration"] for play in plays), 3),
+    }
+
+
+def preflight_job(job):
+    """Worker action: run construct() without rendering and summarise it."""
+    from manim import tempconfig
+
+    # tex_batch plays scenes back with play_scene
+    from .tex_batch import play_with_tex, uses_tex
+
+    scene_file, scene_name = resolve_scene_file(job, job["work_dir"])
+    # Text and Tex still write their SVGs; keep them out of the cwd
+    with tempconfig({"media_dir": job["media_dir"]}):
+        scene_cls = job_scene_class(load_scene_class(scene_file, scene_name), job)
+        tex_batched = 0
+        if TEX_CACHE_BYTES > 0 and job.get("batch_tex", True) and uses_tex(scene_cls):
+            plays, tex_batched, error = play_with_tex(scene_cls)
+            if error is not None:
+                raise error
+        else:
+            plays = play_scene(scene_cls)
+    return {
+        "duration": round(sum(play["duration"] for play in plays), 3),
+        "plays": len(plays),
+        "waits": sum(play["is_wait"] for play in plays),
+        "peak_mobjects": max((play["mobjects"] for play in plays), default=0),
+        "tex_batched": tex_batched,
+    }
@@ -0,0 +1,123 @@
+"""
+Render Worker: warm process pool
+
+A fixed number of worker processes import manim once at start-up and then
+render jobs one after another. A worker that hangs past the timeout or dies
+(LLM code can call os._exit, segfault cairo, ...) is killed and replaced,
+and every worker is recycled after a number of jobs to bound memory growth.
+"""
+
+import multiprocessing
+import queue
+import threading
+
+from .settings import DEFAULT_WORKERS, MAX_JOBS_PER_WORKER, RENDER_TIMEOUT
+
+
+def _worker_main(conn):
+    """Entry point of a pool process: warm up, then serve jobs forever."""
+    from .render import run_job
+    from .warmup import warm
+
+    warm()
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        conn.send(run_job(job))
+
+
+class _Worker:
+    """A pool process and the pipe used to talk to it."""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WarmPool:
+    """
+    Pool of warm render processes.
+
+    render() blocks the calling thread until a worker is free and the job has
+    finished, so an HTTP server with one thread per request gets natural
+    queueing for free.
+    """
+
+    def __init__(self, size=DEFAULT_WORKERS, max_jobs_per_worker=MAX_JOBS_PER_WORKER,
+                 timeout=RENDER_TIMEOUT):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.timeout = timeout
+        # spawn, not fork: the parent may be running server threads
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._busy = 0
+        for _ in range(size):
+            self._idle.put(_Worker(self._ctx))
+
+    def render(self, job, timeout=None):
+        """Render a job on the next free worker and return its result dict."""
+        timeout = timeout or self.timeout
+        worker = self._idle.get()
+        with self._lock:
+            self._busy += 1
+        try:
+            # Passed on so work the job forks (frames.py) shares its deadline
+            worker.conn.send({**job, "timeout": timeout})
+            if not worker.conn.poll(timeout):
+                worker.kill()
+                worker = _Worker(self._ctx)
+                return {
+                    "success": False,
+                    "timed_out": True,
+                    "error": f"Render timed out after {timeout:.0f} seconds",
+                }
+
+            result = worker.conn.recv()
+            worker.jobs += 1
+            if worker.jobs >= self.max_jobs_per_worker:
+                worker.stop()
+                worker = _Worker(self._ctx)
+            return result
+        except (EOFError, OSError) as error:
+            # The worker process died mid-job
+            worker.kill()
+            worker = _Worker(self._ctx)
+            return {
+                "success": False,
+                "error": f"Render worker crashed: {error or 'process exited'}",
+            }
+        finally:
+            with self._lock:
+                self._busy -= 1
+            self._idle.put(worker)
+
+    def stats(self):
+        with self._lock:
+            return {"mode": "pool", "workers": self.size, "busy": self._busy}
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().stop()
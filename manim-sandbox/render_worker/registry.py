@@ -0,0 +1,323 @@
+"""
+Render Worker: template registry
+
+The production templates are parameterised by class attributes, so a new
+variant used to mean a new subclass (CoinFlipTree, SineWave, ...) - in
+practice LLM-generated code rendered cold. The registry exposes each
+template with a JSON Schema for its parameters instead:
+
+  {"template": "function_graph", "params": {"function": "x**3 - x"}, "quality": "low"}
+
+template_job() validates the params (schema, then template-specific checks
+such as compiling the function string) before anything is rendered, and
+resolves the job to the template's module and base class. parameterize()
+turns the base class into a one-off subclass with the params set as class
+attributes, exactly what a hand-written variant would do.
+
+Only the JSON Schema subset the schemas below use is implemented (type,
+properties, required, additionalProperties, enum, minimum/maximum,
+minLength/maxLength, items, minItems/maxItems); jsonschema is not a
+dependency of the sandbox.
+"""
+
+import copy
+import math
+from functools import lru_cache
+
+from .settings import TEMPLATES_DIR
+
+
+class TemplateParamsError(ValueError):
+    """The job's params don't match the template's schema."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("; ".join(self.errors))
+
+
+TITLE = {"type": "string", "minLength": 1, "maxLength": 80}
+LABEL = {"type": "string", "minLength": 1, "maxLength": 24}
+EXPRESSION = {"type": "string", "minLength": 1, "maxLength": 200}
+PROBABILITY = {"type": "number", "minimum": 0, "maximum": 1}
+COORDINATE = {"type": "number", "minimum": -1000, "maximum": 1000}
+VECTOR = {"type": "array", "items": {"type": "number", "minimum": -6, "maximum": 6},
+          "minItems": 2, "maxItems": 2}
+X_RANGE = {"type": "array", "items": COORDINATE, "minItems": 2, "maxItems": 3}
+
+MAX_TREE_LEVELS = 4
+MAX_TREE_LEAVES = 16
+
+
+def _object(properties, required=()):
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(required),
+        "additionalProperties": False,
+    }
+
+
+def _branches(levels):
+    """Schema for `levels` levels of nested probability tree branches."""
+    properties = {"label": LABEL, "prob": PROBABILITY}
+    if levels > 1:
+        properties["children"] = _branches(levels - 1)
+    return {
+        "type": "array",
+        "items": _object(properties, required=["label", "prob"]),
+        "minItems": 1,
+        "maxItems": 4,
+    }
+
+
+TEMPLATES = {
+    "function_graph": {
+        "scene": "FunctionGraphScene",
+        "description": "Plot a function of x with an optional tangent line",
+        "schema": _object({
+            "function": EXPRESSION,
+            "x_range": X_RANGE,
+            "tangent_point": {"type": ["number", "null"]},
+            "title": TITLE,
+        }, required=["function"]),
+        "attributes": {"function": "function_str", "title": "title_text"},
+    },
+    "calculus_derivative": {
+        "scene": "DerivativeScene",
+        "description": "Secant lines approaching the tangent of a function at a point",
+        "schema": _object({
+            "function": EXPRESSION,
+            # The axes span x = -1..4 and the widest secant reaches point + 2
+            "point": {"type": "number", "minimum": -1, "maximum": 2},
+            "show_tangent": {"type": "boolean"},
+            "show_secant": {"type": "boolean"},
+            "title": TITLE,
+        }, required=["function"]),
+        "attributes": {"function": "function_str", "title": "title_text"},
+    },
+    "vector_addition": {
+        "scene": "VectorAdditionScene",
+        "description": "Tip-to-tail addition of two 2D vectors",
+        "schema": _object({
+            "vector1": VECTOR,
+            "vector2": VECTOR,
+            "show_components": {"type": "boolean"},
+        }, required=["vector1", "vector2"]),
+        "attributes": {},
+    },
+    "probability_tree": {
+        "scene": "ProbabilityTreeScene",
+        "description": f"Probability tree up to {MAX_TREE_LEVELS} levels deep",
+        "schema": _object({
+            "tree": _branches(MAX_TREE_LEVELS),
+            "title": TITLE,
+        }, required=["tree"]),
+        "attributes": {"title": "title_text"},
+    },
+    "geometry_diagram": {
+        "scene": "GeometryScene",
+        "description": "Preset geometric diagram with labels and measurements",
+        "schema": _object({
+            "diagram_type": {"enum": ["right_triangle", "circle", "square", "pentagon", "parallel_lines"]},
+            "title": TITLE,
+        }, required=["diagram_type"]),
+        "attributes": {"title": "title_text"},
+    },
+}
+
+# Jobs may also name the template by its scene class
+ALIASES = {entry["scene"]: name for name, entry in TEMPLATES.items()}
+
+JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def _is_type(value, name):
+    if name in ("number", "integer"):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return math.isfinite(value) and (name == "number" or float(value).is_integer())
+    return isinstance(value, JSON_TYPES[name])
+
+
+def validate(value, schema, path="params"):
+    """Return a list of "<path>: <problem>" strings; empty when `value` is valid."""
+    if "enum" in schema and value not in schema["enum"]:
+        return [f"{path}: must be one of {', '.join(map(repr, schema['enum']))}"]
+
+    types = schema.get("type")
+    if types is not None:
+        types = [types] if isinstance(types, str) else types
+        if not any(_is_type(value, name) for name in types):
+            return [f"{path}: expected {' or '.join(types)}"]
+
+    errors = []
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: required")
+        for key, item in value.items():
+            if key in properties:
+                errors.extend(validate(item, properties[key], f"{path}.{key}"))
+            elif schema.get("additionalProperties", True) is False:
+                errors.append(f"{path}.{key}: unknown parameter")
+    elif isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{path}: needs at least {schema['minItems']} items")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{path}: at most {schema['maxItems']} items")
+        if "items" in schema:
+            for index, item in enumerate(value):
+                errors.extend(validate(item, schema["items"], f"{path}[{index}]"))
+    elif isinstance(value, str):
+        if len(value) < schema.get("minLength", 0):
+            errors.append(f"{path}: must not be empty")
+        if "maxLength" in schema and len(value) > schema["maxLength"]:
+            errors.append(f"{path}: at most {schema['maxLength']} characters")
+    elif _is_type(value, "number"):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: must be >= {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: must be <= {schema['maximum']}")
+    return errors
+
+
+@lru_cache(maxsize=1)
+def _expressions():
+    # templates/ isn't a package; load its expression compiler like a scene file
+    from .scenes import load_module
+
+    return load_module(TEMPLATES_DIR / "expressions.py")
+
+
+def _check_function(params, path="params.function"):
+    expressions = _expressions()
+    try:
+        expressions.compile_expression(params["function"])
+    except expressions.ExpressionError as error:
+        return [f"{path}: {error}"]
+    return []
+
+
+@lru_cache(maxsize=None)
+def _defaults(name):
+    """The template scene's class attributes, read from its source (catalog.py)."""
+    from .catalog import parse_scenes
+
+    for scene in parse_scenes(TEMPLATES_DIR / f"{name}.py"):
+        if scene["scene"] == TEMPLATES[name]["scene"]:
+            return scene["attributes"]
+    return {}
+
+
+def _check_function_graph(params):
+    errors = _check_function(params)
+    x_range = params.get("x_range")
+    if x_range is not None:
+        if x_range[0] >= x_range[1]:
+            return errors + ["params.x_range: min must be less than max"]
+        if len(x_range) == 3 and not 0 < x_range[2] <= x_range[1] - x_range[0]:
+            errors.append("params.x_range: step must be positive and fit the range")
+    else:
+        x_range = _defaults("function_graph")["x_range"]
+    tangent = params.get("tangent_point")
+    if tangent is not None and not x_range[0] <= tangent <= x_range[1]:
+        errors.append(f"params.tangent_point: must lie inside x_range [{x_range[0]}, {x_range[1]}]")
+    return errors
+
+
+def _check_probability_tree(params):
+    errors = []
+    leaves = 0
+    groups = [("params.tree", params["tree"])]
+    while groups:
+        path, branches = groups.pop()
+        if abs(sum(branch["prob"] for branch in branches) - 1) > 1e-6:
+            errors.append(f"{path}: probabilities must sum to 1")
+        for index, branch in enumerate(branches):
+            if branch.get("children"):
+                groups.append((f"{path}[{index}].children", branch["children"]))
+            else:
+                leaves += 1
+    if leaves > MAX_TREE_LEAVES:
+        errors.append(f"params.tree: at most {MAX_TREE_LEAVES} outcomes fit on screen")
+    return errors
+
+
+CHECKS = {
+    "function_graph": _check_function_graph,
+    "calculus_derivative": _check_function,
+    "probability_tree": _check_probability_tree,
+}
+
+
+def lookup(name):
+    """The registry name and entry for a template or scene class name."""
+    name = ALIASES.get(name, name)
+    if name not in TEMPLATES:
+        raise TemplateParamsError([f"template: unknown template '{name}' "
+                                   f"(expected one of {', '.join(TEMPLATES)})"])
+    return name, TEMPLATES[name]
+
+
+def validate_params(name, params):
+    """Check `params` against the template's schema and semantics."""
+    name, entry = lookup(name)
+    errors = validate(params, entry["schema"])
+    if not errors and name in CHECKS:
+        errors = CHECKS[name](params)
+    if errors:
+        raise TemplateParamsError(errors)
+    return name, entry
+
+
+def template_job(job):
+    """
+    Resolve a {template, params} job to the template's module and scene
+    class. Raises TemplateParamsError if the params are invalid.
+    """
+    name, entry = validate_params(job.get("template") or "", job.get("params"))
+    return {**job, "template": name, "scene": entry["scene"]}
+
+
+def template_attributes(template, params):
+    """The class attributes `params` set on the template's scene."""
+    _, entry = lookup(template)
+    attributes = {}
+    for key, value in params.items():
+        if key == "x_range" and len(value) == 2:
+            # The templates sample with a step; keep their default
+            value = [*value, 0.1]
+        attributes[entry["attributes"].get(key, key)] = copy.deepcopy(value)
+    return attributes
+
+
+def parameterize(scene_cls, template, params):
+    """A subclass of `scene_cls` with the params applied as class attributes."""
+    return type(scene_cls.__name__, (scene_cls,), template_attributes(template, params))
+
+
+def job_scene_class(scene_cls, job):
+    """The scene class to render for `job`: parameterised if it carries params."""
+    if job.get("params") is None:
+        return scene_cls
+    return parameterize(scene_cls, job["template"], job["params"])
+
+
+def catalog():
+    """Every template with its scene class and parameter schema (GET /templates)."""
+    return [
+        {
+            "template": name,
+            "scene": entry["scene"],
+            "description": entry["description"],
+            "params": entry["schema"],
+        }
+        for name, entry in TEMPLATES.items()
+    ]
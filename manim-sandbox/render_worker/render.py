@@ -0,0 +1,226 @@
+"""
+Render Worker: in-process rendering
+
+Runs one job inside the current (already warm) interpreter. Every render
+runs under ``tempconfig`` so quality and output paths never leak from one
+render into the next.
+
+Jobs are dicts; job["action"] picks what to do with the scene:
+  - "render"   (default) render to MP4
+  - "playback" run construct() without rendering and return the timeline
+  - "preflight" the same, summarised: duration, plays, peak mobject count
+
+Template jobs may carry "params" instead of naming a variant class; they are
+validated and applied by registry.py.
+"""
+
+import inspect
+import logging
+import time
+import traceback
+import uuid
+from pathlib import Path
+
+from . import tex_cache, tex_format, text_cache
+from .frames import FrameParallelFileWriter, FrameParallelRenderer
+from .layers import LayeredRenderer
+from .movie_cache import PartialMovieCacheFileWriter
+from .playback import playback_job, preflight_job
+from .registry import job_scene_class, template_job
+from .renditions import RenditionFileWriter, rendition_job
+from .scenes import resolve_scene_file, load_scene_class
+from .single_pipe import SinglePipeFileWriter
+from .static_frames import StaticFrameFileWriter, StaticFrameRenderer
+from .settings import QUALITIES, DEFAULT_QUALITY, MOVIE_CACHE_BYTES, RENDER_ROOT, SCENE_DIRS, TEX_CACHE_BYTES
+from .streaming import StreamingFileWriter, end_stream
+from .tex_batch import formulas_key, prepare_tex
+
+
+class _LogCapture(logging.Handler):
+    """Collects manim log lines so they can be returned with the result."""
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(f"{record.levelname} {record.getMessage()}")
+
+
+def job_config(job, scene_file, media_dir):
+    """Build the tempconfig overrides for a job."""
+    quality = job.get("quality") or DEFAULT_QUALITY
+    if quality not in QUALITIES:
+        raise ValueError(f"Invalid quality: {quality} (expected one of {', '.join(QUALITIES)})")
+
+    overrides = {
+        "quality": QUALITIES[quality],
+        "media_dir": str(media_dir),
+        "input_file": str(scene_file),
+        "format": "mp4",
+        "write_to_movie": True,
+        "save_last_frame": False,
+        "preview": False,
+        "progress_bar": "none",
+        "disable_caching": bool(job.get("disable_caching", False)),
+    }
+
+    # Render only a range of animations (same as manim -n FROM,UPTO)
+    if job.get("from_animation") is not None:
+        overrides["from_animation_number"] = int(job["from_animation"])
+    if job.get("upto_animation") is not None:
+        overrides["upto_animation_number"] = int(job["upto_animation"])
+
+    return overrides
+
+
+def scene_camera_class(scene_cls):
+    """The camera a scene class would create for itself (e.g. ThreeDCamera)."""
+    from manim import Camera
+
+    parameter = inspect.signature(scene_cls.__init__).parameters.get("camera_class")
+    if parameter is None or parameter.default is inspect.Parameter.empty:
+        return Camera
+    return parameter.default
+
+
+def create_scene(scene_cls, job):
+    """
+    Instantiate the scene, with a renderer extended for the job's options:
+      - "movie_cache" (default on): share partial movie files (movie_cache.py)
+      - "static_frames" (opt-in): draw unchanged frames once
+        (static_frames.py)
+      - "static_layers" (opt-in): paint settled mobjects from cached
+        layers (layers.py)
+      - "parallel_frames": split long plays across processes (frames.py)
+      - "stream_id": publish each play to a live HLS playlist (streaming.py)
+      - "single_pipe": encode the whole scene through one encoder, without
+        partial movie files (single_pipe.py)
+      - "renditions": also encode lower qualities from the same frames
+        (renditions.py)
+    """
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    renderer_mixins = []
+    writer_mixins = []
+    if job.get("single_pipe"):
+        if job.get("parallel_frames") or job.get("stream_id"):
+            raise ValueError("single_pipe can't be combined with parallel_frames or stream_id")
+        writer_mixins.append(SinglePipeFileWriter)
+    elif (MOVIE_CACHE_BYTES > 0 and job.get("movie_cache", True) and not job.get("disable_caching")
+          and not job.get("renditions")):
+        writer_mixins.append(PartialMovieCacheFileWriter)
+    if job.get("renditions"):
+        writer_mixins.append(RenditionFileWriter)
+    if job.get("parallel_frames"):
+        renderer_mixins.append(FrameParallelRenderer)
+        writer_mixins.append(FrameParallelFileWriter)
+    if job.get("static_frames"):
+        renderer_mixins.append(StaticFrameRenderer)
+        writer_mixins.append(StaticFrameFileWriter)
+    if job.get("static_layers"):
+        renderer_mixins.append(LayeredRenderer)
+    if job.get("stream_id"):
+        # First, so it sees each play's file after the other writers are done
+        writer_mixins.insert(0, StreamingFileWriter)
+
+    if not renderer_mixins and not writer_mixins:
+        return scene_cls()
+
+    renderer_cls = type("JobRenderer", (*renderer_mixins, CairoRenderer), {})
+    writer_cls = type("JobFileWriter", (*writer_mixins, SceneFileWriter), {})
+    renderer = renderer_cls(file_writer_class=writer_cls, camera_class=scene_camera_class(scene_cls))
+    renderer.job = job
+    return scene_cls(renderer=renderer)
+
+
+def render_scene(job):
+    """Worker action: render the job's scene to MP4."""
+    from manim import tempconfig
+
+    media_dir = Path(job["media_dir"])
+    if job.get("renditions") is not None:
+        job = rendition_job(job)
+    scene_file, scene_name = resolve_scene_file(job, job["work_dir"])
+    with tempconfig(job_config(job, scene_file, media_dir)):
+        scene_cls = job_scene_class(load_scene_class(scene_file, scene_name), job)
+        tex_batched = 0
+        if TEX_CACHE_BYTES > 0 and job.get("batch_tex", True):
+            tex_batched = prepare_tex(scene_cls, formulas_key(scene_file, scene_name, job.get("params")))
+        scene = create_scene(scene_cls, job)
+        file_writer = scene.renderer.file_writer
+        try:
+            scene.render()
+        finally:
+            if job.get("stream_id"):
+                end_stream(job["stream_id"])
+            if job.get("renditions"):
+                # Also after a failed render, so no encoder stays open
+                rendition_paths = file_writer.close_renditions()
+        video_path = file_writer.movie_file_path
+
+    result = {"video_path": str(video_path), "tex_batched": tex_batched}
+    if job.get("renditions"):
+        result["renditions"] = {**rendition_paths, job["quality"]: str(video_path)}
+    return result
+
+
+ACTIONS = {
+    "render": render_scene,
+    "playback": playback_job,
+    "preflight": preflight_job,
+}
+
+
+def scene_line(error, work_dir):
+    """The last line of the scene's own code in the error's traceback."""
+    scene_dirs = {str(Path(work_dir))} | {str(scene_dir) for scene_dir in SCENE_DIRS}
+    line = None
+    for frame in traceback.extract_tb(error.__traceback__):
+        if str(Path(frame.filename).parent) in scene_dirs:
+            line = frame.lineno
+    return line
+
+
+def run_job(job):
+    """
+    Run a job dict and return a result dict. Never raises - errors are
+    reported the same way the CLI executor reports them.
+    """
+    started = time.time()
+    media_dir = Path(job.get("media_dir") or RENDER_ROOT / f"job_{uuid.uuid4().hex}" / "media")
+    job = {**job, "media_dir": str(media_dir), "work_dir": str(media_dir.parent)}
+
+    capture = _LogCapture()
+    manim_logger = logging.getLogger("manim")
+    manim_logger.addHandler(capture)
+
+    try:
+        action = job.get("action", "render")
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        if job.get("params") is not None:
+            job = template_job(job)
+
+        tex_cache.install()
+        tex_format.install()
+        text_cache.install()
+        result = ACTIONS[action](job)
+        return {
+            "success": True,
+            **result,
+            "render_time": round(time.time() - started, 3),
+            "logs": "\n".join(capture.lines),
+        }
+    except Exception as error:
+        return {
+            "success": False,
+            "error": f"{type(error).__name__}: {error}",
+            "traceback": traceback.format_exc(),
+            "scene_line": scene_line(error, job["work_dir"]),
+            "render_time": round(time.time() - started, 3),
+            "logs": "\n".join(capture.lines),
+        }
+    finally:
+        manim_logger.removeHandler(capture)
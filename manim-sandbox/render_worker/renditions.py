@@ -0,0 +1,142 @@
+"""
+Render Worker: several qualities from one render
+
+Live requests render at "low" and the library at "medium"; an HD copy of
+the same scene meant a second full render, paying scene construction and
+rasterization again. A job can instead ask for several qualities at once:
+
+    {"template": ..., "quality": "high", "renditions": ["low", "medium"]}
+
+The scene is rendered once, at the highest quality asked for, by manim as
+usual. Every frame manim writes is also downscaled and fed to one extra
+encoder per lower quality, which keeps the frames that fall on its own frame
+rate (1080p60 -> 720p30 keeps every other frame, -> 480p15 every fourth).
+Each rendition lands where a separate render at that quality would have put
+it (videos/<module>/720p30/<Scene>.mp4), and the result lists them all:
+
+    {"video_path": ".../1080p60/Scene.mp4",
+     "renditions": {"low": ".../480p15/Scene.mp4", "medium": ..., "high": ...}}
+
+Every play has to be rasterized for the renditions, so the partial movie
+cache is off for these jobs, and they can't use parallel_frames (whose
+frames never pass through the file writer) or parallel_sections. Only the
+main video gets the scene's sound.
+"""
+
+from pathlib import Path
+
+from .media import VideoEncoder
+from .settings import DEFAULT_QUALITY, QUALITIES
+
+
+def _rank(quality):
+    return list(QUALITIES).index(quality)
+
+
+def rendition_job(job, top=None):
+    """
+    The job with "quality" set to the highest quality it asks for and
+    "renditions" to the others, lowest first. With `top` (an admission
+    downgrade), nothing above `top` is rendered.
+    """
+    requested = [job.get("quality") or DEFAULT_QUALITY, *(job.get("renditions") or [])]
+    for quality in requested:
+        if quality not in QUALITIES:
+            raise ValueError(f"Invalid quality: {quality} (expected one of {', '.join(QUALITIES)})")
+    if job.get("parallel_frames") or job.get("parallel_sections"):
+        raise ValueError("renditions can't be combined with parallel_frames or parallel_sections")
+
+    qualities = set(requested)
+    if top is not None:
+        qualities = {quality for quality in qualities if _rank(quality) <= _rank(top)} | {top}
+    qualities = sorted(qualities, key=_rank)
+    return {**job, "quality": qualities[-1], "renditions": qualities[:-1]}
+
+
+def downscale(frame, width, height):
+    """Resize an RGBA pixel array (box filter: each pixel averages its area)."""
+    import numpy as np
+    from PIL import Image
+
+    if frame.shape[1] == width and frame.shape[0] == height:
+        return frame
+    return np.asarray(Image.fromarray(frame, "RGBA").resize((width, height), Image.Resampling.BOX))
+
+
+class Rendition:
+    """One lower quality copy of the main video, encoded as its frames arrive."""
+
+    def __init__(self, path, width, height, frame_rate, source_frame_rate):
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.source_frame_rate = source_frame_rate
+        self.encoder = None
+        self.written = False
+
+    def frames_before(self, source_frame):
+        """How many of this rendition's frames start before `source_frame`."""
+        return int(-(-source_frame * self.frame_rate // self.source_frame_rate))
+
+    def write(self, frame, first, num_frames):
+        """Source frames first .. first + num_frames - 1 all show `frame`."""
+        count = self.frames_before(first + num_frames) - self.frames_before(first)
+        if not count:
+            return
+        if self.encoder is None:
+            self.encoder = VideoEncoder(self.path, self.width, self.height, self.frame_rate)
+        self.encoder.write(downscale(frame, self.width, self.height), count)
+        self.written = True
+
+    def close(self):
+        if self.encoder is not None:
+            self.encoder.close()
+            self.encoder = None
+
+
+class RenditionFileWriter:
+    """SceneFileWriter mixin that also encodes the job's lower renditions."""
+
+    def is_already_cached(self, hash_invocation):
+        # A skipped play's frames would be missing from the renditions
+        return False
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        super().write_frame(frame_or_renderer, num_frames)
+        first = getattr(self, "frames_written", 0)
+        for rendition in self.renditions().values():
+            rendition.write(frame_or_renderer, first, num_frames)
+        self.frames_written = first + num_frames
+
+    def renditions(self):
+        if getattr(self, "_renditions", None) is None:
+            from manim import config
+            from manim.constants import QUALITIES as MANIM_QUALITIES
+
+            movie_file_path = Path(self.movie_file_path)
+            self._renditions = {}
+            for quality in self.renderer.job["renditions"]:
+                preset = MANIM_QUALITIES[QUALITIES[quality]]
+                height = preset["pixel_height"]
+                # The scene's aspect ratio at the preset's height (even, for yuv420p)
+                width = round(height * config.pixel_width / config.pixel_height / 2) * 2
+                frame_rate = preset["frame_rate"]
+                directory = movie_file_path.parent.parent / f"{height}p{frame_rate:g}"
+                self._renditions[quality] = Rendition(
+                    directory / movie_file_path.name, width, height, frame_rate, config.frame_rate,
+                )
+        return self._renditions
+
+    def close_renditions(self):
+        """Finish the renditions' files; returns {quality: path} of those written."""
+        paths = {}
+        for quality, rendition in self.renditions().items():
+            rendition.close()
+            if rendition.written:
+                paths[quality] = str(rendition.path)
+        return paths
+
+    def finish(self):
+        super().finish()
+        self.close_renditions()
@@ -0,0 +1,221 @@
+"""
+Render Worker: finished video cache
+
+Template jobs are deterministic: the same template, params and quality
+always produce the same video. When a class of students all ask for "the
+derivative of x²", the first request renders and every later one is
+answered from a ContentStore of finished MP4s without taking a worker.
+
+The key covers everything that decides the output:
+  - the template module and scene class
+  - the params, canonicalised: keys sorted, numbers rounded to
+    PARAM_DECIMALS (so 1, 1.0 and 1.0000000001 are the same request)
+  - a hash of the template's source and of the sibling helper modules it
+    imports (expressions.py, sampling.py, ...)
+  - the quality preset and the manim version
+
+Each entry is stored as <key>.mp4 with a <key>.json of metadata next to it.
+A job with "renditions" stores every quality it rendered under that
+quality's key, and is answered from the cache only if all of them are there.
+Concurrent identical requests in one server wait for the first render
+instead of rendering in parallel.
+"""
+
+import ast
+import hashlib
+import json
+import threading
+import time
+import uuid
+from importlib import metadata
+from pathlib import Path
+
+from .scenes import SceneLoadError, resolve_scene_file
+from .settings import DEFAULT_QUALITY, RENDER_ROOT, RESULT_CACHE_BYTES, RESULT_CACHE_DIR
+from .store import ContentStore, content_key
+
+
+result_store = ContentStore(RESULT_CACHE_DIR, RESULT_CACHE_BYTES)
+
+PARAM_DECIMALS = 6
+
+# Job options that change what ends up in the video
+PARTIAL_RENDER_OPTIONS = ("from_animation", "upto_animation")
+
+_source_hashes = {}
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def canonical_params(value):
+    """Params as a canonical, JSON-ready value."""
+    if isinstance(value, dict):
+        return {str(key): canonical_params(value[key]) for key in sorted(value)}
+    if isinstance(value, (list, tuple)):
+        return [canonical_params(item) for item in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # + 0.0 turns -0.0 into 0.0
+        return round(float(value), PARAM_DECIMALS) + 0.0
+    return value
+
+
+def _imported_helpers(scene_file):
+    """Modules next to `scene_file` that it imports (templates share helpers)."""
+    tree = ast.parse(Path(scene_file).read_text(encoding="utf-8"))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+    helpers = []
+    for name in sorted(names):
+        path = Path(scene_file).parent / f"{name}.py"
+        if path.exists():
+            helpers.append(path)
+    return helpers
+
+
+def source_hash(scene_file):
+    """Hash of a template and the helpers it imports, cached by mtime."""
+    scene_file = Path(scene_file)
+    files = [scene_file, *_imported_helpers(scene_file)]
+    stamp = tuple(path.stat().st_mtime_ns for path in files)
+    cached = _source_hashes.get(scene_file)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    digest = digest.hexdigest()
+    _source_hashes[scene_file] = (stamp, digest)
+    return digest
+
+
+def is_cacheable(job):
+    """Only whole renders of template jobs are cached."""
+    return (
+        RESULT_CACHE_BYTES > 0
+        and job.get("result_cache", True)
+        and job.get("action", "render") == "render"
+        and bool(job.get("template"))
+        and bool(job.get("scene"))
+        and not job.get("code")
+        and all(job.get(option) is None for option in PARTIAL_RENDER_OPTIONS)
+    )
+
+
+def result_key(job):
+    """Store key for a (resolved) template job."""
+    scene_file, scene_name = resolve_scene_file(job, RENDER_ROOT)
+    return content_key(
+        "result",
+        metadata.version("manim"),
+        scene_file.stem,
+        scene_name,
+        job.get("quality") or DEFAULT_QUALITY,
+        source_hash(scene_file),
+        json.dumps(canonical_params(job.get("params") or {}), sort_keys=True),
+    )
+
+
+def lookup(key, job):
+    """A render result for a stored video, copied into the job's media_dir."""
+    started = time.time()
+    media_dir = Path(job.get("media_dir") or RENDER_ROOT / f"job_{uuid.uuid4().hex}" / "media")
+    target = media_dir / "videos" / f"{job['scene']}.mp4"
+    if not result_store.fetch(key, target, ".mp4"):
+        return None
+    try:
+        info = json.loads(result_store.path_for(key, ".json").read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        info = {}
+    return {
+        "success": True,
+        "video_path": str(target),
+        "cached": True,
+        "cache_key": key,
+        "metadata": info,
+        "render_time": round(time.time() - started, 3),
+        "logs": "",
+    }
+
+
+def lookup_renditions(job, result):
+    """A cached result with the job's other renditions added, or None unless all are stored."""
+    videos_dir = Path(result["video_path"]).parent
+    renditions = {}
+    for quality in job["renditions"]:
+        target = videos_dir / quality / f"{job['scene']}.mp4"
+        if not result_store.fetch(result_key({**job, "quality": quality}), target, ".mp4"):
+            return None
+        renditions[quality] = str(target)
+    return {**result, "renditions": {**renditions, job["quality"]: result["video_path"]}}
+
+
+def publish(key, job, result):
+    """Store a successful render's video and metadata under `key`."""
+    video_path = Path(result["video_path"])
+    result_store.put(key, video_path, ".mp4")
+    info = {
+        "template": job.get("template"),
+        "scene": job.get("scene"),
+        "params": canonical_params(job.get("params") or {}),
+        "quality": job.get("quality") or DEFAULT_QUALITY,
+        "manim_version": metadata.version("manim"),
+        "render_time": result.get("render_time"),
+        "bytes": video_path.stat().st_size,
+        "created": time.time(),
+    }
+    result_store.write(key, json.dumps(info).encode("utf-8"), ".json")
+
+
+def _key_lock(key):
+    with _inflight_lock:
+        lock, waiters = _inflight.get(key, (threading.Lock(), 0))
+        _inflight[key] = (lock, waiters + 1)
+    return lock
+
+
+def _release(key):
+    with _inflight_lock:
+        lock, waiters = _inflight[key]
+        if waiters == 1:
+            del _inflight[key]
+        else:
+            _inflight[key] = (lock, waiters - 1)
+
+
+def cached_render(job, render):
+    """
+    Return the stored result for `job` if there is one, otherwise
+    render(job) and store its video. Jobs that can't be cached go straight
+    to render().
+    """
+    if not is_cacheable(job):
+        return render(job)
+
+    try:
+        key = result_key(job)
+    except (SceneLoadError, metadata.PackageNotFoundError):
+        # Let the render report it
+        return render(job)
+    lock = _key_lock(key)
+    try:
+        with lock:
+            result = lookup(key, job)
+            if result is not None and job.get("renditions"):
+                result = lookup_renditions(job, result)
+            if result is not None:
+                return result
+            result = render(job)
+            if result.get("success") and result.get("video_path"):
+                publish(key, job, result)
+                for quality, video_path in result.get("renditions", {}).items():
+                    if quality != job["quality"]:
+                        rendition = {**job, "quality": quality}
+                        publish(result_key(rendition), rendition, {**result, "video_path": video_path})
+                result = {**result, "cached": False, "cache_key": key}
+            return result
+    finally:
+        _release(key)
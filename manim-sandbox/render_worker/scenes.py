@@ -0,0 +1,96 @@
+"""
+Render Worker: scene loading
+
+A job names its scene in one of two ways:
+  - {"code": "<python source>", "scene": "GeneratedScene"}
+      LLM-generated code, written to <work_dir>/scene.py
+  - {"template": "function_graph", "scene": "SineWave"}
+      A class from templates/ (or examples/) shipped with the sandbox
+
+Template jobs can also send {"template": "function_graph", "params": {...}};
+registry.py resolves those to the template's base class before loading.
+"""
+
+import importlib.util
+import re
+import sys
+import uuid
+from pathlib import Path
+
+from .settings import SCENE_DIRS
+
+
+DEFAULT_SCENE = "GeneratedScene"
+
+# Template names are plain module names - never paths
+TEMPLATE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+class SceneLoadError(Exception):
+    """The job does not point at a loadable Scene class."""
+
+
+def resolve_scene_file(job, work_dir):
+    """Return (path to the .py file, scene class name) for a job."""
+    if job.get("code"):
+        code = job["code"]
+        scene_name = job.get("scene") or DEFAULT_SCENE
+        if f"class {scene_name}" not in code:
+            raise SceneLoadError(f"Code must contain {scene_name} class")
+
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        scene_file = work_dir / "scene.py"
+        scene_file.write_text(code, encoding="utf-8")
+        return scene_file, scene_name
+
+    template = job.get("template")
+    if not template:
+        raise SceneLoadError("Job must provide either 'code' or 'template'")
+
+    template = template[:-3] if template.endswith(".py") else template
+    if not TEMPLATE_NAME_PATTERN.match(template):
+        raise SceneLoadError(f"Invalid template name: {template}")
+
+    for scene_dir in SCENE_DIRS:
+        scene_file = scene_dir / f"{template}.py"
+        if scene_file.exists():
+            break
+    else:
+        raise SceneLoadError(f"Template '{template}' not found")
+
+    scene_name = job.get("scene")
+    if not scene_name:
+        raise SceneLoadError("Template jobs must name the scene class to render")
+    return scene_file, scene_name
+
+
+def load_module(scene_file):
+    """
+    Execute a scene file as a fresh, unregistered module. Like the manim CLI,
+    the file's directory is importable while it runs (templates share
+    helpers such as templates/expressions.py).
+    """
+    module_name = f"render_worker_scene_{uuid.uuid4().hex}"
+    spec = importlib.util.spec_from_file_location(module_name, scene_file)
+    module = importlib.util.module_from_spec(spec)
+    scene_dir = str(Path(scene_file).resolve().parent)
+    sys.path.insert(0, scene_dir)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(scene_dir)
+    return module
+
+
+def load_scene_class(scene_file, scene_name):
+    """Load `scene_name` from `scene_file` and check that it is a Scene."""
+    from manim import Scene
+
+    module = load_module(scene_file)
+    scene_cls = getattr(module, scene_name, None)
+    if scene_cls is None:
+        raise SceneLoadError(f"Scene '{scene_name}' not found in {Path(scene_file).name}")
+    if not (isinstance(scene_cls, type) and issubclass(scene_cls, Scene)):
+        raise SceneLoadError(f"'{scene_name}' is not a Scene subclass")
+    return scene_cls
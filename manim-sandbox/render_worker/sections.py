@@ -0,0 +1,191 @@
+"""
+Render Worker: section-parallel rendering
+
+Long example scenes (AttentionMechanism, OLSMethod, CountingProblems, ...)
+are written as `# SECTION n` blocks. This mode renders groups of sections in
+separate worker processes and stitches the parts into one MP4 without
+re-encoding.
+
+How it works:
+  1. A playback pass (playback.py) records every play and the construct()
+     line it came from, so each play can be assigned to a section.
+  2. Sections are grouped into at most N contiguous chunks of similar
+     duration.
+  3. Each chunk renders the full construct() with only its own range of
+     animations written (manim's -n FROM,UPTO), so objects created in
+     earlier sections still exist - sections don't have to be independent.
+  4. The chunk MP4s are concatenated at the container level (media.py).
+
+Scenes without section markers are split at play boundaries instead.
+Updaters driven by dt see one large step for skipped animations, as with
+manim -n, so scenes that animate with time-based updaters across a cut can
+differ slightly from a serial render.
+"""
+
+import ast
+import bisect
+import io
+import re
+import time
+import tokenize
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .media import concat_videos
+from .scenes import resolve_scene_file
+from .settings import RENDER_ROOT
+
+
+SECTION_PATTERN = re.compile(r"#\s*SECTION\s+\d+", re.IGNORECASE)
+
+
+def _find_construct(classes, scene_name):
+    """The construct() FunctionDef a scene class uses, following local bases."""
+    node = classes.get(scene_name)
+    seen = set()
+    while node is not None and node.name not in seen:
+        seen.add(node.name)
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == "construct":
+                return item
+        local_bases = [base.id for base in node.bases
+                       if isinstance(base, ast.Name) and base.id in classes]
+        node = classes[local_bases[0]] if local_bases else None
+    return None
+
+
+def find_section_lines(source, scene_name):
+    """Line numbers of the `# SECTION n` comments inside the scene's construct()."""
+    tree = ast.parse(source)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    construct = _find_construct(classes, scene_name)
+    if construct is None:
+        return []
+
+    lines = []
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if (
+            token.type == tokenize.COMMENT
+            and construct.lineno <= token.start[0] <= construct.end_lineno
+            and SECTION_PATTERN.match(token.string)
+        ):
+            lines.append(token.start[0])
+    return lines
+
+
+def split_into_sections(plays, section_lines):
+    """
+    Group plays by section. Returns [(first_play, last_play, duration), ...].
+    Without markers every play is its own unit.
+    """
+    units = []
+    current_section = None
+    for play in plays:
+        if section_lines:
+            section = current_section
+            if play["line"] is not None:
+                section = max(bisect.bisect_right(section_lines, play["line"]) - 1, 0)
+        else:
+            section = play["index"]
+
+        if units and section == current_section:
+            first, _, duration = units[-1]
+            units[-1] = (first, play["index"], duration + play["duration"])
+        else:
+            units.append((play["index"], play["index"], play["duration"]))
+        current_section = section
+    return units
+
+
+def plan_chunks(units, max_chunks):
+    """Merge consecutive units into at most `max_chunks` chunks of similar duration."""
+    if not units:
+        return []
+    max_chunks = max(1, min(max_chunks, len(units)))
+    target = sum(duration for _, _, duration in units) / max_chunks
+
+    chunks = []
+    first, last, duration = units[0]
+    for index, (unit_first, unit_last, unit_duration) in enumerate(units[1:], start=1):
+        units_left = len(units) - index
+        chunks_left = max_chunks - len(chunks) - 1
+        if chunks_left > 0 and (duration >= target or units_left <= chunks_left):
+            chunks.append((first, last, duration))
+            first, duration = unit_first, 0.0
+        last = unit_last
+        duration += unit_duration
+    chunks.append((first, last, duration))
+    return chunks
+
+
+def render_sections(job, renderer, max_chunks):
+    """
+    Render `job` as parallel section chunks on `renderer` (a WarmPool or
+    ZygoteRenderer) and return a normal render result.
+    """
+    try:
+        return _render_sections(job, renderer, max_chunks)
+    except Exception as error:
+        return {
+            "success": False,
+            "error": f"{type(error).__name__}: {error}",
+            "traceback": traceback.format_exc(),
+        }
+
+
+def _render_sections(job, renderer, max_chunks):
+    started = time.time()
+    media_dir = Path(job.get("media_dir") or RENDER_ROOT / f"job_{uuid.uuid4().hex}" / "media")
+    work_dir = media_dir.parent
+    parts_dir = work_dir / "section_parts"
+    base_job = {key: value for key, value in job.items() if key != "parallel_sections"}
+
+    timeline = renderer.render({
+        **base_job,
+        "action": "playback",
+        "media_dir": str(parts_dir / "playback" / "media"),
+    })
+    if not timeline.get("success"):
+        return timeline
+
+    scene_file, scene_name = resolve_scene_file(job, work_dir)
+    section_lines = find_section_lines(Path(scene_file).read_text(encoding="utf-8"), scene_name)
+    chunks = plan_chunks(split_into_sections(timeline["plays"], section_lines), max_chunks)
+
+    if len(chunks) <= 1:
+        return renderer.render({**base_job, "media_dir": str(media_dir)})
+
+    chunk_jobs = [
+        {
+            **base_job,
+            "from_animation": first,
+            "upto_animation": last,
+            "media_dir": str(parts_dir / f"part_{index:03d}" / "media"),
+        }
+        for index, (first, last, _) in enumerate(chunks)
+    ]
+    with ThreadPoolExecutor(max_workers=len(chunk_jobs)) as threads:
+        results = list(threads.map(renderer.render, chunk_jobs))
+
+    for result in results:
+        if not result.get("success"):
+            return result
+
+    # Same layout manim uses: videos/<module>/<resolution>/<Scene>.mp4
+    resolution_dir = Path(results[0]["video_path"]).parent.name
+    output_file = media_dir / "videos" / Path(scene_file).stem / resolution_dir / f"{scene_name}.mp4"
+    concat_videos([result["video_path"] for result in results], output_file)
+
+    return {
+        "success": True,
+        "video_path": str(output_file),
+        "sections": [
+            {"from_animation": first, "upto_animation": last, "duration": round(duration, 3),
+             "render_time": result.get("render_time")}
+            for (first, last, duration), result in zip(chunks, results)
+        ],
+        "render_time": round(time.time() - started, 3),
+        "logs": "\n".join(result.get("logs", "") for result in results),
+    }
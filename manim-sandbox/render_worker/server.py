@@ -0,0 +1,258 @@
+"""
+Render Worker: HTTP server
+
+Small JSON API in front of the warm pool, called by utils/manim-executor.ts
+when MANIM_WORKER_URL is set.
+
+Endpoints:
+  GET  /health    - liveness, pool utilisation and shared cache stats
+  GET  /templates - parameterised templates and their JSON Schemas
+  GET  /scenes    - every scene in templates/ and examples/ (catalog.py)
+  GET  /streams/<stream_id>/playlist.m3u8 - live HLS output of a render
+                    started with "stream_id" (streaming.py)
+  POST /render    - {code | template + scene | template + params, quality, media_dir} -> result
+                    add "parallel_sections": true to render sections in parallel,
+                    "parallel_frames": true to split long animations' frames;
+                    template jobs are answered from the result cache when
+                    possible ("result_cache": false to force a render);
+                    "preflight": true runs the scene without rendering first
+                    and answers 422 without rendering if it raises;
+                    "admission": true estimates the render time from the
+                    source first (timeline.py): too slow for the timeout
+                    renders at a lower quality, or answers 422 if even
+                    "low" won't fit; "stream_id" publishes each finished play
+                    to GET /streams/<stream_id>/playlist.m3u8 while rendering;
+                    "single_pipe": true encodes the scene through one encoder
+                    instead of per-play partial movies (single_pipe.py);
+                    "renditions": ["low", ...] also encodes other qualities
+                    from the same frames (renditions.py)
+  POST /preflight - same job fields -> {duration, plays, waits, peak_mobjects, tex_batched}
+                    or the scene's error, without rendering a frame
+  POST /estimate  - same job fields -> static timeline, render-time estimates
+                    and the admission decision, without taking a worker
+  POST /render-variants - {variants: [job fields, ...], <shared job fields>}
+                    renders the opening plays variants share once
+"""
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .catalog import scan
+from .movie_cache import movie_store
+from .registry import TemplateParamsError, catalog, template_job
+from .renditions import rendition_job
+from .result_cache import cached_render, result_store
+from .scenes import SceneLoadError
+from .sections import render_sections
+from .settings import DEFAULT_QUALITY, PREFLIGHT_TIMEOUT, QUALITIES
+from .streaming import CONTENT_TYPES, PLAYLIST, stream_dir, stream_file
+from .tex_cache import tex_store
+from .text_cache import text_store
+from .timeline import admission, analyze_job
+from .variants import render_variants, variant_jobs
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the renderer attached to the server."""
+
+    server_version = "JulietteRenderWorker/1.0"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {
+                "status": "healthy",
+                "service": "render-worker",
+                "uptime": round(time.time() - self.server.started_at, 1),
+                **self.server.renderer.stats(),
+                "caches": {
+                    "partial_movies": movie_store.stats(),
+                    "tex": tex_store.stats(),
+                    "texts": text_store.stats(),
+                    "results": result_store.stats(),
+                },
+            })
+        elif self.path == "/templates":
+            self.send_json(200, {"templates": catalog()})
+        elif self.path == "/scenes":
+            self.send_json(200, {"scenes": scan()})
+        elif self.path.startswith("/streams/"):
+            self.send_stream_file(self.path[len("/streams/"):].split("?", 1)[0])
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        job = self.read_json()
+        if job is None:
+            return
+
+        if self.path in ("/render", "/preflight", "/estimate"):
+            # Reject bad template params before they take a worker
+            if job.get("params") is not None:
+                try:
+                    job = template_job(job)
+                except TemplateParamsError as error:
+                    self.send_json(400, {
+                        "success": False,
+                        "error": f"{type(error).__name__}: {error}",
+                        "errors": error.errors,
+                    })
+                    return
+            if job.get("single_pipe") and (job.get("parallel_frames") or job.get("stream_id")):
+                self.send_json(400, {
+                    "success": False,
+                    "error": "single_pipe can't be combined with parallel_frames or stream_id",
+                })
+                return
+            if job.get("stream_id") is not None:
+                try:
+                    stream_dir(job["stream_id"])
+                    if job.get("parallel_sections"):
+                        raise ValueError("stream_id can't be combined with parallel_sections")
+                except ValueError as error:
+                    self.send_json(400, {"success": False, "error": str(error)})
+                    return
+            if job.get("renditions") is not None:
+                try:
+                    job = rendition_job(job)
+                except ValueError as error:
+                    self.send_json(400, {"success": False, "error": str(error)})
+                    return
+            renderer = self.server.renderer
+            estimate = None
+            if self.path == "/estimate" or job.get("admission"):
+                try:
+                    estimate = self.estimate(job)
+                except (SyntaxError, ValueError, SceneLoadError) as error:
+                    if self.path == "/estimate":
+                        self.send_json(400, {"success": False, "error": f"{type(error).__name__}: {error}"})
+                        return
+                    # The render reports it
+                    pass
+                if self.path == "/estimate":
+                    self.send_json(200, {"success": True, **estimate})
+                    return
+                if estimate is not None:
+                    decision = estimate["admission"]
+                    if decision["decision"] == "reject":
+                        self.send_json(422, {
+                            "success": False,
+                            "error": f"Estimated render time {decision['estimated_seconds']}s "
+                                     f"exceeds the {decision['budget']:.0f}s budget",
+                            "admission": decision,
+                        })
+                        return
+                    if job.get("renditions") is not None:
+                        job = rendition_job(job, top=decision["quality"])
+                    else:
+                        job = {**job, "quality": decision["quality"]}
+            if self.path == "/preflight" or job.get("preflight"):
+                check = renderer.render({**job, "action": "preflight"}, timeout=PREFLIGHT_TIMEOUT)
+                if self.path == "/preflight" or not check.get("success"):
+                    self.send_json(200 if check.get("success") else 422, {**check, "preflight": True})
+                    return
+                # The preflight's playback already prepared the scene's Tex
+                job = {**job, "batch_tex": False}
+            if job.get("parallel_sections"):
+                result = cached_render(job, lambda job: render_sections(job, renderer, max_chunks=renderer.size))
+            else:
+                result = cached_render(job, renderer.render)
+            if estimate is not None:
+                result = {**result, "admission": estimate["admission"]}
+            # A result cache hit renders nothing, so it has no stream
+            if job.get("stream_id") is not None and not result.get("cached"):
+                result = {**result, "stream_url": f"/streams/{job['stream_id']}/{PLAYLIST}"}
+            self.send_json(200 if result.get("success") else 500, result)
+        elif self.path == "/render-variants":
+            try:
+                jobs = [
+                    template_job(job) if job.get("params") is not None else job
+                    for job in variant_jobs(job)
+                ]
+            except TemplateParamsError as error:
+                self.send_json(400, {
+                    "success": False,
+                    "error": f"{type(error).__name__}: {error}",
+                    "errors": error.errors,
+                })
+                return
+            except ValueError as error:
+                self.send_json(400, {"success": False, "error": str(error)})
+                return
+            result = render_variants(jobs, self.server.renderer)
+            self.send_json(200 if result.get("success") else 500, result)
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def estimate(self, job):
+        """Static timeline of the job's scene with the admission decision."""
+        quality = job.get("quality") or DEFAULT_QUALITY
+        if quality not in QUALITIES:
+            raise ValueError(f"Invalid quality: {quality}")
+        analysis = analyze_job(job)
+        stats = self.server.renderer.stats()
+        return {
+            **analysis,
+            "admission": admission(analysis, quality, stats["busy"], stats["workers"],
+                                   budget=self.server.renderer.timeout),
+        }
+
+    def read_json(self):
+        """Parse the request body, answering 400 on failure."""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self.send_json(400, {"error": "Request body must be JSON"})
+            return None
+        if not isinstance(body, dict):
+            self.send_json(400, {"error": "Request body must be a JSON object"})
+            return None
+        return body
+
+    def send_stream_file(self, path):
+        stream_id, _, name = path.partition("/")
+        file = stream_file(stream_id, name)
+        try:
+            body = file.read_bytes() if file else None
+        except FileNotFoundError:
+            body = None
+        if body is None:
+            self.send_json(404, {"error": f"Unknown stream file: {path}"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES[file.suffix])
+        self.send_header("Content-Length", str(len(body)))
+        # The playlist grows while the render runs; segments never change
+        self.send_header("Cache-Control", "no-cache" if name == PLAYLIST else "max-age=3600")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"[render-worker] {self.address_string()} {format % args}", flush=True)
+
+
+def serve(renderer, host, port):
+    """Serve `renderer` (anything with render(job) and stats()) until interrupted."""
+    server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.renderer = renderer
+    server.started_at = time.time()
+
+    print(f"[render-worker] Listening on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        renderer.close()
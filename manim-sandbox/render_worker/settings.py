@@ -0,0 +1,85 @@
+"""
+Render Worker: settings
+
+Paths and defaults shared by every part of the worker. Anything that differs
+between the sandbox container and the production API image can be
+overridden with environment variables.
+"""
+
+import os
+from pathlib import Path
+
+
+# manim-sandbox/ locally, /manim in the sandbox container
+SANDBOX_DIR = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = SANDBOX_DIR / "templates"
+EXAMPLES_DIR = SANDBOX_DIR / "examples"
+
+# Used as $XDG_CACHE_HOME, so fontconfig reads .cache/fontconfig from here.
+# Also the default home of the shared render caches below; the images bake
+# them into /opt/render_worker/cache (see bake.py).
+CACHE_HOME = Path(os.environ.get("RENDER_CACHE_HOME", SANDBOX_DIR / ".cache"))
+
+# Directories searched when a job names a template instead of sending code
+SCENE_DIRS = [TEMPLATES_DIR, EXAMPLES_DIR]
+
+# Scratch space for jobs that don't bring their own media_dir
+RENDER_ROOT = Path(os.environ.get("RENDER_ROOT", "/tmp/manim_render"))
+
+# API quality names -> manim quality presets
+QUALITIES = {
+    "low": "low_quality",          # 480p15  (-ql)
+    "medium": "medium_quality",    # 720p30  (-qm)
+    "high": "high_quality",        # 1080p60 (-qh)
+    "4k": "fourk_quality",         # 2160p60 (-qk)
+}
+DEFAULT_QUALITY = "medium"
+
+# "pool": warm long-lived processes (pool.py)
+# "zygote": one fresh fork of a warm process per render (zygote.py)
+RENDER_MODE = os.environ.get("RENDER_MODE", "pool")
+
+# Pool sizing (in zygote mode, the number of concurrent renders)
+DEFAULT_WORKERS = int(os.environ.get("RENDER_WORKERS", os.cpu_count() or 2))
+MAX_JOBS_PER_WORKER = int(os.environ.get("RENDER_MAX_JOBS_PER_WORKER", 50))
+RENDER_TIMEOUT = float(os.environ.get("RENDER_TIMEOUT", 180))
+# A preflight never rasterizes (it only batch-compiles the scene's missing
+# Tex, tex_batch.py); one that takes longer than this is looping
+PREFLIGHT_TIMEOUT = float(os.environ.get("RENDER_PREFLIGHT_TIMEOUT", 15))
+
+# Live HLS output of renders with a "stream_id" (streaming.py), served by
+# the server under /streams/ and deleted after STREAM_TTL seconds
+STREAM_DIR = Path(os.environ.get("RENDER_STREAM_DIR", RENDER_ROOT / "streams"))
+STREAM_TTL = float(os.environ.get("RENDER_STREAM_TTL", 3600))
+
+# Partial movie files shared by every render (movie_cache.py)
+MOVIE_CACHE_DIR = Path(os.environ.get("RENDER_MOVIE_CACHE_DIR", CACHE_HOME / "partial_movies"))
+MOVIE_CACHE_BYTES = int(os.environ.get("RENDER_MOVIE_CACHE_BYTES", 2 * 1024**3))
+
+# Compiled LaTeX SVGs shared by every render (tex_cache.py)
+TEX_CACHE_DIR = Path(os.environ.get("RENDER_TEX_CACHE_DIR", CACHE_HOME / "tex"))
+TEX_CACHE_BYTES = int(os.environ.get("RENDER_TEX_CACHE_BYTES", 256 * 1024**2))
+
+# Pango Text/MarkupText SVGs shared by every render (text_cache.py)
+TEXT_CACHE_DIR = Path(os.environ.get("RENDER_TEXT_CACHE_DIR", CACHE_HOME / "texts"))
+TEXT_CACHE_BYTES = int(os.environ.get("RENDER_TEXT_CACHE_BYTES", 128 * 1024**2))
+
+# Finished template videos, keyed by canonical params (result_cache.py)
+RESULT_CACHE_DIR = Path(os.environ.get("RENDER_RESULT_CACHE_DIR", CACHE_HOME / "results"))
+RESULT_CACHE_BYTES = int(os.environ.get("RENDER_RESULT_CACHE_BYTES", 4 * 1024**3))
+
+# Precompiled preamble formats (tex_format.py)
+TEX_FORMAT_DIR = Path(os.environ.get("RENDER_TEX_FORMAT_DIR", CACHE_HOME / "tex_format"))
+
+# Pre-rendered animation library (library.py), served by lib/animation-library.ts
+PRE_RENDERED_DIR = Path(os.environ.get("RENDER_PRE_RENDERED_DIR", SANDBOX_DIR / "pre-rendered"))
+
+# Frame-parallel mode (frames.py): shorter plays aren't worth the fork + concat
+FRAME_PARALLEL_MIN_FRAMES = int(os.environ.get("RENDER_FRAME_PARALLEL_MIN_FRAMES", 60))
+
+# Static layers (layers.py): smaller runs of mobjects are cheaper to redraw
+LAYER_MIN_POINTS = int(os.environ.get("RENDER_LAYER_MIN_POINTS", 1000))
+
+# HTTP server
+DEFAULT_HOST = os.environ.get("RENDER_WORKER_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.environ.get("RENDER_WORKER_PORT", 8000))
@@ -0,0 +1,56 @@
+"""
+Render Worker: single-pipe encoding
+
+manim encodes every self.play / self.wait into its own partial movie file,
+then joins them all into the final MP4. A scene made of many short plays
+(ProbabilityTreeScene, counting_problems with 50+ partial files) pays an
+encoder start-up, an MP4 container and a file per play, and the join reads
+everything back once more.
+
+With "single_pipe": true the file writer opens one encoder on the first
+play and keeps it open for the whole scene; every frame of every play goes
+into it, and the file simply becomes the scene's MP4 at the end. No partial
+movie files, no join.
+
+The trade-off: plays can't be reused from the partial movie cache (their
+frames have to go through the one encoder), so the cache is off for these
+jobs, and the mode can't be combined with parallel_frames or stream_id,
+which both work on per-play files. Scenes with sound still get it muxed in.
+"""
+
+import os
+from pathlib import Path
+
+
+class SinglePipeFileWriter:
+    """SceneFileWriter mixin that encodes the whole scene through one stream."""
+
+    pipe_path = None
+
+    def is_already_cached(self, hash_invocation):
+        # A skipped play's frames would be missing from the stream
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if allow_write and self.pipe_path is None:
+            movie_file_path = Path(self.movie_file_path)
+            self.pipe_path = movie_file_path.with_name(f"{movie_file_path.stem}_pipe{movie_file_path.suffix}")
+            super().begin_animation(True, self.pipe_path)
+
+    def end_animation(self, allow_write=False):
+        # The stream stays open until the scene ends
+        pass
+
+    def combine_to_movie(self):
+        if self.pipe_path is None:
+            # Nothing was written; let manim report it
+            return super().combine_to_movie()
+
+        super().end_animation(True)
+        if self.includes_sound:
+            # manim muxes the sound in while joining; give it the one file
+            self.partial_movie_files = [str(self.pipe_path)]
+            super().combine_to_movie()
+            Path(self.pipe_path).unlink(missing_ok=True)
+        else:
+            os.replace(self.pipe_path, self.movie_file_path)
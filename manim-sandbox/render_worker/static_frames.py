@@ -0,0 +1,117 @@
+"""
+Render Worker: static-frame elision
+
+Lessons spend much of their timeline holding still: self.wait(1.5) after
+every step of AttentionMechanism or BayesTheoremFixed. manim already draws a
+plain wait once and repeats it, but only when nothing in the scene has an
+updater; one always_redraw label anywhere and every frame of every wait is
+rasterized again. And repeated frames are still converted to the encoder's
+pixel format one by one.
+
+StaticFrameRenderer fingerprints what a frame is drawn from (the mobjects
+being drawn, their points, colours and other plain attributes, the camera's
+frame and trackers) before rasterizing it. When nothing changed since the
+previous frame of the play, the frame isn't drawn; the previous one is
+written again, and runs of repeats go to the writer as one frame with a
+count. This also covers holds inside animations (rate functions that pause,
+updaters that have settled).
+
+StaticFrameFileWriter then encodes a repeated frame by converting it to the
+stream's pixel format once; x264 codes the repeats as skipped blocks. The
+video keeps a constant frame rate rather than switching to variable frame
+durations, so partial movies still join by stream copy and HLS segment
+timing stays exact.
+
+Off unless a job sets "static_frames": true. Fingerprinting costs a pass
+over every mobject's arrays on every frame, which busy scenes pay without
+getting repeats back; benchmarks/static_frames.py measures both sides.
+"""
+
+from .media import encode_repeated
+
+
+def mobject_state(mobject):
+    """What of a single mobject (not its submobjects) decides how it's drawn."""
+    import numpy as np
+
+    state = [id(mobject)]
+    for name, value in vars(mobject).items():
+        if isinstance(value, np.ndarray):
+            state.append((name, value.shape, hash(value.tobytes())))
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            state.append((name, value))
+    return tuple(state)
+
+
+def frame_state(renderer, scene, mobjects):
+    """Fingerprint of everything renderer.update_frame(scene, mobjects) draws."""
+    from manim.utils.iterables import list_update
+
+    if not mobjects:
+        mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+    tracked = list(mobjects)
+    camera = renderer.camera
+    if getattr(camera, "frame", None) is not None:
+        # MovingCamera
+        tracked.append(camera.frame)
+    if hasattr(camera, "get_value_trackers"):
+        # ThreeDCamera: phi, theta, gamma, zoom, focal distance
+        tracked.extend(camera.get_value_trackers())
+    members = [member for mobject in tracked for member in mobject.get_family()]
+    return id(renderer.static_image), tuple(mobject_state(member) for member in members)
+
+
+class StaticFrameRenderer:
+    """CairoRenderer mixin that draws a play's unchanged frames only once."""
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self.last_state = None
+        self.last_frame = None
+        self.repeats = 0
+        play_internal = scene.play_internal
+
+        def play_internal_eliding(skip_rendering=False):
+            self.last_state = None
+            self.repeats = 0
+            result = play_internal(skip_rendering)
+            # Before the play's partial movie is closed
+            self.flush_repeats()
+            return result
+
+        scene.play_internal = play_internal_eliding
+
+    def render(self, scene, time, moving_mobjects):
+        if self.skip_animations:
+            return super().render(scene, time, moving_mobjects)
+
+        state = frame_state(self, scene, moving_mobjects)
+        if state == self.last_state:
+            self.time += 1 / self.camera.frame_rate
+            self.repeats += 1
+            return
+
+        self.flush_repeats()
+        # Drawing this frame can reuse the states (layers.py)
+        self.frame_states = {member[0]: member for member in state[1]}
+        try:
+            self.update_frame(scene, moving_mobjects)
+        finally:
+            self.frame_states = None
+        self.last_frame = self.get_frame()
+        self.last_state = state
+        self.add_frame(self.last_frame)
+
+    def flush_repeats(self):
+        if self.repeats:
+            self.file_writer.write_frame(self.last_frame, num_frames=self.repeats)
+            self.repeats = 0
+
+
+class StaticFrameFileWriter:
+    """SceneFileWriter mixin that converts a repeated frame only once."""
+
+    def encode_and_write_frame(self, frame, num_frames):
+        if num_frames == 1:
+            return super().encode_and_write_frame(frame, num_frames)
+        encode_repeated(self.video_stream, self.video_container, frame, num_frames)
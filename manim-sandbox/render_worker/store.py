@@ -0,0 +1,208 @@
+"""
+Render Worker: content-addressed store
+
+A directory of files named by the hash of what produced them, shared by
+every worker process (and every replica that mounts the same volume).
+
+  - Writes are atomic: files are written to a temporary name in the store
+    and os.replace()d into place, so readers never see partial files and
+    concurrent writers of the same key simply race to an identical result.
+  - The store is bounded: after each write, least recently used entries
+    (by mtime, refreshed on every hit) are evicted until it fits its budget.
+  - Hit/miss counters live in a small JSON file next to the entries and are
+    updated under an flock, so they add up across processes.
+  - The store is only ever a cache: if its directory can't be read or
+    written (missing volume, wrong owner), lookups miss and writes are
+    dropped with a warning instead of failing the render.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+logger = logging.getLogger("manim")
+
+
+def content_key(*parts):
+    """Stable hex key for a tuple of strings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ContentStore:
+    """Size-bounded LRU file store keyed by content hash."""
+
+    STATS_FILE = "stats.json"
+    LOCK_FILE = ".lock"
+
+    def __init__(self, root, max_bytes):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+
+    def path_for(self, key, suffix=""):
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def get(self, key, suffix=""):
+        """Path of the entry for `key`, or None. Counts a hit or a miss."""
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.record("misses")
+            return None
+        except OSError:
+            # A read-only store still serves its entries, without the LRU refresh
+            if not self.contains(key, suffix):
+                self.record("misses")
+                return None
+        self.record("hits")
+        return path
+
+    def contains(self, key, suffix=""):
+        """Whether `key` is stored, without counting a hit or a miss."""
+        try:
+            return self.path_for(key, suffix).is_file()
+        except OSError:
+            return False
+
+    def put(self, key, source, suffix=""):
+        """Copy `source` into the store under `key`. Returns the entry path."""
+        return self.write(key, Path(source).read_bytes(), suffix)
+
+    def write(self, key, data, suffix=""):
+        """Store `data` (bytes) under `key`. Returns the entry path, or None if the store can't be written."""
+        path = self.path_for(key, suffix)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        except OSError as error:
+            logger.warning(f"Not caching in {self.root}: {error}")
+            return None
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            os.replace(tmp_name, path)
+        except OSError as error:
+            Path(tmp_name).unlink(missing_ok=True)
+            logger.warning(f"Not caching in {self.root}: {error}")
+            return None
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+        return path
+
+    def fetch(self, key, target, suffix=""):
+        """Copy the entry for `key` to `target`. Returns True on a hit."""
+        path = self.get(key, suffix)
+        if path is None:
+            return False
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copyfile(path, tmp_name)
+            os.replace(tmp_name, target)
+        except OSError:
+            # Evicted between get() and the copy, or unreadable
+            Path(tmp_name).unlink(missing_ok=True)
+            return False
+        return True
+
+    def entries(self):
+        """[(mtime, size, path), ...] for every entry in the store."""
+        result = []
+        try:
+            buckets = list(self.root.iterdir())
+        except OSError:
+            return result
+        for bucket in buckets:
+            # Entries live in <root>/<first two hex digits>/
+            if len(bucket.name) != 2 or not bucket.is_dir():
+                continue
+            try:
+                paths = list(bucket.iterdir())
+            except OSError:
+                continue
+            for path in paths:
+                if path.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                result.append((stat.st_mtime, stat.st_size, path))
+        return result
+
+    def evict(self):
+        """Delete least recently used entries until the store fits its budget."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        try:
+            with self.locked():
+                for _, size, path in sorted(entries):
+                    if total <= self.max_bytes:
+                        break
+                    path.unlink(missing_ok=True)
+                    total -= size
+                    evicted += 1
+        except OSError as error:
+            logger.warning(f"Could not evict from {self.root}: {error}")
+        self.record("evictions", evicted)
+
+    @contextmanager
+    def locked(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / self.LOCK_FILE, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def record(self, counter, count=1):
+        if count <= 0:
+            return
+        try:
+            with self.locked():
+                counters = self.read_counters()
+                counters[counter] = counters.get(counter, 0) + count
+                stats_file = self.root / self.STATS_FILE
+                tmp_file = stats_file.with_suffix(f".{os.getpid()}.tmp")
+                tmp_file.write_text(json.dumps(counters), encoding="utf-8")
+                os.replace(tmp_file, stats_file)
+        except OSError:
+            # Counters are best effort; a read-only store still serves hits
+            pass
+
+    def read_counters(self):
+        try:
+            return json.loads((self.root / self.STATS_FILE).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def stats(self):
+        entries = self.entries()
+        counters = self.read_counters()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+        }
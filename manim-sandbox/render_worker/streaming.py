@@ -0,0 +1,208 @@
+"""
+Render Worker: live HLS output
+
+A render normally shows nothing until manim has written and joined every
+partial movie file. With "stream_id" on a job, each play's partial movie is
+also remuxed (not re-encoded) into a fragmented MP4 segment as soon as the
+play finishes, and appended to a growing HLS playlist:
+
+    STREAM_DIR/<stream_id>/playlist.m3u8
+                           init.mp4            codec set-up, from the first play
+                           segment_00000.m4s   one per play, in order
+
+The server serves these under GET /streams/<stream_id>/..., so a player can
+start on the first animation while the rest of the scene is still rendering.
+The playlist is an EVENT playlist; #EXT-X-ENDLIST is added when the render
+ends, whether it succeeded or not.
+
+Segment timestamps continue from the previous segment, so the stream plays
+as one video. Plays skipped by from/upto_animation are not streamed.
+"""
+
+import math
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+from .settings import STREAM_DIR, STREAM_TTL
+
+
+PLAYLIST = "playlist.m3u8"
+INIT_SEGMENT = "init.mp4"
+STREAM_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+STREAM_FILE_PATTERN = re.compile(r"^(playlist\.m3u8|init\.mp4|segment_\d{5}\.m4s)$")
+CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".mp4": "video/mp4",
+    ".m4s": "video/iso.segment",
+}
+# Fragmented MP4 whose fragments carry their absolute decode time
+FRAGMENT_FLAGS = "frag_keyframe+empty_moov+default_base_moof+frag_discont"
+
+
+def stream_dir(stream_id):
+    if not STREAM_ID_PATTERN.match(stream_id or ""):
+        raise ValueError(f"Invalid stream_id: {stream_id!r} (letters, digits, '_' and '-', at most 64)")
+    return STREAM_DIR / stream_id
+
+
+def stream_file(stream_id, name):
+    """Path of a file in a stream, or None if the names aren't valid."""
+    if not STREAM_ID_PATTERN.match(stream_id) or not STREAM_FILE_PATTERN.match(name):
+        return None
+    return STREAM_DIR / stream_id / name
+
+
+def _boxes(data):
+    """Top-level MP4 boxes in `data` as (type, bytes)."""
+    offset = 0
+    while offset + 8 <= len(data):
+        size, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        if size == 1:
+            size = struct.unpack(">Q", data[offset + 8:offset + 16])[0]
+        elif size == 0:
+            size = len(data) - offset
+        yield kind.decode("latin-1"), data[offset:offset + size]
+        offset += size
+
+
+def _write_atomic(path, data):
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-")
+    with os.fdopen(fd, "wb") as fp:
+        fp.write(data)
+    os.replace(tmp_name, path)
+
+
+def remove_expired(now=None):
+    """Delete streams older than STREAM_TTL."""
+    now = now or time.time()
+    if not STREAM_DIR.exists():
+        return
+    for directory in STREAM_DIR.iterdir():
+        try:
+            if now - directory.stat().st_mtime > STREAM_TTL:
+                shutil.rmtree(directory, ignore_errors=True)
+        except FileNotFoundError:
+            pass
+
+
+class HlsStream:
+    """Remuxes finished partial movie files into an HLS playlist, in order."""
+
+    def __init__(self, directory):
+        remove_expired()
+        self.directory = Path(directory)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True)
+        self.segments = []
+        self.offset = 0.0
+        self.lead = None
+        self.ended = False
+
+    def append(self, partial_movie):
+        """Add a finished play as the next segment."""
+        import av
+
+        remuxed = self.directory / ".remux.mp4"
+        source = av.open(str(partial_movie))
+        target = av.open(str(remuxed), mode="w", format="mp4",
+                         options={"movflags": FRAGMENT_FLAGS, "use_editlist": "0"})
+        end = 0.0
+        try:
+            source_stream = source.streams.video[0]
+            target_stream = target.add_stream(codec_name=None, template=source_stream)
+            time_base = source_stream.time_base
+            for packet in source.demux(source_stream):
+                # Skip the flushing packets demux() yields at the end
+                if packet.dts is None:
+                    continue
+                if self.lead is None:
+                    # B-frames start decoding before 0; keep every dts >= 0
+                    self.lead = max(0.0, -float(packet.dts * time_base))
+                shift = round((self.offset + self.lead) / time_base)
+                end = max(end, float((packet.pts + (packet.duration or 0)) * time_base))
+                packet.pts += shift
+                packet.dts += shift
+                packet.stream = target_stream
+                target.mux(packet)
+        finally:
+            source.close()
+            target.close()
+
+        data = remuxed.read_bytes()
+        remuxed.unlink()
+        if not self.segments:
+            init = b"".join(box for kind, box in _boxes(data) if kind in ("ftyp", "moov"))
+            _write_atomic(self.directory / INIT_SEGMENT, init)
+        fragments = b"".join(box for kind, box in _boxes(data) if kind in ("moof", "mdat"))
+        if not fragments:
+            return
+
+        name = f"segment_{len(self.segments):05d}.m4s"
+        _write_atomic(self.directory / name, fragments)
+        self.segments.append((name, end))
+        self.offset += end
+        self.write_playlist()
+
+    def write_playlist(self):
+        target_duration = max((math.ceil(duration) for _, duration in self.segments), default=1)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:7",
+            f"#EXT-X-TARGETDURATION:{max(target_duration, 1)}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            "#EXT-X-INDEPENDENT-SEGMENTS",
+            f'#EXT-X-MAP:URI="{INIT_SEGMENT}"',
+        ]
+        for name, duration in self.segments:
+            lines += [f"#EXTINF:{duration:.3f},", name]
+        if self.ended:
+            lines.append("#EXT-X-ENDLIST")
+        _write_atomic(self.directory / PLAYLIST, ("\n".join(lines) + "\n").encode("utf-8"))
+
+    def end(self):
+        if not self.ended:
+            self.ended = True
+            self.write_playlist()
+
+
+def end_stream(stream_id):
+    """Close a stream's playlist (also after a failed render)."""
+    directory = stream_dir(stream_id)
+    playlist = directory / PLAYLIST
+    try:
+        text = playlist.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        # Failed before its first play
+        directory.mkdir(parents=True, exist_ok=True)
+        text = "#EXTM3U\n#EXT-X-VERSION:7\n#EXT-X-TARGETDURATION:1\n#EXT-X-PLAYLIST-TYPE:EVENT\n"
+    if "#EXT-X-ENDLIST" not in text:
+        _write_atomic(playlist, (text + "#EXT-X-ENDLIST\n").encode("utf-8"))
+
+
+class StreamingFileWriter:
+    """SceneFileWriter mixin that streams each finished play (see HlsStream)."""
+
+    def end_animation(self, allow_write=False):
+        super().end_animation(allow_write)
+        if not hasattr(self, "partial_movie_files") or not self.partial_movie_files:
+            return
+        # Cached plays finish with allow_write=False but have their file too
+        path = self.partial_movie_files[self.renderer.num_plays]
+        if path and Path(path).exists():
+            self.hls_stream().append(path)
+
+    def hls_stream(self):
+        if getattr(self, "_hls_stream", None) is None:
+            self._hls_stream = HlsStream(stream_dir(self.renderer.job["stream_id"]))
+        return self._hls_stream
+
+    def finish(self):
+        # The stream is complete before the final MP4 is joined
+        self.hls_stream().end()
+        super().finish()
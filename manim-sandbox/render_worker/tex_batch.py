@@ -0,0 +1,334 @@
+r"""
+Render Worker: batched LaTeX compilation
+
+Every MathTex/Tex miss normally costs one latex and one dvisvgm process.
+Before a scene is rendered, this pre-pass finds the Tex strings it will need
+and compiles all of them as pages of one document, so a formula-heavy scene
+spawns two processes instead of dozens. The SVGs go straight into the
+shared Tex cache (tex_cache.py), where the real render finds them.
+
+Finding the strings: construct() is played back (playback.py) with manim's
+tex_to_svg_file replaced by a recorder. Cached formulas get their real SVG;
+misses are recorded and get a one-path placeholder. If the placeholder
+breaks construct() (e.g. `eq[0][3]`), everything recorded up to that point
+is compiled and the playback is repeated; the last of MAX_ROUNDS plays with
+the real tex_to_svg_file, so it always ends on the scene's own outcome. That
+lets the preflight action (playback.py) check a scene and prepare its Tex in
+the same playback, and the render after it skip the pass.
+
+Batching only applies to templates built on manim's default
+``\documentclass[preview]{standalone}``: the batch uses standalone's multi
+mode, with each expression in its own ``standalone`` environment (one page
+per expression). Anything that doesn't fit, or a batch that fails, is left
+to the normal per-expression compile. build-tex-format also dumps the batch
+preamble (tex_format.py), so batches load a precompiled format too.
+
+The playback costs a construct() of its own, so it only runs for scenes
+whose source (or that of a base class outside manim) calls something that
+builds Tex: MathTex, DecimalNumber, axis labels and the like (uses_tex).
+A render also records the formulas its scene built next to their SVGs
+(formulas_key: the scene's source, name and params); the next render of the
+same scene skips the playback while every one of them is still cached. A
+scene whose formulas vary from run to run (random values) may then compile
+a new one the normal way, without a batch.
+"""
+
+import ast
+import json
+import logging
+import re
+import subprocess
+import tempfile
+from contextlib import contextmanager, nullcontext
+from importlib import metadata
+from pathlib import Path
+
+from .playback import play_scene
+from .result_cache import canonical_params, source_hash
+from .settings import RENDER_ROOT, RENDER_TIMEOUT
+from .store import content_key
+from .tex_cache import tex_key, tex_source, tex_store
+
+
+logger = logging.getLogger("manim")
+
+MAX_ROUNDS = 3
+
+BEGIN_DOCUMENT = r"\begin{document}"
+END_DOCUMENT = r"\end{document}"
+STANDALONE_CLASS = r"\documentclass[preview]{standalone}"
+BATCH_CLASS = r"\documentclass[preview,multi]{standalone}"
+
+# Calls that build Tex, directly or through a MathTex-based mobject
+TEX_CALLS = {
+    "Tex", "MathTex", "SingleStringMathTex", "MathTable", "Title", "BulletedList",
+    "DecimalNumber", "Integer", "Variable", "Matrix", "IntegerMatrix", "DecimalMatrix",
+    "BraceLabel", "BraceText", "get_tex", "get_axis_labels", "get_x_axis_label",
+    "get_y_axis_label", "get_graph_label", "add_coordinates", "add_numbers",
+    "get_number_mobject", "get_number_mobjects",
+}
+# NumberLine / Axes number labels are DecimalNumbers
+TEX_KEYWORDS = {"include_numbers", "numbers_to_include"}
+
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="10pt" height="10pt" viewBox="0 0 10 10">'
+    '<path d="M0 0H10V10H0Z"/></svg>'
+)
+
+
+_file_uses_tex = {}
+
+
+def file_uses_tex(path):
+    """Whether the Python file at `path` calls anything in TEX_CALLS (cached by mtime)."""
+    path = Path(path)
+    stamp = path.stat().st_mtime_ns
+    cached = _file_uses_tex.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    found = False
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if not isinstance(node, ast.Call):
+            continue
+        name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+        if name in TEX_CALLS or any(
+            keyword.arg in TEX_KEYWORDS
+            and not (isinstance(keyword.value, ast.Constant) and not keyword.value.value)
+            for keyword in node.keywords
+        ):
+            found = True
+            break
+    _file_uses_tex[path] = (stamp, found)
+    return found
+
+
+def class_files(cls):
+    """
+    Source files of a class's own methods. Scene modules are loaded
+    unregistered (scenes.load_module), so sys.modules can't say where a
+    class came from, but its functions' code objects can.
+    """
+    files = set()
+    for value in vars(cls).values():
+        function = getattr(value, "__func__", value)
+        code = getattr(function, "__code__", None)
+        if code is not None and code.co_filename.endswith(".py"):
+            files.add(code.co_filename)
+    return files
+
+
+def uses_tex(scene_cls):
+    """Whether `scene_cls` or a base class outside manim may build Tex."""
+    for cls in scene_cls.__mro__:
+        if cls.__module__.split(".")[0] == "manim":
+            continue
+        for path in class_files(cls):
+            try:
+                if file_uses_tex(path):
+                    return True
+            except (OSError, SyntaxError):
+                # Can't tell; play it back
+                return True
+    return False
+
+
+def placeholder_svg():
+    # A fixed path: manim caches parsed SVGs by file name, and this file never changes
+    path = RENDER_ROOT / "tex_placeholder.svg"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(PLACEHOLDER_SVG, encoding="utf-8")
+    return path
+
+
+@contextmanager
+def recording_tex(missing, used=None):
+    """
+    Replace tex_to_svg_file with a recorder. Uncached expressions are added
+    to `missing` as {key: (tex_code, tex_template)}, and every key to `used`.
+    """
+    import manim.mobject.text.tex_mobject as tex_mobject
+    from manim import config
+
+    def record(expression, environment=None, tex_template=None):
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        tex_code = tex_source(expression, environment, tex_template)
+        key = tex_key(tex_code, tex_template)
+        if used is not None:
+            used.add(key)
+        if tex_store.contains(key):
+            return tex_store.path_for(key)
+        missing.setdefault(key, (tex_code, tex_template))
+        return placeholder_svg()
+
+    original = tex_mobject.tex_to_svg_file
+    tex_mobject.tex_to_svg_file = record
+    try:
+        yield
+    finally:
+        tex_mobject.tex_to_svg_file = original
+
+
+def batch_preamble(preamble):
+    """`preamble` switched to standalone's multi mode, or None if it isn't standalone."""
+    if not preamble.lstrip().startswith(STANDALONE_CLASS):
+        return None
+    return preamble.replace(STANDALONE_CLASS, BATCH_CLASS, 1)
+
+
+def split_document(tex_code):
+    """(preamble, body) of a complete .tex file, or None."""
+    if tex_code.count(BEGIN_DOCUMENT) != 1 or tex_code.count(END_DOCUMENT) != 1:
+        return None
+    preamble, rest = tex_code.split(BEGIN_DOCUMENT)
+    body = rest.split(END_DOCUMENT)[0]
+    if batch_preamble(preamble) is None:
+        return None
+    return preamble, body
+
+
+def group_batches(missing):
+    """Group missing expressions into batches that share a preamble and compiler."""
+    batches = {}
+    for key, (tex_code, tex_template) in missing.items():
+        parts = split_document(tex_code)
+        if parts is None:
+            continue
+        preamble, body = parts
+        group = (preamble, tex_template.tex_compiler, tex_template.output_format)
+        batches.setdefault(group, []).append((key, body))
+    return batches
+
+
+def page_number(svg_file):
+    return int(re.search(r"(\d+)$", svg_file.stem).group(1))
+
+
+def compile_batch(preamble, tex_compiler, output_format, entries):
+    """Compile [(key, body), ...] as one document and store each page's SVG."""
+    from manim.utils.tex_file_writing import make_tex_compilation_command
+
+    # The preamble is kept byte for byte, so it matches its prebuilt format
+    document = batch_preamble(preamble) + "\n".join([
+        BEGIN_DOCUMENT,
+        *(f"\\begin{{standalone}}\n{body.strip()}\n\\end{{standalone}}" for _, body in entries),
+        END_DOCUMENT,
+    ])
+
+    with tempfile.TemporaryDirectory(prefix="tex_batch_") as tmp:
+        tmp = Path(tmp)
+        tex_file = tmp / "batch.tex"
+        tex_file.write_text(document, encoding="utf-8")
+        command = make_tex_compilation_command(tex_compiler, output_format, tex_file, tmp)
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       timeout=RENDER_TIMEOUT, check=True)
+
+        output_file = tex_file.with_suffix(output_format)
+        subprocess.run(
+            [
+                "dvisvgm",
+                *(["--pdf"] if output_format == ".pdf" else []),
+                "--page=1-",
+                "--no-fonts",
+                "--verbosity=0",
+                f"--output={(tmp / 'page-%p.svg').as_posix()}",
+                output_file.as_posix(),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=RENDER_TIMEOUT,
+            check=True,
+        )
+
+        pages = sorted(tmp.glob("page-*.svg"), key=page_number)
+        if len(pages) != len(entries):
+            raise RuntimeError(f"expected {len(entries)} pages, dvisvgm wrote {len(pages)}")
+        for (key, _), page in zip(entries, pages):
+            tex_store.put(key, page)
+
+
+def compile_missing(missing):
+    """Compile {key: (tex_code, tex_template)} in batches. Returns the number compiled."""
+    compiled = 0
+    for (preamble, compiler, output_format), entries in group_batches(missing).items():
+        if len(entries) < 2:
+            continue
+        try:
+            compile_batch(preamble, compiler, output_format, entries)
+            compiled += len(entries)
+        except (OSError, RuntimeError, subprocess.SubprocessError) as error:
+            logger.warning(f"Batched LaTeX compile failed, compiling one by one: {error}")
+    return compiled
+
+
+def play_with_tex(scene_cls, play=play_scene, used=None):
+    """
+    Play `scene_cls` back with `play`, compiling the Tex strings it misses in
+    batches. Returns (result, compiled, error): the playback's result or the
+    exception it raised, from a playback that didn't depend on a placeholder.
+    `used` gets the keys of every formula the last playback built, if it
+    recorded them.
+    """
+    compiled = 0
+    attempted = set()
+    record = True
+    for number in range(MAX_ROUNDS):
+        missing = {}
+        if used is not None:
+            used.clear()
+        result = error = None
+        with recording_tex(missing, used) if record and number < MAX_ROUNDS - 1 else nullcontext():
+            try:
+                result = play(scene_cls)
+            except Exception as exception:
+                error = exception
+
+        new = {key: value for key, value in missing.items() if key not in attempted}
+        attempted.update(new)
+        compiled += compile_missing(new)
+        if error is None or not missing:
+            # Finished, or failed without a placeholder: the scene's own outcome
+            break
+        # Most likely a placeholder being indexed; play again. If nothing new
+        # was found, what's left didn't batch, so the next round is the real one
+        record = bool(new)
+    return result, compiled, error
+
+
+def formulas_key(scene_file, scene_name, params=None):
+    """Store key of the formulas a scene built when it was last prepared."""
+    return content_key(
+        "tex-formulas",
+        metadata.version("manim"),
+        scene_name,
+        source_hash(scene_file),
+        json.dumps(canonical_params(params or {}), sort_keys=True),
+    )
+
+
+def formulas_cached(key):
+    """Whether the formulas recorded under `key` are all in the Tex cache."""
+    try:
+        keys = json.loads(tex_store.path_for(key, ".json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return all(tex_store.contains(tex) for tex in keys)
+
+
+def prepare_tex(scene_cls, key=None):
+    """
+    Compile the Tex strings `scene_cls` needs into the shared Tex cache.
+    Returns the number of expressions compiled in batches. With a `key`
+    (formulas_key), a scene whose formulas are all cached isn't played back.
+    """
+    if not uses_tex(scene_cls):
+        return 0
+    if key is not None and formulas_cached(key):
+        return 0
+    used = set()
+    _, compiled, error = play_with_tex(scene_cls, used=used)
+    if key is not None and error is None and used:
+        tex_store.write(key, json.dumps(sorted(used)).encode("utf-8"), ".json")
+    return compiled
@@ -0,0 +1,80 @@
+"""
+Render Worker: shared LaTeX SVG cache
+
+manim compiles every MathTex/Tex string with latex + dvisvgm and caches the
+SVG in <media_dir>/Tex, but API renders get a fresh media_dir each time, so
+the same formula is compiled over and over. install() routes manim's
+tex_to_svg_file through a ContentStore shared by all workers:
+
+  1. The SVG already in this render's Tex dir is used as before.
+  2. Otherwise it is copied from the shared store if present (a hit).
+  3. Otherwise manim compiles it and the SVG is published to the store.
+
+Entries are keyed by the complete .tex source (preamble included) and the
+compiler, so different templates never collide.
+"""
+
+from .settings import TEX_CACHE_BYTES, TEX_CACHE_DIR
+from .store import ContentStore, content_key
+
+
+tex_store = ContentStore(TEX_CACHE_DIR, TEX_CACHE_BYTES)
+
+_installed = False
+
+
+def tex_source(expression, environment, tex_template):
+    """The .tex file manim would write for this expression."""
+    if environment is not None:
+        return tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return tex_template.get_texcode_for_expression(expression)
+
+
+def tex_key(tex_code, tex_template):
+    return content_key("tex-svg", tex_template.tex_compiler, tex_template.output_format, tex_code)
+
+
+def local_svg_path(tex_code):
+    """Where manim expects the SVG for `tex_code` in the current Tex dir."""
+    from manim import config
+    from manim.utils.tex_file_writing import tex_hash
+
+    return config.get_dir("tex_dir") / f"{tex_hash(tex_code)}.svg"
+
+
+def make_cached_tex_to_svg_file(compile_svg):
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        from manim import config
+
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        tex_code = tex_source(expression, environment, tex_template)
+        svg_file = local_svg_path(tex_code)
+        if svg_file.exists():
+            return svg_file
+
+        key = tex_key(tex_code, tex_template)
+        if tex_store.fetch(key, svg_file):
+            return svg_file
+
+        svg_file = compile_svg(expression, environment=environment, tex_template=tex_template)
+        tex_store.put(key, svg_file)
+        return svg_file
+
+    return tex_to_svg_file
+
+
+def install():
+    """Route manim's Tex compilation through the shared store (idempotent)."""
+    global _installed
+    if _installed or TEX_CACHE_BYTES <= 0:
+        return
+
+    import manim.mobject.text.tex_mobject as tex_mobject
+    import manim.utils.tex_file_writing as tex_file_writing
+
+    cached = make_cached_tex_to_svg_file(tex_file_writing.tex_to_svg_file)
+    # tex_mobject imported the function by name, so patch both references
+    tex_file_writing.tex_to_svg_file = cached
+    tex_mobject.tex_to_svg_file = cached
+    _installed = True
@@ -0,0 +1,127 @@
+r"""
+Render Worker: precompiled LaTeX preamble
+
+Every MathTex compile starts by re-reading the template preamble (amsmath,
+amssymb, ...), which is most of the time latex spends on a short formula.
+build_format() dumps the preamble once into a format file with
+mylatexformat; install() then makes manim's latex calls load that format
+(-fmt), which skips the preamble of the .tex file.
+
+Formats are named after a hash of the compiler and the exact preamble, so a
+template with a different preamble simply compiles the normal way. The same
+preamble in standalone's multi mode, which batched compiles use
+(tex_batch.py), gets a format of its own. Build the formats at image build
+time:
+
+    python -m render_worker build-tex-format
+"""
+
+import hashlib
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from .settings import RENDER_TIMEOUT, TEX_FORMAT_DIR
+
+
+BEGIN_DOCUMENT = r"\begin{document}"
+
+# Engines mylatexformat formats can be built for
+FORMAT_COMPILERS = {"latex", "pdflatex"}
+
+_installed = False
+
+
+def format_name(tex_compiler, preamble):
+    digest = hashlib.sha256(f"{tex_compiler}\0{preamble}".encode("utf-8")).hexdigest()
+    return f"preamble-{digest[:16]}"
+
+
+def template_preamble(tex_template):
+    """Everything before \\begin{document} in the template's .tex files."""
+    return tex_template.body.split(BEGIN_DOCUMENT, 1)[0]
+
+
+def build_format(tex_template=None):
+    """
+    Dump `tex_template`'s preamble (default: manim's) to a .fmt, plus its
+    batch variant. Returns the paths.
+    """
+    from manim import config
+
+    from .tex_batch import batch_preamble
+
+    if tex_template is None:
+        tex_template = config["tex_template"]
+    compiler = tex_template.tex_compiler
+    if compiler not in FORMAT_COMPILERS:
+        raise ValueError(f"Preamble formats are not supported for {compiler}")
+
+    preamble = template_preamble(tex_template)
+    paths = [dump_format(compiler, preamble)]
+    batched = batch_preamble(preamble)
+    if batched is not None:
+        paths.append(dump_format(compiler, batched))
+    return paths
+
+
+def dump_format(compiler, preamble):
+    """Dump one preamble to TEX_FORMAT_DIR. Returns the .fmt path."""
+    name = format_name(compiler, preamble)
+    TEX_FORMAT_DIR.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="tex_format_") as tmp:
+        preamble_file = Path(tmp) / "preamble.tex"
+        preamble_file.write_text(f"{preamble}{BEGIN_DOCUMENT}\n\\end{{document}}\n", encoding="utf-8")
+        subprocess.run(
+            [
+                compiler,
+                "-ini",
+                "-interaction=batchmode",
+                "-halt-on-error",
+                f"-jobname={name}",
+                f"-output-directory={tmp}",
+                f"&{compiler}",
+                "mylatexformat.ltx",
+                preamble_file.as_posix(),
+            ],
+            stdout=subprocess.DEVNULL,
+            timeout=RENDER_TIMEOUT,
+            check=True,
+        )
+        format_file = TEX_FORMAT_DIR / f"{name}.fmt"
+        os.replace(Path(tmp) / f"{name}.fmt", format_file)
+    return format_file
+
+
+def format_for(tex_compiler, tex_file):
+    """Name of a prebuilt format matching `tex_file`'s preamble, or None."""
+    if tex_compiler not in FORMAT_COMPILERS:
+        return None
+    preamble = Path(tex_file).read_text(encoding="utf-8").split(BEGIN_DOCUMENT, 1)[0]
+    name = format_name(tex_compiler, preamble)
+    return name if (TEX_FORMAT_DIR / f"{name}.fmt").exists() else None
+
+
+def install():
+    """Make manim's latex calls use a prebuilt preamble format when one matches."""
+    global _installed
+    if _installed or not TEX_FORMAT_DIR.is_dir():
+        return
+
+    import manim.utils.tex_file_writing as tex_file_writing
+
+    # Let kpathsea find the formats by name (the trailing ":" keeps the defaults)
+    os.environ["TEXFORMATS"] = f"{TEX_FORMAT_DIR}:{os.environ.get('TEXFORMATS', '')}"
+    make_command = tex_file_writing.make_tex_compilation_command
+
+    def make_tex_compilation_command(tex_compiler, output_format, tex_file, tex_dir):
+        command = make_command(tex_compiler, output_format, tex_file, tex_dir)
+        name = format_for(tex_compiler, tex_file)
+        if name is not None:
+            command.insert(1, f"-fmt={name}")
+        return command
+
+    tex_file_writing.make_tex_compilation_command = make_tex_compilation_command
+    _installed = True
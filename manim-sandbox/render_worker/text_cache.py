@@ -0,0 +1,145 @@
+"""
+Render Worker: shared Pango text cache
+
+Every Text/MarkupText is laid out by Pango into an SVG that manim caches in
+<media_dir>/texts under a hash of the string, font, size, weight, slant,
+colour and the other style settings. API renders get a fresh media_dir, so
+scenes that build a Text per array cell or matrix entry redo that work on
+every request. install() backs those files with a ContentStore shared by
+all workers, keyed by manim's own hash (plus the manim version).
+
+prewarm() fills the store at image build with the labels the templates and
+examples use, and with digits and operators in every style the library uses
+for dynamic labels (`Text(f"{prob:.2f}", font_size=20, color=BLUE)`):
+
+    python -m render_worker warm-text-cache
+"""
+
+import ast
+import logging
+import tempfile
+from pathlib import Path
+
+from .settings import SCENE_DIRS, TEXT_CACHE_BYTES, TEXT_CACHE_DIR
+from .store import ContentStore, content_key
+
+
+logger = logging.getLogger("manim")
+
+text_store = ContentStore(TEXT_CACHE_DIR, TEXT_CACHE_BYTES)
+
+# Short strings scenes build on the fly: cell values, indices, products, signs
+PREWARM_STRINGS = [
+    *(str(number) for number in range(-10, 21)),
+    *(str(number) for number in range(30, 101, 10)),
+    *"+-×÷=<>≤≥()[],.:/*^|%?",
+    "True", "False", "x", "y", "z", "n", "i", "j", "k",
+]
+
+_installed = False
+
+
+def text_key(text_hash):
+    import manim
+
+    return content_key("pango-svg", manim.__version__, text_hash)
+
+
+def cached_text2svg(text2svg):
+    def _text2svg(self, color):
+        from manim import config
+
+        # Same path manim computes: <text_dir>/<_text2hash>.svg
+        text_hash = self._text2hash(color)
+        svg_file = config.get_dir("text_dir") / f"{text_hash}.svg"
+        if not svg_file.exists():
+            key = text_key(text_hash)
+            if text_store.fetch(key, svg_file):
+                return str(svg_file.resolve())
+            result = text2svg(self, color)
+            text_store.put(key, result)
+            return result
+        return text2svg(self, color)
+
+    return _text2svg
+
+
+def install():
+    """Back Text/MarkupText SVGs with the shared store (idempotent)."""
+    global _installed
+    if _installed or TEXT_CACHE_BYTES <= 0:
+        return
+
+    from manim import MarkupText, Text
+
+    for cls in (Text, MarkupText):
+        cls._text2svg = cached_text2svg(cls._text2svg)
+    _installed = True
+
+
+def _constant(source, namespace):
+    """Value of a literal or a manim constant (BLUE, BOLD, ...), else raise ValueError."""
+    node = ast.parse(source, mode="eval").body
+    if isinstance(node, ast.Name) and hasattr(namespace, node.id):
+        return getattr(namespace, node.id)
+    return ast.literal_eval(node)
+
+
+def _kwargs(style, namespace):
+    return {arg: _constant(source, namespace) for arg, source in style}
+
+
+def collect_text_calls(paths):
+    """
+    Scan scene files for Text(...) calls. Returns (labels, styles):
+    labels are (text, style) for calls with a literal string, styles the
+    keyword sets used by any Text call, literal or not. A style is a sorted
+    tuple of (keyword, source) pairs whose values are all constants.
+    """
+    import manim
+
+    labels, styles = set(), set()
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+            if name != "Text":
+                continue
+            style = tuple(sorted(
+                (keyword.arg, ast.unparse(keyword.value))
+                for keyword in node.keywords
+                if keyword.arg is not None
+            ))
+            try:
+                _kwargs(style, manim)
+            except (ValueError, TypeError, SyntaxError):
+                continue
+            styles.add(style)
+            if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                labels.add((node.args[0].value, style))
+    return labels, styles
+
+
+def prewarm(scene_dirs=SCENE_DIRS):
+    """Render the library's labels and short strings into the store. Returns the count."""
+    import manim
+    from manim import Text, tempconfig
+
+    install()
+    paths = sorted(path for scene_dir in scene_dirs for path in Path(scene_dir).glob("*.py"))
+    labels, styles = collect_text_calls(paths)
+    styles.add(())
+    texts = labels | {(string, style) for string in PREWARM_STRINGS for style in styles}
+
+    rendered = 0
+    with tempfile.TemporaryDirectory(prefix="text_prewarm_") as media_dir:
+        with tempconfig({"media_dir": media_dir}):
+            for string, style in sorted(texts):
+                try:
+                    Text(string, **_kwargs(style, manim))
+                    rendered += 1
+                except Exception as error:
+                    logger.warning(f"Could not pre-render Text({string!r}): {error}")
+    return rendered
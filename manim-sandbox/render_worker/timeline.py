@@ -0,0 +1,1083 @@
+"""
+Render Worker: static timeline analysis
+
+Estimates a scene's timeline from its source alone - nothing is imported or
+run, so it takes milliseconds and works on code that would crash. Where
+validateManimCode (utils/manim-generator.ts) counts "run_time=" with
+regexes, this walks construct() the way Python would:
+
+  - self.play / self.wait with manim's defaults (1 s per animation and per
+    wait, 2 s for DrawBorderThenFill, a Write of 15+ glyphs, ...) and the
+    timing of AnimationGroup / LaggedStart / Succession
+  - loops whose bounds are known statically are unrolled, including while
+    loops over known values (BinarySearchV2 replays the actual search)
+  - helper methods and local functions are inlined with their arguments
+    (MatMulV2.calc_element_visual)
+  - ifs on known values take their branch; otherwise the longer branch counts
+
+Values are tracked only when they are literals or computed from literals
+(numbers, strings, lists, range, len, ...); everything else is UNKNOWN.
+Loops over unknown values are counted once and listed in "notes", so the
+estimate is a floor for those. Values that grow past MAX_ITEMS items or
+MAX_INT_BITS bits become UNKNOWN, and the analysis stops after MAX_STEPS
+statements or MAX_SECONDS, so hostile code can't exhaust the server's
+memory or time.
+
+estimate() turns a timeline into a rough render-time estimate per quality,
+and admission() uses it to admit, queue, downgrade or reject a job before it
+takes a worker (POST /estimate, "admission": true on POST /render).
+"""
+
+import ast
+import operator
+import re
+import time
+from pathlib import Path
+
+from .catalog import SCENE_BASES
+from .registry import template_attributes
+from .scenes import DEFAULT_SCENE, resolve_scene_file
+from .settings import QUALITIES, RENDER_ROOT, RENDER_TIMEOUT
+
+
+DEFAULT_RUN_TIME = 1.0
+DEFAULT_WAIT = 1.0
+
+# Animations whose default run_time isn't 1 s
+RUN_TIMES = {
+    "DrawBorderThenFill": 2.0,
+    "Wiggle": 2.0,
+    "ApplyWave": 2.0,
+    "Homotopy": 3.0,
+    "Rotating": 5.0,
+}
+# Default lag_ratio of the animation groups
+GROUP_LAG_RATIOS = {
+    "AnimationGroup": 0.0,
+    "LaggedStart": 0.05,
+    "LaggedStartMap": 0.05,
+    "Succession": 1.0,
+}
+# Write runs for 2 s instead of 1 s from this many glyphs on
+WRITE_LONG_GLYPHS = 15
+
+TEX_CLASSES = {"MathTex", "Tex", "SingleStringMathTex", "Matrix", "IntegerMatrix", "DecimalMatrix",
+               "DecimalNumber", "Integer"}
+TEXT_CLASSES = {"Text", "MarkupText", "Paragraph"}
+GROUP_CLASSES = {"VGroup", "Group"}
+# Mobject methods that return the mobject itself
+CHAINABLE_METHODS = {
+    "align_to", "arrange", "arrange_in_grid", "center", "flip", "move_to", "next_to", "rotate",
+    "scale", "set_color", "set_fill", "set_opacity", "set_stroke", "set_z_index", "shift",
+    "stretch", "to_corner", "to_edge",
+}
+THREE_D_BASES = {"ThreeDScene", "SpecialThreeDScene"}
+
+# Interpreter limits: scenes that hit them are reported in "notes"
+MAX_STEPS = 100000
+MAX_LOOP = 1000
+MAX_DEPTH = 16
+MAX_ITEMS = 10000
+MAX_INT_BITS = 4096
+MAX_SECONDS = 2.0
+
+# Cost model (seconds on one worker, rough): scene set-up, per play (a partial
+# movie file and its encoder), per uncached Tex / Text object, per frame
+FRAME_RATES = {"low": 15, "medium": 30, "high": 60, "4k": 60}
+FRAME_SECONDS = {"low": 0.012, "medium": 0.03, "high": 0.08, "4k": 0.3}
+SCENE_SECONDS = 0.5
+PLAY_SECONDS = 0.1
+TEX_SECONDS = 0.5
+TEXT_SECONDS = 0.03
+# Waits on a still scene write the same frame again instead of rasterizing
+WAIT_FRAME_FACTOR = 0.2
+THREE_D_FACTOR = 3.0
+# Admit only jobs expected to finish well inside the render timeout
+ADMIT_FRACTION = 0.8
+
+
+class _Unknown:
+    def __repr__(self):
+        return "UNKNOWN"
+
+
+UNKNOWN = _Unknown()
+
+
+class _Break(Exception):
+    pass
+
+
+class _Continue(Exception):
+    pass
+
+
+class _Return(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class _OutOfSteps(Exception):
+    """The step or time budget ran out; the message says which."""
+
+
+class _Group(list):
+    """A VGroup / Group whose submobjects are known (their values may not be)."""
+
+
+class _Function:
+    """A def statement, with the frame it closes over."""
+
+    def __init__(self, node, frame):
+        self.node = node
+        self.frame = frame
+
+
+class _Frame:
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.values = {}
+        # name -> the expression last assigned to it (for Write's glyph count)
+        self.nodes = {}
+
+    def get(self, name):
+        frame = self
+        while frame is not None:
+            if name in frame.values:
+                return frame.values[name]
+            frame = frame.parent
+        return UNKNOWN
+
+    def node(self, name):
+        frame = self
+        while frame is not None:
+            if name in frame.values:
+                return frame.nodes.get(name)
+            frame = frame.parent
+        return None
+
+    def set(self, name, value, node=None):
+        self.values[name] = value
+        self.nodes[name] = node
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+# Builtins evaluated when all their arguments are known
+PURE_BUILTINS = {
+    "abs": abs,
+    "bool": bool,
+    "float": float,
+    "int": int,
+    "max": max,
+    "min": min,
+    "round": round,
+    "sorted": sorted,
+    "str": str,
+    "sum": sum,
+}
+SEQUENCES = (list, tuple, str, range)
+
+
+def _known(value):
+    if value is UNKNOWN:
+        return False
+    if isinstance(value, (list, tuple, set)):
+        return all(_known(item) for item in value)
+    if isinstance(value, dict):
+        return all(_known(item) for item in value.values())
+    return True
+
+
+def _truth(value):
+    """bool(value), or UNKNOWN. Containers are truthy by length alone."""
+    if isinstance(value, (list, tuple, set, dict, str, range)):
+        return bool(len(value))
+    if _known(value):
+        return bool(value)
+    return UNKNOWN
+
+
+def _items(value):
+    """The items of an iterable value whose length is known, else None."""
+    if isinstance(value, range):
+        return value if len(value) <= MAX_ITEMS else None
+    if isinstance(value, (list, tuple, str)):
+        return value
+    if isinstance(value, dict):
+        return list(value)
+    return None
+
+
+def _size(value, limit=MAX_ITEMS):
+    """Items in `value`, nested containers included; stops counting past `limit`."""
+    count = 0
+    stack = [value]
+    while stack and count <= limit:
+        value = stack.pop()
+        if isinstance(value, (str, range)):
+            count += len(value)
+        elif isinstance(value, dict):
+            count += len(value)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set)):
+            count += len(value)
+            stack.extend(value)
+    return count
+
+
+def _too_big(value):
+    """Whether a value is too large to keep tracking (repeated doubling, huge powers)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value.bit_length() > MAX_INT_BITS
+    return _size(value) > MAX_ITEMS
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _copy(value):
+    """Copy mutable containers (branches must not share lists)."""
+    if isinstance(value, list):
+        return type(value)(_copy(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+def _same(a, b):
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def _glyphs(node):
+    """Rough glyph count of a literal Text / Tex call, or None."""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+        return None
+    strings = [arg.value for arg in node.args if isinstance(arg, ast.Constant) and isinstance(arg.value, str)]
+    if not strings or node.func.id not in TEXT_CLASSES | TEX_CLASSES:
+        return None
+    text = "".join(strings)
+    if node.func.id in TEX_CLASSES:
+        # A TeX command is roughly one glyph; braces and scripts are none
+        text = re.sub(r"\\[A-Za-z]+", "#", text)
+        text = re.sub(r"[{}_^&]", "", text)
+    return len(re.sub(r"\s", "", text))
+
+
+def _base_names(node):
+    return [base.id if isinstance(base, ast.Name) else base.attr
+            for base in node.bases if isinstance(base, (ast.Name, ast.Attribute))]
+
+
+class _Interpreter:
+    """Abstract interpreter for one scene's construct()."""
+
+    def __init__(self, tree, chain, attributes):
+        self.plays = []
+        self.tex = 0
+        self.text = 0
+        self.notes = []
+        self.steps = 0
+        self.depth = 0
+        # Evaluating an animation's timing must not record anything twice
+        self.recording = True
+        self.deadline = time.monotonic() + MAX_SECONDS
+
+        self.module = _Frame()
+        self.methods = {}
+        self.instance = {}
+        try:
+            self.load(tree, chain)
+        except _OutOfSteps as error:
+            self.notes.append(f"{error}; the timeline is incomplete")
+        self.instance.update(attributes)
+
+    def load(self, tree, chain):
+        """Module-level values, then the scene's methods and class attributes."""
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.module.set(node.name, _Function(node, self.module))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+                self.statement(node, self.module)
+
+        for class_node in reversed(chain):
+            for node in class_node.body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    self.methods[node.name] = node
+                elif isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                        and isinstance(node.targets[0], ast.Name):
+                    self.instance[node.targets[0].id] = self.value(node.value, self.module)
+
+    def note(self, node, message):
+        entry = f"line {node.lineno}: {message}"
+        if entry not in self.notes:
+            self.notes.append(entry)
+
+    def run(self):
+        construct = self.methods.get("construct")
+        if construct is None:
+            self.notes.append("no construct() method")
+            return
+        try:
+            self.call_function(_Function(construct, self.module), [], {}, bound=True)
+        except _OutOfSteps as error:
+            self.notes.append(f"{error}; the timeline is incomplete")
+
+    def check_budget(self):
+        if self.steps > MAX_STEPS:
+            raise _OutOfSteps(f"stopped after {MAX_STEPS} statements")
+        if time.monotonic() > self.deadline:
+            raise _OutOfSteps(f"stopped after {MAX_SECONDS:g} s")
+
+    # Statements
+
+    def block(self, statements, frame):
+        for statement in statements:
+            self.statement(statement, frame)
+
+    def statement(self, node, frame):
+        self.steps += 1
+        self.check_budget()
+
+        if isinstance(node, ast.Expr):
+            self.value(node.value, frame)
+        elif isinstance(node, ast.Assign):
+            value = self.value(node.value, frame)
+            for target in node.targets:
+                self.assign(target, value, frame, node.value)
+        elif isinstance(node, ast.AnnAssign):
+            if node.value is not None:
+                self.assign(node.target, self.value(node.value, frame), frame, node.value)
+        elif isinstance(node, ast.AugAssign):
+            current = self.value(node.target, frame)
+            value = self.binary(node.op, current, self.value(node.value, frame))
+            self.assign(node.target, value, frame)
+        elif isinstance(node, (ast.For, ast.AsyncFor)):
+            self.loop_for(node, frame)
+        elif isinstance(node, ast.While):
+            self.loop_while(node, frame)
+        elif isinstance(node, ast.If):
+            self.branch(node, frame)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            for item in node.items:
+                self.value(item.context_expr, frame)
+            self.block(node.body, frame)
+        elif isinstance(node, ast.Try):
+            # Assume nothing raises
+            self.block(node.body, frame)
+            self.block(node.orelse, frame)
+            self.block(node.finalbody, frame)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            frame.set(node.name, _Function(node, frame))
+        elif isinstance(node, ast.Return):
+            raise _Return(self.value(node.value, frame) if node.value is not None else None)
+        elif isinstance(node, ast.Raise):
+            self.note(node, "raise ends the timeline here")
+            raise _Return(UNKNOWN)
+        elif isinstance(node, ast.Break):
+            raise _Break()
+        elif isinstance(node, ast.Continue):
+            raise _Continue()
+
+    def assign(self, target, value, frame, node=None):
+        if _too_big(value):
+            value = UNKNOWN
+        if isinstance(target, ast.Name):
+            frame.set(target.id, value, node)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            items = _items(value)
+            starred = any(isinstance(element, ast.Starred) for element in target.elts)
+            if items is None or starred or len(items) != len(target.elts):
+                items = [UNKNOWN] * len(target.elts)
+            for element, item in zip(target.elts, items):
+                self.assign(element.value if isinstance(element, ast.Starred) else element, item, frame)
+        elif isinstance(target, ast.Attribute):
+            if isinstance(target.value, ast.Name) and target.value.id == "self":
+                self.instance[target.attr] = value
+            else:
+                self.value(target.value, frame)
+        elif isinstance(target, ast.Subscript):
+            container = self.value(target.value, frame)
+            index = self.value(target.slice, frame)
+            if isinstance(container, (list, dict)) and _known(index):
+                try:
+                    container[index] = value
+                except Exception:
+                    pass
+                if _too_big(container):
+                    # Grown (or made cyclic) through an item
+                    self.forget(target.value, frame)
+
+    def loop_for(self, node, frame):
+        items = _items(self.value(node.iter, frame))
+        if items is None:
+            self.note(node, "loop over a value not known statically, counted once")
+            self.repeat(node, frame, 1)
+            return
+        if len(items) > MAX_LOOP:
+            self.note(node, f"{len(items)} iterations; body analysed once and multiplied")
+            self.repeat(node, frame, len(items))
+            return
+        for item in items:
+            self.assign(node.target, _copy(item), frame)
+            try:
+                self.block(node.body, frame)
+            except _Break:
+                return
+            except _Continue:
+                pass
+        self.block(node.orelse, frame)
+
+    def repeat(self, node, frame, times):
+        """Run a loop body once with unknown loop variables and count it `times` times."""
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            self.assign(node.target, UNKNOWN, frame)
+        start, tex, text = len(self.plays), self.tex, self.text
+        try:
+            self.block(node.body, frame)
+        except (_Break, _Continue):
+            pass
+        body_plays = self.plays[start:]
+        self.plays.extend(dict(play) for _ in range(times - 1) for play in body_plays)
+        self.tex += (self.tex - tex) * (times - 1)
+        self.text += (self.text - text) * (times - 1)
+
+    def loop_while(self, node, frame):
+        iterations = 0
+        while True:
+            test = _truth(self.value(node.test, frame))
+            if test is UNKNOWN:
+                if iterations == 0:
+                    self.note(node, "while condition not known statically, counted once")
+                    self.repeat(node, frame, 1)
+                else:
+                    self.note(node, f"while condition unknown after {iterations} iterations")
+                return
+            if not test:
+                self.block(node.orelse, frame)
+                return
+            iterations += 1
+            if iterations > MAX_LOOP:
+                self.note(node, f"while loop stopped after {MAX_LOOP} iterations")
+                return
+            try:
+                self.block(node.body, frame)
+            except _Break:
+                return
+            except _Continue:
+                pass
+
+    def branch(self, node, frame):
+        test = _truth(self.value(node.test, frame))
+        if test is not UNKNOWN:
+            self.block(node.body if test else node.orelse, frame)
+            return
+
+        # Run both branches on copies; keep the longer one
+        start, tex, text = len(self.plays), self.tex, self.text
+        values, instance = frame.values, self.instance
+        outcomes = []
+        for body in (node.body, node.orelse):
+            frame.values = {name: _copy(value) for name, value in values.items()}
+            self.instance = {name: _copy(value) for name, value in instance.items()}
+            flow = None
+            try:
+                self.block(body, frame)
+            except (_Break, _Continue, _Return) as error:
+                flow = error
+            outcomes.append((self.plays[start:], self.tex - tex, self.text - text,
+                             frame.values, self.instance, flow))
+            del self.plays[start:]
+            self.tex, self.text = tex, text
+
+        chosen = max(outcomes, key=lambda outcome: sum(play["duration"] for play in outcome[0]))
+        (plays, tex_count, text_count, _, _, flow) = chosen
+        self.plays.extend(plays)
+        self.tex += tex_count
+        self.text += text_count
+        frame.values = _merge(outcomes[0][3], outcomes[1][3])
+        self.instance = _merge(outcomes[0][4], outcomes[1][4])
+        if flow is not None:
+            raise flow
+
+    # Expressions
+
+    def value(self, node, frame):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return frame.get(node.id)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            items = []
+            for element in node.elts:
+                if isinstance(element, ast.Starred):
+                    expanded = _items(self.value(element.value, frame))
+                    if expanded is None:
+                        items = None
+                    elif items is not None:
+                        items.extend(expanded)
+                else:
+                    item = self.value(element, frame)
+                    if items is not None:
+                        items.append(item)
+            if items is None:
+                return UNKNOWN
+            if isinstance(node, ast.Tuple):
+                return tuple(items)
+            if isinstance(node, ast.Set):
+                return set(items) if _known(items) else UNKNOWN
+            return items
+        if isinstance(node, ast.Dict):
+            keys = [self.value(key, frame) if key is not None else UNKNOWN for key in node.keys]
+            values = [self.value(value, frame) for value in node.values]
+            if not all(_known(key) for key in keys):
+                return UNKNOWN
+            try:
+                return dict(zip(keys, values))
+            except TypeError:
+                return UNKNOWN
+        if isinstance(node, ast.BinOp):
+            return self.binary(node.op, self.value(node.left, frame), self.value(node.right, frame))
+        if isinstance(node, ast.UnaryOp):
+            operand = self.value(node.operand, frame)
+            if isinstance(node.op, ast.Not):
+                truth = _truth(operand)
+                return UNKNOWN if truth is UNKNOWN else not truth
+            if type(node.op) not in UNARY_OPERATORS or not _known(operand):
+                return UNKNOWN
+            return _apply(UNARY_OPERATORS[type(node.op)], operand)
+        if isinstance(node, ast.BoolOp):
+            result = UNKNOWN
+            for operand in node.values:
+                result = self.value(operand, frame)
+                truth = _truth(result)
+                if truth is UNKNOWN:
+                    return UNKNOWN
+                if truth == isinstance(node.op, ast.Or):
+                    return result
+            return result
+        if isinstance(node, ast.Compare):
+            left = self.value(node.left, frame)
+            result = True
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self.value(comparator, frame)
+                if not (_known(left) and _known(right)) or type(op) not in COMPARISONS:
+                    return UNKNOWN
+                outcome = _apply(COMPARISONS[type(op)], left, right)
+                if outcome is UNKNOWN:
+                    return UNKNOWN
+                result = result and outcome
+                left = right
+            return result
+        if isinstance(node, ast.IfExp):
+            test = _truth(self.value(node.test, frame))
+            if test is UNKNOWN:
+                self.value(node.body, frame)
+                self.value(node.orelse, frame)
+                return UNKNOWN
+            return self.value(node.body if test else node.orelse, frame)
+        if isinstance(node, ast.Subscript):
+            container = self.value(node.value, frame)
+            index = self.value(node.slice, frame)
+            if not _known(index) or not isinstance(container, (list, tuple, str, dict, range)):
+                return UNKNOWN
+            return _apply(operator.getitem, container, index)
+        if isinstance(node, ast.Slice):
+            parts = [self.value(part, frame) if part is not None else None
+                     for part in (node.lower, node.upper, node.step)]
+            return slice(*parts) if all(_known(part) for part in parts) else UNKNOWN
+        if isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name) and node.value.id == "self":
+                return self.instance.get(node.attr, UNKNOWN)
+            self.value(node.value, frame)
+            return UNKNOWN
+        if isinstance(node, ast.Call):
+            return self.call(node, frame)
+        if isinstance(node, (ast.ListComp, ast.GeneratorExp, ast.SetComp)):
+            return self.comprehension(node, frame)
+        if isinstance(node, ast.NamedExpr):
+            value = self.value(node.value, frame)
+            self.assign(node.target, value, frame, node.value)
+            return value
+        if isinstance(node, (ast.Lambda, ast.DictComp)):
+            return UNKNOWN
+        # f-strings, awaits, ...: evaluate the parts for their calls
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr):
+                self.value(child, frame)
+        return UNKNOWN
+
+    def binary(self, op, left, right):
+        if type(op) not in BINARY_OPERATORS or not (_known(left) and _known(right)):
+            return UNKNOWN
+        # Refuse results that would be huge before computing them
+        if isinstance(op, ast.Pow):
+            if _number(right) is None or abs(right) > 64:
+                return UNKNOWN
+            if isinstance(left, int) and left.bit_length() * abs(right) > MAX_INT_BITS:
+                return UNKNOWN
+        if isinstance(op, ast.Add) and isinstance(left, SEQUENCES) and isinstance(right, SEQUENCES) \
+                and len(left) + len(right) > MAX_ITEMS:
+            return UNKNOWN
+        if isinstance(op, ast.Mult):
+            for sequence, times in ((left, right), (right, left)):
+                if isinstance(sequence, SEQUENCES) and isinstance(times, int) \
+                        and len(sequence) * times > MAX_ITEMS:
+                    return UNKNOWN
+        if isinstance(op, ast.Mod) and isinstance(left, str):
+            # printf-style widths ("%*d") can ask for any length
+            return UNKNOWN
+        result = _apply(BINARY_OPERATORS[type(op)], left, right)
+        return UNKNOWN if _too_big(result) else result
+
+    def comprehension(self, node, frame):
+        results = []
+        scope = _Frame(frame)
+
+        def generate(index):
+            self.check_budget()
+            if index == len(node.generators):
+                results.append(self.value(node.elt, scope))
+                return len(results) <= MAX_ITEMS
+            generator = node.generators[index]
+            items = _items(self.value(generator.iter, scope))
+            if items is None or len(items) > MAX_ITEMS:
+                return False
+            for item in items:
+                self.assign(generator.target, item, scope)
+                conditions = [_truth(self.value(condition, scope)) for condition in generator.ifs]
+                if any(condition is UNKNOWN for condition in conditions):
+                    return False
+                if all(conditions) and not generate(index + 1):
+                    return False
+            return True
+
+        if not generate(0):
+            return UNKNOWN
+        if isinstance(node, ast.SetComp):
+            return set(results) if _known(results) else UNKNOWN
+        return results
+
+    def arguments(self, node, frame):
+        """(positional, keywords, complete) for a call's arguments."""
+        positional, keywords, complete = [], {}, True
+        for arg in node.args:
+            if isinstance(arg, ast.Starred):
+                items = _items(self.value(arg.value, frame))
+                if items is None:
+                    complete = False
+                else:
+                    positional.extend(items)
+            else:
+                positional.append(self.value(arg, frame))
+        for keyword in node.keywords:
+            value = self.value(keyword.value, frame)
+            if keyword.arg is None:
+                complete = False
+            else:
+                keywords[keyword.arg] = value
+        return positional, keywords, complete
+
+    def call(self, node, frame):
+        func = node.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self":
+            if func.attr == "play":
+                self.play(node, frame)
+                return None
+            if func.attr == "wait":
+                self.wait(node, frame)
+                return None
+            if func.attr in self.methods:
+                positional, keywords, complete = self.arguments(node, frame)
+                if not complete:
+                    self.note(node, f"self.{func.attr}() called with unknown *args/**kwargs")
+                return self.call_function(_Function(self.methods[func.attr], self.module),
+                                          positional, keywords, bound=True)
+            self.arguments(node, frame)
+            return UNKNOWN
+
+        if isinstance(func, ast.Attribute):
+            container = self.value(func.value, frame)
+            positional, keywords, _ = self.arguments(node, frame)
+            if isinstance(container, _Group):
+                if func.attr == "add":
+                    container.extend(positional)
+                    if _too_big(container):
+                        return self.forget(func.value, frame)
+                    return container
+                if func.attr in CHAINABLE_METHODS:
+                    return container
+                if func.attr == "copy":
+                    return _Group(container)
+            if isinstance(container, list) and func.attr in ("append", "extend", "insert", "pop"):
+                if func.attr == "extend":
+                    items = _items(positional[0]) if positional else None
+                    if items is None or len(container) + len(items) > MAX_ITEMS:
+                        return self.forget(func.value, frame)
+                    positional = [items]
+                result = _apply(getattr(container, func.attr), *positional)
+                if _too_big(container):
+                    # Grown (or made cyclic) through append / insert
+                    return self.forget(func.value, frame)
+                return result
+            if isinstance(container, dict) and func.attr in ("get", "keys", "values", "items"):
+                result = _apply(getattr(container, func.attr), *positional)
+                return result if func.attr == "get" else list(result)
+            return UNKNOWN
+
+        if isinstance(func, ast.Name):
+            target = frame.get(func.id)
+            positional, keywords, complete = self.arguments(node, frame)
+            if isinstance(target, _Function):
+                if not complete:
+                    self.note(node, f"{func.id}() called with unknown *args/**kwargs")
+                return self.call_function(target, positional, keywords)
+            if self.recording:
+                if func.id in TEX_CLASSES:
+                    self.tex += 1
+                elif func.id in TEXT_CLASSES:
+                    self.text += 1
+            if func.id in GROUP_CLASSES and complete and not keywords:
+                return _Group(positional)
+            return self.builtin(func.id, positional, keywords, complete)
+
+        self.value(func, frame)
+        self.arguments(node, frame)
+        return UNKNOWN
+
+    def forget(self, node, frame):
+        """A container's contents are no longer known."""
+        if isinstance(node, ast.Name):
+            frame.set(node.id, UNKNOWN)
+        return UNKNOWN
+
+    def builtin(self, name, positional, keywords, complete):
+        if not complete or name in self.module.values:
+            return UNKNOWN
+        if name == "len" and len(positional) == 1:
+            items = _items(positional[0])
+            if items is None and isinstance(positional[0], (dict, set)):
+                items = positional[0]
+            return len(items) if items is not None else UNKNOWN
+        if name == "range":
+            if not all(isinstance(arg, int) and not isinstance(arg, bool) for arg in positional) or keywords:
+                return UNKNOWN
+            return _apply(range, *positional)
+        if name == "enumerate" and positional:
+            items = _items(positional[0])
+            start = keywords.get("start", positional[1] if len(positional) > 1 else 0)
+            if items is None or not isinstance(start, int):
+                return UNKNOWN
+            return list(enumerate(items, start))
+        if name in ("list", "tuple", "zip", "reversed") and not keywords:
+            sequences = [_items(arg) for arg in positional]
+            if any(items is None for items in sequences):
+                return UNKNOWN
+            if name == "zip":
+                return [tuple(items) for items in zip(*sequences)]
+            if len(sequences) > 1:
+                return UNKNOWN
+            items = sequences[0] if sequences else []
+            if name == "reversed":
+                return list(reversed(items))
+            return tuple(items) if name == "tuple" else list(items)
+        if name in PURE_BUILTINS and _known(positional) and _known(keywords):
+            result = _apply(PURE_BUILTINS[name], *positional, **keywords)
+            return UNKNOWN if _too_big(result) else result
+        return UNKNOWN
+
+    def call_function(self, function, positional, keywords, bound=False):
+        """Inline a call: bind the arguments and run the body."""
+        node = function.node
+        if self.depth >= MAX_DEPTH or not self.recording:
+            if self.recording:
+                self.note(node, f"{node.name}() nested too deeply to inline")
+            return UNKNOWN
+
+        frame = _Frame(function.frame)
+        args = node.args
+        params = [*args.posonlyargs, *args.args]
+        if bound and params:
+            params = params[1:]
+        defaults = [None] * (len(params) - len(args.defaults)) + list(args.defaults)
+        for index, (param, default) in enumerate(zip(params, defaults)):
+            if index < len(positional):
+                value = positional[index]
+            elif param.arg in keywords:
+                value = keywords.pop(param.arg)
+            elif default is not None:
+                value = self.value(default, self.module)
+            else:
+                value = UNKNOWN
+            frame.set(param.arg, value)
+        for param, default in zip(args.kwonlyargs, args.kw_defaults):
+            if param.arg in keywords:
+                value = keywords.pop(param.arg)
+            elif default is not None:
+                value = self.value(default, self.module)
+            else:
+                value = UNKNOWN
+            frame.set(param.arg, value)
+        if args.vararg:
+            frame.set(args.vararg.arg, tuple(positional[len(params):]))
+        if args.kwarg:
+            frame.set(args.kwarg.arg, dict(keywords))
+
+        self.depth += 1
+        try:
+            self.block(node.body, frame)
+        except _Return as result:
+            return result.value
+        except (_Break, _Continue):
+            pass
+        finally:
+            self.depth -= 1
+        return None
+
+    # Timeline
+
+    def play(self, node, frame):
+        self.arguments(node, frame)
+        if not self.recording:
+            return
+        keywords = {keyword.arg: keyword.value for keyword in node.keywords if keyword.arg}
+        duration = None
+        if "run_time" in keywords:
+            duration = _number(self.peek(keywords["run_time"], frame))
+            if duration is None:
+                self.note(node, "run_time not known statically, assumed 1s")
+                duration = DEFAULT_RUN_TIME
+        if duration is None:
+            times = [time for arg in node.args for time in self.animation_times(arg, frame)]
+            duration = max(times, default=DEFAULT_RUN_TIME)
+        self.plays.append({"line": node.lineno, "duration": float(duration), "is_wait": False})
+
+    def wait(self, node, frame):
+        positional, keywords, _ = self.arguments(node, frame)
+        if not self.recording:
+            return
+        duration = positional[0] if positional else keywords.get("duration", DEFAULT_WAIT)
+        if "stop_condition" in keywords:
+            self.note(node, "wait with a stop_condition; its duration is the maximum")
+        if _number(duration) is None:
+            self.note(node, "wait duration not known statically, assumed 1s")
+            duration = DEFAULT_WAIT
+        self.plays.append({"line": node.lineno, "duration": float(duration), "is_wait": True})
+
+    def peek(self, node, frame):
+        """Evaluate without recording plays, Tex or Text."""
+        recording, self.recording = self.recording, False
+        try:
+            return self.value(node, frame)
+        finally:
+            self.recording = recording
+
+    def animation_times(self, node, frame):
+        """Run times of the animation(s) an argument of play() stands for."""
+        if isinstance(node, ast.Starred):
+            inner = node.value
+            if isinstance(inner, (ast.ListComp, ast.GeneratorExp)):
+                count = self.peek(inner, frame)
+                times = self.animation_times(inner.elt, frame)
+                return times * len(count) if isinstance(count, list) else times
+            items = _items(self.peek(inner, frame))
+            return [DEFAULT_RUN_TIME] * len(items) if items else [DEFAULT_RUN_TIME]
+        return [self.animation_time(node, frame)]
+
+    def animation_time(self, node, frame):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+            # mobject.animate..., variables holding animations
+            return DEFAULT_RUN_TIME
+        name = node.func.id
+        keywords = {keyword.arg: keyword.value for keyword in node.keywords if keyword.arg}
+        if "run_time" in keywords:
+            run_time = _number(self.peek(keywords["run_time"], frame))
+            if run_time is not None:
+                return run_time
+
+        if name in GROUP_LAG_RATIOS:
+            if name == "LaggedStartMap":
+                return DEFAULT_RUN_TIME
+            lag_ratio = GROUP_LAG_RATIOS[name]
+            if "lag_ratio" in keywords:
+                lag_ratio = _number(self.peek(keywords["lag_ratio"], frame))
+                if lag_ratio is None:
+                    lag_ratio = GROUP_LAG_RATIOS[name]
+            times = [time for arg in node.args for time in self.animation_times(arg, frame)]
+            return _group_time(times, lag_ratio)
+        if name == "Wait":
+            duration = _number(self.peek(node.args[0], frame)) if node.args else None
+            return duration if duration is not None else DEFAULT_WAIT
+        if name == "Write" and node.args:
+            target = node.args[0]
+            if isinstance(target, ast.Name):
+                target = frame.node(target.id)
+            glyphs = _glyphs(target)
+            if glyphs is not None and glyphs >= WRITE_LONG_GLYPHS:
+                return 2.0
+        return RUN_TIMES.get(name, DEFAULT_RUN_TIME)
+
+
+def _apply(function, *args, **kwargs):
+    try:
+        return function(*args, **kwargs)
+    except Exception:
+        return UNKNOWN
+
+
+def _merge(first, second):
+    """Values two branches agree on; the rest become UNKNOWN."""
+    return {
+        name: first[name] if name in second and _same(first[name], second[name]) else UNKNOWN
+        for name in first.keys() | second.keys()
+    }
+
+
+def _group_time(times, lag_ratio):
+    """Run time of an AnimationGroup: each child starts lag_ratio into the previous."""
+    if not times:
+        return 0.0
+    start, end = 0.0, 0.0
+    for time in times:
+        end = max(end, start + time)
+        start += lag_ratio * time
+    return end
+
+
+def analyze_source(source, scene_name=None, attributes=None, filename="<scene>"):
+    """
+    The static timeline of `scene_name` in `source`:
+      {"scene", "duration", "plays", "waits", "wait_time", "tex", "text",
+       "three_d", "timeline": [{"line", "duration", "is_wait"}, ...], "notes"}
+    `attributes` override class attributes (template params). Raises
+    SyntaxError for code that doesn't parse and ValueError if the scene
+    isn't there.
+    """
+    tree = ast.parse(source, filename=filename)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+
+    def lineage(name, seen=()):
+        """Local classes from `name` up, and the manim bases reached."""
+        node = classes[name]
+        chain, bases = [node], set()
+        for base in _base_names(node):
+            if base in SCENE_BASES:
+                bases.add(base)
+            elif base in classes and base not in seen:
+                base_chain, base_bases = lineage(base, (*seen, name))
+                chain += base_chain
+                bases |= base_bases
+        return chain, bases
+
+    scenes = {name: lineage(name) for name in classes}
+    scenes = {name: found for name, found in scenes.items() if found[1]}
+    if scene_name is None:
+        scene_name = DEFAULT_SCENE if DEFAULT_SCENE in scenes else next(iter(scenes), None)
+    if scene_name not in scenes:
+        raise ValueError(f"No scene {scene_name} in {filename}")
+    chain, bases = scenes[scene_name]
+
+    interpreter = _Interpreter(tree, chain, attributes or {})
+    interpreter.run()
+    plays = interpreter.plays
+    waits = [play for play in plays if play["is_wait"]]
+    return {
+        "scene": scene_name,
+        "duration": round(sum(play["duration"] for play in plays), 3),
+        "plays": len(plays) - len(waits),
+        "waits": len(waits),
+        "wait_time": round(sum(play["duration"] for play in waits), 3),
+        "tex": interpreter.tex,
+        "text": interpreter.text,
+        "three_d": bool(bases & THREE_D_BASES),
+        "timeline": plays,
+        "notes": interpreter.notes,
+    }
+
+
+def analyze_job(job):
+    """analyze_source() for a render job (code, template + scene, or template + params)."""
+    if job.get("code"):
+        return analyze_source(job["code"], job.get("scene") or DEFAULT_SCENE, filename="scene.py")
+    scene_file, scene_name = resolve_scene_file(job, RENDER_ROOT)
+    attributes = None
+    if job.get("params") is not None:
+        attributes = template_attributes(job["template"], job["params"])
+    return analyze_source(Path(scene_file).read_text(encoding="utf-8"), scene_name, attributes,
+                          filename=str(scene_file))
+
+
+def estimate(analysis, quality):
+    """Rough render time of an analysed scene at `quality`, on one worker."""
+    frame_rate = FRAME_RATES[quality]
+    frame_seconds = FRAME_SECONDS[quality] * (THREE_D_FACTOR if analysis["three_d"] else 1)
+    animation_frames = (analysis["duration"] - analysis["wait_time"]) * frame_rate
+    wait_frames = analysis["wait_time"] * frame_rate
+    seconds = (
+        SCENE_SECONDS
+        + (analysis["plays"] + analysis["waits"]) * PLAY_SECONDS
+        + analysis["tex"] * TEX_SECONDS
+        + analysis["text"] * TEXT_SECONDS
+        + frame_seconds * (animation_frames + WAIT_FRAME_FACTOR * wait_frames)
+    )
+    return {"frames": round(animation_frames + wait_frames), "seconds": round(seconds, 1)}
+
+
+def admission(analysis, quality, busy, workers, budget=RENDER_TIMEOUT):
+    """
+    What to do with a job before it takes a worker:
+      "admit"     - expected to finish well inside `budget`
+      "queue"     - fits, but every worker is busy
+      "downgrade" - too slow at `quality`; "quality" is the best that fits
+      "reject"    - too slow even at the lowest quality
+    """
+    estimates = {name: estimate(analysis, name) for name in QUALITIES}
+    limit = budget * ADMIT_FRACTION
+    qualities = list(QUALITIES)
+    chosen = None
+    for name in reversed(qualities[:qualities.index(quality) + 1]):
+        if estimates[name]["seconds"] <= limit:
+            chosen = name
+            break
+
+    if chosen is None:
+        decision = "reject"
+    elif chosen != quality:
+        decision = "downgrade"
+    else:
+        decision = "queue" if busy >= workers else "admit"
+    return {
+        "decision": decision,
+        "quality": chosen or quality,
+        "estimated_seconds": estimates[chosen or quality]["seconds"],
+        "budget": budget,
+        "estimates": estimates,
+    }
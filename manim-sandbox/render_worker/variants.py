@@ -0,0 +1,164 @@
+"""
+Render Worker: variant batches
+
+Variants of a template (named subclasses like CoinFlipTree / WeatherTree,
+or the same template with different params) often open the same way: same
+title, same axes, same start node. Rendered independently, N variants render
+that opening N times - and rendered in parallel, the partial movie cache
+(movie_cache.py) can't help because they all miss at once.
+
+A variant batch:
+  1. Plays every variant back with play hashes (playback.py), in parallel.
+     A play's hash covers its animations, the camera and everything already
+     on screen, so equal hashes mean identical partial movies.
+  2. Groups variants by their first play and finds each group's common
+     prefix of plays.
+  3. Renders each shared prefix once (manim's -n 0,k-1), which publishes its
+     partial movies to the shared cache.
+  4. Renders every variant in parallel; the prefix plays are cache hits, so
+     each variant only renders its own suffix.
+
+The plays after the first difference never match, so variants whose
+titles differ share nothing; the batch pays off for variants that diverge
+late (personalised params under a common title, a fixed opening). Every
+variant is also played back once more than a plain render, so the result
+reports what the batch spent on playback and prefix renders;
+benchmarks/template_variants.py compares a batch with separate renders.
+"""
+
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .result_cache import cached_render
+from .settings import MOVIE_CACHE_BYTES, RENDER_ROOT
+
+
+def common_prefix(sequences):
+    """Length of the longest prefix all `sequences` share."""
+    length = 0
+    for items in zip(*sequences):
+        if any(item != items[0] for item in items[1:]):
+            break
+        length += 1
+    return length
+
+
+def plan_prefixes(hash_lists):
+    """
+    Group variants by their first play hash. Returns [(indices, shared
+    plays), ...] for the groups that share at least one play.
+    """
+    groups = {}
+    for index, hashes in enumerate(hash_lists):
+        if hashes:
+            groups.setdefault(hashes[0], []).append(index)
+    plan = []
+    for indices in groups.values():
+        if len(indices) > 1:
+            plan.append((indices, common_prefix([hash_lists[index] for index in indices])))
+    return plan
+
+
+def render_variants(jobs, renderer):
+    """
+    Render a batch of variant jobs on `renderer` (a WarmPool or
+    ZygoteRenderer). Returns {"success", "variants": [result, ...], ...}.
+    """
+    try:
+        return _render_variants(jobs, renderer)
+    except Exception as error:
+        return {
+            "success": False,
+            "error": f"{type(error).__name__}: {error}",
+            "traceback": traceback.format_exc(),
+        }
+
+
+def _render_variants(jobs, renderer):
+    started = time.time()
+    batch_dir = RENDER_ROOT / f"variants_{uuid.uuid4().hex}"
+    jobs = [
+        {**job, "media_dir": job.get("media_dir") or str(batch_dir / f"variant_{index:03d}" / "media")}
+        for index, job in enumerate(jobs)
+    ]
+
+    plan, timings = [], {"playback_time": 0.0, "prefix_time": 0.0}
+    if MOVIE_CACHE_BYTES > 0 and len(jobs) > 1:
+        plan, timings = _render_prefixes(jobs, renderer, batch_dir)
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as threads:
+        results = list(threads.map(lambda job: cached_render(job, renderer.render), jobs))
+
+    return {
+        "success": all(result.get("success") for result in results),
+        "variants": results,
+        "shared_prefixes": [{"variants": indices, "plays": plays} for indices, plays in plan],
+        **timings,
+        "render_time": round(time.time() - started, 3),
+    }
+
+
+def _render_prefixes(jobs, renderer, batch_dir):
+    """
+    Find and render the prefixes variants share. Returns the plan and the
+    seconds spent on playback and on prefix renders.
+    """
+    def playback(index):
+        job = jobs[index]
+        if not job.get("movie_cache", True) or job.get("disable_caching"):
+            return []
+        timeline = renderer.render({
+            **job,
+            "action": "playback",
+            "hashes": True,
+            "media_dir": str(batch_dir / "playback" / f"variant_{index:03d}" / "media"),
+        })
+        # A variant that fails playback shares nothing; its render reports the error
+        if not timeline.get("success"):
+            return []
+        return [play["hash"] for play in timeline["plays"]]
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as threads:
+        hash_lists = list(threads.map(playback, range(len(jobs))))
+    playback_time = time.time() - started
+
+    plan = plan_prefixes(hash_lists)
+    prefix_jobs = [
+        {
+            **jobs[indices[0]],
+            "from_animation": 0,
+            "upto_animation": plays - 1,
+            "media_dir": str(batch_dir / "prefixes" / f"prefix_{number:03d}" / "media"),
+        }
+        for number, (indices, plays) in enumerate(plan)
+    ]
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=len(prefix_jobs) or 1) as threads:
+        list(threads.map(renderer.render, prefix_jobs))
+    return plan, {"playback_time": round(playback_time, 3), "prefix_time": round(time.time() - started, 3)}
+
+
+def variant_jobs(body):
+    """
+    Expand {"variants": [{...}, ...], <shared job fields>} into one job per
+    variant (variant fields win).
+    """
+    variants = body.get("variants")
+    if not isinstance(variants, list) or not variants:
+        raise ValueError("'variants' must be a non-empty list of job objects")
+    base = {key: value for key, value in body.items() if key != "variants"}
+    jobs = []
+    for variant in variants:
+        if not isinstance(variant, dict):
+            raise ValueError("Each variant must be a JSON object")
+        jobs.append({**base, **variant})
+    if body.get("media_dir"):
+        # One media_dir per variant under the caller's
+        for index, job in enumerate(jobs):
+            if job.get("media_dir") == body["media_dir"]:
+                job["media_dir"] = str(Path(body["media_dir"]) / f"variant_{index:03d}")
+    return jobs
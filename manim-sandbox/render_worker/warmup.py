@@ -0,0 +1,49 @@
+"""
+Render Worker: warm-up
+
+Everything a fresh interpreter has to do before it can render its first
+scene. Worker processes (and the zygote, see zygote.py) call ``warm()`` once
+at start-up.
+"""
+
+import os
+import tempfile
+
+from . import tex_cache, tex_format, text_cache
+from .settings import CACHE_HOME
+
+
+def warm():
+    """Import manim and its heavy dependencies, then warm Pango and LaTeX."""
+    # fontconfig keeps its cache under $XDG_CACHE_HOME/fontconfig; point it at
+    # the cache shipped with the sandbox before manimpango initialises it.
+    os.environ.setdefault("XDG_CACHE_HOME", str(CACHE_HOME))
+
+    import numpy  # noqa: F401
+    import scipy  # noqa: F401
+    import manim  # noqa: F401
+
+    tex_cache.install()
+    tex_format.install()
+    text_cache.install()
+    warm_text_and_tex()
+
+
+def warm_text_and_tex():
+    """
+    Build a throwaway Text and MathTex. This loads the font configuration
+    into Pango and pulls the latex/dvisvgm binaries and format files into the
+    page cache, so the first real render doesn't pay for it.
+    """
+    from manim import MathTex, Text, logger, tempconfig
+
+    with tempfile.TemporaryDirectory(prefix="manim_warmup_") as media_dir:
+        with tempconfig({"media_dir": media_dir}):
+            try:
+                Text("Juliette 0123456789")
+            except Exception as error:
+                logger.warning(f"Pango warm-up failed: {error}")
+            try:
+                MathTex(r"f(x) = x^2")
+            except Exception as error:
+                logger.warning(f"LaTeX warm-up failed: {error}")
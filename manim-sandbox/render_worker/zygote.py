@@ -0,0 +1,96 @@
+"""
+Render Worker: zygote (fork server)
+
+Every render runs in its own process, forked from a zygote that has already
+imported manim, numpy and scipy, loaded the fontconfig cache and rendered a
+throwaway Text/MathTex. Untrusted GeneratedScene code gets a disposable
+address space - nothing it does survives the render - while start-up cost
+stays close to a fork().
+
+This is multiprocessing's "forkserver" start method with
+render_worker.zygote_preload as the preloaded module.
+"""
+
+import multiprocessing
+import threading
+
+from .settings import DEFAULT_WORKERS, RENDER_TIMEOUT
+
+
+def _render_child(job, conn):
+    """Runs in the forked child: render one job and report back."""
+    from .render import run_job
+
+    conn.send(run_job(job))
+    conn.close()
+
+
+class ZygoteRenderer:
+    """
+    Fork-per-render renderer with the same interface as WarmPool.
+
+    `size` limits how many forked renders run at once.
+    """
+
+    def __init__(self, size=DEFAULT_WORKERS, timeout=RENDER_TIMEOUT):
+        self.size = size
+        self.timeout = timeout
+        self._ctx = multiprocessing.get_context("forkserver")
+        self._ctx.set_forkserver_preload(["render_worker.zygote_preload"])
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._forks = 0
+
+        # Start the zygote now so it warms up before the first request
+        self._run_noop()
+
+    def _run_noop(self):
+        process = self._ctx.Process(target=int)
+        process.start()
+        process.join()
+
+    def render(self, job, timeout=None):
+        """Fork a child of the zygote, render the job in it and return its result."""
+        timeout = timeout or self.timeout
+        with self._slots:
+            with self._lock:
+                self._busy += 1
+                self._forks += 1
+            receiver, sender = self._ctx.Pipe(duplex=False)
+            # Passed on so work the job forks (frames.py) shares its deadline
+            process = self._ctx.Process(target=_render_child, args=({**job, "timeout": timeout}, sender),
+                                        daemon=True)
+            try:
+                process.start()
+                sender.close()
+
+                if not receiver.poll(timeout):
+                    process.kill()
+                    return {
+                        "success": False,
+                        "timed_out": True,
+                        "error": f"Render timed out after {timeout:.0f} seconds",
+                    }
+                return receiver.recv()
+            except EOFError:
+                process.join(timeout=5)
+                return {
+                    "success": False,
+                    "error": f"Render process exited with code {process.exitcode}",
+                }
+            finally:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+                receiver.close()
+                with self._lock:
+                    self._busy -= 1
+
+    def stats(self):
+        with self._lock:
+            return {"mode": "zygote", "workers": self.size, "busy": self._busy, "forks": self._forks}
+
+    def close(self):
+        pass
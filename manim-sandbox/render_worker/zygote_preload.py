@@ -0,0 +1,10 @@
+"""
+Render Worker: zygote preload
+
+Imported by the fork server (see zygote.py) before it forks its first render,
+so every render starts as a copy-on-write image of an already warm process.
+"""
+
+from .warmup import warm
+
+warm()
@@ -3,7 +3,8 @@ Template: calculus_derivative
 Description: Visualize derivatives as rate of change
 
 Parameters:
-  - function: str - Function expression (e.g., "x**2")
+  - function: str - Function expression (e.g., "x**2"), compiled with
+    expressions.compile_expression (arithmetic and numpy functions only)
   - point: float - Point at which to show derivative
   - show_tangent: bool - Whether to show tangent line
   - show_secant: bool - Whether to animate secant lines approaching tangent
@@ -19,6 +20,9 @@ Render command for testing:
 from manim import *
 import numpy as np
 
+from expressions import compile_expression
+from sampling import plot_adaptive
+
 
 class DerivativeScene(Scene):
     """
@@ -32,8 +36,12 @@ class DerivativeScene(Scene):
     show_tangent = True
     show_secant = True
     title_text = "Derivative as Rate of Change"
+    adaptive_sampling = True
 
     def construct(self):
+        # Parse the function once; rejects anything but a plain expression of x
+        func = compile_expression(self.function_str)
+
         # Title
         title = Text(self.title_text, font_size=36)
         title.to_edge(UP)
@@ -47,12 +55,8 @@ class DerivativeScene(Scene):
         )
         labels = axes.get_axis_labels(x_label="x", y_label="f(x)")
 
-        # Define function
-        def func(x):
-            return eval(self.function_str, {"x": x, "np": np, "sin": np.sin, "cos": np.cos})
-
         # Create graph
-        graph = axes.plot(func, color=BLUE)
+        graph = self.plot(axes, func, color=BLUE)
         func_label = MathTex(f"f(x) = {self.function_str}", color=BLUE)
         func_label.next_to(title, DOWN)
 
@@ -80,6 +84,12 @@ class DerivativeScene(Scene):
 
         self.wait(2)
 
+    def plot(self, axes, func, **kwargs):
+        """Plot a vectorized function, adaptively sampled unless disabled."""
+        if self.adaptive_sampling:
+            return plot_adaptive(axes, func, **kwargs)
+        return axes.plot(func, use_vectorized=True, **kwargs)
+
     def animate_secant_lines(self, axes, func, x_point, y_point):
         """Animate secant lines getting closer to the tangent."""
         # Information box
@@ -97,10 +107,11 @@ class DerivativeScene(Scene):
 
             # Secant line
             slope = (y2 - y_point) / h
-            secant = axes.plot(
+            secant = self.plot(
+                axes,
                 lambda x: slope * (x - x_point) + y_point,
                 color=RED,
-                x_range=[-1, 4]
+                x_range=[-1, 4],
             )
 
             # Second dot
@@ -137,11 +148,12 @@ class DerivativeScene(Scene):
         derivative = (func(x_point + h) - func(x_point - h)) / (2 * h)
 
         # Tangent line
-        tangent = axes.plot(
+        tangent = self.plot(
+            axes,
             lambda x: derivative * (x - x_point) + y_point,
             color=GREEN,
             x_range=[-1, 4],
-            stroke_width=6
+            stroke_width=6,
         )
 
         # Derivative label
@@ -0,0 +1,153 @@
+"""
+Helper: expressions
+Description: Safe, vectorized compiler for the function strings templates take
+
+Templates used to evaluate `function_str` with eval() for every sample point.
+compile_expression() parses the string once, checks every node against a
+whitelist (arithmetic, numbers, `x`, and a fixed set of numpy functions and
+constants) and returns a callable that evaluates a whole numpy array of x
+values in one call. Anything else - attribute access beyond `np.<name>`,
+subscripts, keyword arguments, lambdas, names other than the whitelisted ones
+- is rejected before anything runs.
+
+Example:
+  f = compile_expression("2 * np.sin(x) + x**2")
+  f(np.linspace(-3, 3, 200))   # array of 200 values
+  f(1.5)                       # scalar
+"""
+
+import ast
+
+import numpy as np
+
+
+class ExpressionError(ValueError):
+    """Raised when a function string is not a valid, allowed expression."""
+
+
+FUNCTIONS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "log2": np.log2, "log10": np.log10,
+    "sqrt": np.sqrt, "abs": np.abs, "sign": np.sign,
+    "floor": np.floor, "ceil": np.ceil,
+}
+CONSTANTS = {"pi": np.pi, "e": np.e}
+
+# Prefixes accepted in front of a function or constant (np.sin, math.pi, ...)
+MODULES = {"np", "numpy", "math"}
+
+BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv)
+UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+MAX_LENGTH = 200
+
+
+class _Validator(ast.NodeTransformer):
+    """Rejects anything outside the whitelist and normalises what's allowed."""
+
+    def generic_visit(self, node):
+        raise ExpressionError(f"'{type(node).__name__}' is not allowed in a function expression")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, BINARY_OPERATORS):
+            raise ExpressionError(f"Operator '{type(node.op).__name__}' is not allowed")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, UNARY_OPERATORS):
+            raise ExpressionError(f"Operator '{type(node.op).__name__}' is not allowed")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Constant {node.value!r} is not allowed")
+        # Floats overflow to inf instead of building huge integers (9**9**9)
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node):
+        if node.id == "x" or node.id in CONSTANTS:
+            return node
+        raise ExpressionError(f"Unknown name '{node.id}'")
+
+    def visit_Attribute(self, node):
+        # np.pi -> pi; np.sin is handled in visit_Call
+        name = self._module_member(node)
+        if name not in CONSTANTS:
+            raise ExpressionError(f"Unknown constant '{ast.unparse(node)}'")
+        return ast.copy_location(ast.Name(name, ast.Load()), node)
+
+    def visit_Call(self, node):
+        if node.keywords:
+            raise ExpressionError("Keyword arguments are not allowed")
+        if isinstance(node.func, ast.Attribute):
+            name = self._module_member(node.func)
+        elif isinstance(node.func, ast.Name):
+            name = node.func.id
+        else:
+            raise ExpressionError("Only simple function calls are allowed")
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"Unknown function '{name}'")
+        if len(node.args) != 1:
+            raise ExpressionError(f"{name}() takes exactly one argument")
+        return ast.copy_location(
+            ast.Call(ast.Name(name, ast.Load()), [self.visit(node.args[0])], []),
+            node,
+        )
+
+    @staticmethod
+    def _module_member(node):
+        if not (isinstance(node.value, ast.Name) and node.value.id in MODULES):
+            raise ExpressionError(f"'{ast.unparse(node)}' is not allowed")
+        return node.attr
+
+
+def compile_expression(source):
+    """
+    Compile a function of x into a numpy-vectorized callable. Raises
+    ExpressionError if the string isn't an allowed expression.
+    """
+    if not isinstance(source, str) or not source.strip():
+        raise ExpressionError("Function expression must be a non-empty string")
+    if len(source) > MAX_LENGTH:
+        raise ExpressionError(f"Function expression is longer than {MAX_LENGTH} characters")
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as error:
+        raise ExpressionError(f"Invalid function expression: {error.msg}") from None
+
+    tree = ast.fix_missing_locations(_Validator().visit(tree))
+    code = compile(tree, "<expression>", "eval")
+    namespace = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS}
+
+    def function(x):
+        x_values = np.asarray(x, dtype=float)
+        with np.errstate(all="ignore"):
+            result = eval(code, namespace, {"x": x_values})
+        # Python floats go complex where numpy gives nan: (-8)**(1/3)
+        if isinstance(result, complex) or np.iscomplexobj(result):
+            raise ExpressionError(f"'{source}' has complex values; only real functions can be plotted")
+        if x_values.ndim == 0:
+            return float(result)
+        # Constant expressions ("3") still return one value per x
+        return np.broadcast_to(np.asarray(result, dtype=float), x_values.shape).copy()
+
+    # Constant parts (1/0, 9**9**9) fail the same way for every x; fail now
+    try:
+        function(1.0)
+    except ExpressionError:
+        raise
+    except (ArithmeticError, TypeError, ValueError) as error:
+        raise ExpressionError(f"Invalid function expression: {error}") from None
+
+    function.source = source
+    return function
@@ -3,7 +3,8 @@ Template: function_graph
 Description: Plot a mathematical function with optional tangent line
 
 Parameters:
-  - function: str - Function expression (e.g., "x**2", "np.sin(x)", "x**3 - 2*x")
+  - function: str - Function expression (e.g., "x**2", "np.sin(x)", "x**3 - 2*x"),
+    compiled with expressions.compile_expression (arithmetic and numpy functions only)
   - x_range: [min, max, step] - Range for x-axis (e.g., [-3, 3, 0.1])
   - tangent_point: float (optional) - x-coordinate where to draw tangent line
 
@@ -21,6 +22,9 @@ Render command for testing:
 from manim import *
 import numpy as np
 
+from expressions import compile_expression
+from sampling import plot_adaptive
+
 
 class FunctionGraphScene(Scene):
     """
@@ -33,8 +37,12 @@ class FunctionGraphScene(Scene):
     x_range = [-3, 3, 0.1]
     tangent_point = None
     title_text = "Function Graph"
+    adaptive_sampling = True
 
     def construct(self):
+        # Parse the function once; rejects anything but a plain expression of x
+        func = compile_expression(self.function_str)
+
         # Create axes
         axes = Axes(
             x_range=[self.x_range[0], self.x_range[1], 1],
@@ -49,12 +57,8 @@ class FunctionGraphScene(Scene):
         title = Text(self.title_text, font_size=36)
         title.to_edge(UP)
 
-        # Define function
-        def func(x):
-            return eval(self.function_str, {"x": x, "np": np, "sin": np.sin, "cos": np.cos, "tan": np.tan})
-
         # Create graph
-        graph = axes.plot(func, color=BLUE)
+        graph = self.plot(axes, func, color=BLUE)
 
         # Function label
         func_label = MathTex(f"f(x) = {self.function_str}")
@@ -72,6 +76,12 @@ class FunctionGraphScene(Scene):
 
         self.wait(2)
 
+    def plot(self, axes, func, **kwargs):
+        """Plot a vectorized function, adaptively sampled unless disabled."""
+        if self.adaptive_sampling:
+            return plot_adaptive(axes, func, **kwargs)
+        return axes.plot(func, use_vectorized=True, **kwargs)
+
     def draw_tangent(self, axes, graph, func, x_point):
         """Draw a tangent line at the specified point."""
         # Calculate derivative numerically
@@ -83,10 +93,11 @@ class FunctionGraphScene(Scene):
         dot = Dot(axes.c2p(x_point, y_point), color=YELLOW)
 
         # Tangent line
-        tangent = axes.plot(
+        tangent = self.plot(
+            axes,
             lambda x: slope * (x - x_point) + y_point,
             color=RED,
-            x_range=[self.x_range[0], self.x_range[1]]
+            x_range=[self.x_range[0], self.x_range[1]],
         )
 
         # Label
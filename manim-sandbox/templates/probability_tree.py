@@ -1,24 +1,73 @@
 """
 Template: probability_tree
-Description: Draw a probability tree diagram
+Description: Draw a probability tree diagram of any depth
 
 Parameters:
-  - branches: list - Tree structure as nested lists
-  - probabilities: list - Probabilities for each branch
-  - labels: list - Labels for each outcome
+  - tree: list - Nested branches, each {"label": str, "prob": float, "children": [...]}
+  - title_text: str - Title of the diagram
+  - level1_labels / level1_probs / level2_labels / level2_probs - Two-level
+    shorthand, used when tree is not set
 
 Example structure:
-  branches = [
-    ["A", ["B", "C"]],  # First level: A splits into B and C
+  tree = [
+    {"label": "A", "prob": 0.6, "children": [
+      {"label": "C", "prob": 0.7},
+      {"label": "D", "prob": 0.3},
+    ]},
+    {"label": "B", "prob": 0.4},
   ]
-  probabilities = [[0.6, 0.4]]  # P(B|A) = 0.6, P(C|A) = 0.4
-  labels = ["Event 1", "Event 2"]
+
+The layout is computed for the whole tree up front (leaves evenly spaced,
+each parent centred on its children) and every level is drawn by a single
+LaggedStart, so a four-level tree is four plays, not one per branch.
 
 Render command for testing:
   docker-compose run --rm manim manim -pql templates/probability_tree.py ProbabilityTreeScene
 """
 
 from manim import *
+import numpy as np
+
+
+def flatten_tree(tree):
+    """
+    Flatten nested branches in depth-first order. Returns (labels, probs,
+    parents, depths); parents index into the same lists, -1 for the root's
+    children, whose depth is 1.
+    """
+    labels, probs, parents, depths = [], [], [], []
+
+    def visit(branches, parent, depth):
+        for branch in branches:
+            index = len(labels)
+            labels.append(str(branch["label"]))
+            probs.append(float(branch["prob"]))
+            parents.append(parent)
+            depths.append(depth)
+            visit(branch.get("children") or [], index, depth + 1)
+
+    visit(tree, -1, 1)
+    return labels, np.array(probs), np.array(parents, dtype=int), np.array(depths, dtype=int)
+
+
+def tree_layout(parents, depths, x_step, leaf_spacing):
+    """
+    (x, y) offsets of every node from the start node. Leaves are spaced
+    evenly top to bottom in depth-first order; each parent sits at the mean
+    height of its children, resolved one level at a time from the bottom.
+    """
+    count = len(parents)
+    has_children = np.bincount(parents[parents >= 0], minlength=count) > 0
+    leaves = np.flatnonzero(~has_children)
+
+    y = np.zeros(count)
+    y[leaves] = leaf_spacing * ((len(leaves) - 1) / 2 - np.arange(len(leaves)))
+    for depth in range(depths.max(), 1, -1):
+        children = np.flatnonzero(depths == depth)
+        sums = np.bincount(parents[children], weights=y[children], minlength=count)
+        counts = np.bincount(parents[children], minlength=count)
+        y[counts > 0] = sums[counts > 0] / counts[counts > 0]
+    return depths * x_step, y
 
 
 class ProbabilityTreeScene(Scene):
@@ -27,6 +76,9 @@ class ProbabilityTreeScene(Scene):
     Customize by setting class attributes.
     """
 
+    # Nested branches; None builds the tree from the two-level attributes below
+    tree = None
+
     # Simple two-level tree by default
     level1_labels = ["A", "B"]
     level1_probs = [0.6, 0.4]
@@ -34,6 +86,30 @@ class ProbabilityTreeScene(Scene):
     level2_probs = [[0.7, 0.3], [0.5, 0.5]]
     title_text = "Probability Tree"
 
+    # Layout limits (scene units): the start node sits at x = -4, leaves span
+    # at most LEAF_SPAN vertically
+    MAX_X_STEP = 2.0
+    TREE_WIDTH = 8.0
+    MAX_LEAF_SPACING = 2.0
+    LEAF_SPAN = 6.0
+    LEVEL_COLORS = [BLUE, GREEN, ORANGE, PURPLE]
+
+    def branches(self):
+        """The tree as nested branches."""
+        if self.tree is not None:
+            return self.tree
+        return [
+            {
+                "label": label,
+                "prob": prob,
+                "children": [{"label": child, "prob": child_prob}
+                             for child, child_prob in zip(children, child_probs)],
+            }
+            for label, prob, children, child_probs in zip(
+                self.level1_labels, self.level1_probs, self.level2_labels, self.level2_probs
+            )
+        ]
+
     def construct(self):
         # Title
         title = Text(self.title_text, font_size=40)
@@ -49,68 +125,46 @@ class ProbabilityTreeScene(Scene):
         self.play(Create(start), Write(start_label))
         self.wait(0.5)
 
-        # First level branches
-        level1_nodes = []
-        level1_edges = []
-        level1_texts = []
-
-        y_spacing = 2
-        x_offset = 2
-
-        for i, (label, prob) in enumerate(zip(self.level1_labels, self.level1_probs)):
-            # Position
-            y_pos = y_spacing - i * (2 * y_spacing / (len(self.level1_labels) - 1)) if len(self.level1_labels) > 1 else 0
-            end_point = start.get_center() + RIGHT * x_offset + UP * y_pos
-
-            # Node
-            node = Dot(end_point)
-            level1_nodes.append(node)
-
-            # Edge
-            edge = Line(start.get_center(), end_point)
-            level1_edges.append(edge)
-
-            # Label
-            label_text = Text(label, font_size=28)
-            label_text.next_to(node, RIGHT, buff=0.2)
-            level1_texts.append(label_text)
-
-            # Probability
-            prob_text = Text(f"{prob:.2f}", font_size=20, color=BLUE)
-            prob_text.next_to(edge.get_center(), UP if y_pos > 0 else DOWN, buff=0.1)
-
-            # Animate
-            self.play(Create(edge), Create(node))
-            self.play(Write(label_text), Write(prob_text))
-
-        self.wait(1)
-
-        # Second level branches
-        for i, (parent_node, outcomes, probs) in enumerate(zip(level1_nodes, self.level2_labels, self.level2_probs)):
-            for j, (outcome, prob) in enumerate(zip(outcomes, probs)):
-                y_spacing_2 = 1
-                y_pos = y_spacing_2 - j * (2 * y_spacing_2 / (len(outcomes) - 1)) if len(outcomes) > 1 else 0
-                end_point = parent_node.get_center() + RIGHT * x_offset + UP * y_pos
-
-                # Node
-                node = Dot(end_point)
-
-                # Edge
-                edge = Line(parent_node.get_center(), end_point)
-
-                # Label
-                label_text = Text(outcome, font_size=24)
+        labels, probs, parents, depths = flatten_tree(self.branches())
+        if not labels:
+            self.wait(2)
+            return
+
+        # Whole-tree layout in one pass
+        levels = depths.max()
+        leaf_count = np.count_nonzero(np.bincount(parents[parents >= 0], minlength=len(labels)) == 0)
+        leaf_spacing = min(self.MAX_LEAF_SPACING, self.LEAF_SPAN / max(leaf_count - 1, 1))
+        x, y = tree_layout(parents, depths, min(self.MAX_X_STEP, self.TREE_WIDTH / levels), leaf_spacing)
+        points = start.get_center() + np.column_stack([x, y, np.zeros(len(x))])
+        parent_points = np.where((parents >= 0)[:, None], points[parents], start.get_center())
+        # Dense trees get smaller text
+        text_scale = float(np.clip(leaf_spacing, 0.6, 1.0))
+
+        for level in range(1, levels + 1):
+            branches = []
+            for index in np.flatnonzero(depths == level):
+                node = Dot(points[index])
+                edge = Line(parent_points[index], points[index])
+
+                label_text = Text(labels[index], font_size=max(28 - 4 * (level - 1), 16) * text_scale)
                 label_text.next_to(node, RIGHT, buff=0.2)
 
-                # Probability
-                prob_text = Text(f"{prob:.2f}", font_size=18, color=GREEN)
-                prob_text.next_to(edge.get_center(), UP if y_pos > 0 else DOWN, buff=0.1)
+                prob_text = Text(
+                    f"{probs[index]:.2f}",
+                    font_size=max(20 - 2 * (level - 1), 12) * text_scale,
+                    color=self.LEVEL_COLORS[(level - 1) % len(self.LEVEL_COLORS)],
+                )
+                above = points[index][1] > parent_points[index][1]
+                prob_text.next_to(edge.get_center(), UP if above else DOWN, buff=0.1)
 
-                # Animate
-                self.play(Create(edge), Create(node), run_time=0.5)
-                self.play(Write(label_text), Write(prob_text), run_time=0.5)
+                branches.append(AnimationGroup(
+                    Create(edge), Create(node), Write(label_text), Write(prob_text),
+                    lag_ratio=0.25,
+                ))
 
-        self.wait(2)
+            # One play per level, however many branches it has
+            self.play(LaggedStart(*branches, lag_ratio=0.3), run_time=2)
+            self.wait(0.5 if level < levels else 2)
 
 
 # Example: Coin flip twice
@@ -138,3 +192,26 @@ class MedicalTestTree(ProbabilityTreeScene):
     level2_labels = [["Positive", "Negative"], ["Positive", "Negative"]]
     level2_probs = [[0.95, 0.05], [0.02, 0.98]]
     title_text = "Medical Test Results"
+
+
+# Example: Three-level conditional probability (draw two balls, then a coin)
+class ThreeLevelTree(ProbabilityTreeScene):
+    title_text = "Two Draws and a Coin"
+    tree = [
+        {"label": "Red", "prob": 0.6, "children": [
+            {"label": "Red", "prob": 0.5, "children": [
+                {"label": "H", "prob": 0.5}, {"label": "T", "prob": 0.5},
+            ]},
+            {"label": "Blue", "prob": 0.5, "children": [
+                {"label": "H", "prob": 0.5}, {"label": "T", "prob": 0.5},
+            ]},
+        ]},
+        {"label": "Blue", "prob": 0.4, "children": [
+            {"label": "Red", "prob": 0.75, "children": [
+                {"label": "H", "prob": 0.5}, {"label": "T", "prob": 0.5},
+            ]},
+            {"label": "Blue", "prob": 0.25, "children": [
+                {"label": "H", "prob": 0.5}, {"label": "T", "prob": 0.5},
+            ]},
+        ]},
+    ]
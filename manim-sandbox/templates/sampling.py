@@ -0,0 +1,130 @@
+"""
+Helper: sampling
+Description: Adaptive curve sampling for the templates' plots
+
+axes.plot samples every function at a fixed density, so a straight tangent
+line gets as many Bezier anchors as a sine wave, and every anchor is paid
+for again on every frame that draws the curve. AdaptiveGraph samples where
+the curve needs it instead:
+
+  1. Start from a coarse uniform grid.
+  2. Evaluate all interval midpoints in one vectorized call and split the
+     intervals whose midpoint is further than `tolerance` (scene units) from
+     the chord; repeat until nothing needs splitting or `max_depth` is hit.
+  3. Drop anchors that lie within `tolerance` of the line through their
+     neighbours (Ramer-Douglas-Peucker), so linear pieces collapse to their
+     two end points.
+
+Functions must accept numpy arrays (see expressions.compile_expression).
+Curves with non-finite values fall back to manim's uniform sampling.
+
+refine() and simplify() only need numpy; manim is imported when AdaptiveGraph
+is first used, so they can be tested (and reused) without it.
+
+Example usage:
+  graph = plot_adaptive(axes, func, color=BLUE)
+  tangent = plot_adaptive(axes, lambda x: 2 * x - 1, x_range=[-3, 3], color=RED)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+DEFAULT_TOLERANCE = 0.005
+INITIAL_INTERVALS = 8
+MAX_DEPTH = 10
+
+
+def refine(points_of, x_min, x_max, tolerance=DEFAULT_TOLERANCE, max_depth=MAX_DEPTH):
+    """
+    Sample x values on [x_min, x_max] until every interval's midpoint is
+    within `tolerance` of its chord. `points_of(xs)` maps x values to an
+    (n, 3) array of scene points.
+    """
+    xs = np.linspace(x_min, x_max, INITIAL_INTERVALS + 1)
+    points = points_of(xs)
+    for _ in range(max_depth):
+        mids = (xs[:-1] + xs[1:]) / 2
+        mid_points = points_of(mids)
+        error = np.linalg.norm(mid_points - (points[:-1] + points[1:]) / 2, axis=1)
+        split = error > tolerance
+        if not split.any():
+            break
+        xs = np.insert(xs, np.flatnonzero(split) + 1, mids[split])
+        points = np.insert(points, np.flatnonzero(split) + 1, mid_points[split], axis=0)
+    return xs, points
+
+
+def simplify(points, tolerance=DEFAULT_TOLERANCE):
+    """Indices of the points to keep after Ramer-Douglas-Peucker simplification."""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        chord = points[last] - points[first]
+        offsets = points[first + 1:last] - points[first]
+        length = np.linalg.norm(chord)
+        if length == 0:
+            distances = np.linalg.norm(offsets, axis=1)
+        else:
+            distances = np.linalg.norm(np.cross(offsets, chord / length), axis=1)
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            middle = first + 1 + index
+            keep[middle] = True
+            stack.extend([(first, middle), (middle, last)])
+    return np.flatnonzero(keep)
+
+
+@lru_cache(maxsize=1)
+def _adaptive_graph_class():
+    from manim import ParametricFunction
+
+    class AdaptiveGraph(ParametricFunction):
+        """The graph of `function` on `axes`, sampled adaptively."""
+
+        def __init__(self, axes, function, x_range=None, tolerance=DEFAULT_TOLERANCE, **kwargs):
+            self.axes = axes
+            self.graph_function = function
+            self.tolerance = tolerance
+            x_min, x_max = (x_range or axes.x_range)[:2]
+            super().__init__(
+                lambda t: axes.coords_to_point(t, function(t)),
+                t_range=[x_min, x_max, (x_max - x_min) / 100],
+                use_vectorized=True,
+                **kwargs,
+            )
+            self.underlying_function = function
+
+        def points_of(self, xs):
+            return np.asarray(self.axes.coords_to_point(xs, self.graph_function(xs))).T
+
+        def generate_points(self):
+            xs, points = refine(self.points_of, self.t_min, self.t_max, self.tolerance)
+            if not np.isfinite(points).all():
+                return super().generate_points()
+
+            points = points[simplify(points, self.tolerance)]
+            self.start_new_path(points[0])
+            self.add_points_as_corners(points[1:])
+            if self.use_smoothing and len(points) > 2:
+                self.make_smooth()
+            return self
+
+    return AdaptiveGraph
+
+
+def __getattr__(name):
+    # AdaptiveGraph subclasses a manim class; build it on first use
+    if name == "AdaptiveGraph":
+        return _adaptive_graph_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def plot_adaptive(axes, function, x_range=None, tolerance=DEFAULT_TOLERANCE, **kwargs):
+    """Drop-in for axes.plot(function, x_range=...) with adaptive sampling."""
+    return _adaptive_graph_class()(axes, function, x_range=x_range, tolerance=tolerance, **kwargs)
@@ -17,14 +17,10 @@ YELLOW='\033[1;33m'
 BLUE='\033[0;34m'
 NC='\033[0m' # No Color
 
-# Available templates
-TEMPLATES=(
-    "function_graph"
-    "vector_addition"
-    "probability_tree"
-    "calculus_derivative"
-    "geometry_diagram"
-)
+# Available templates: modules in templates/ that define scenes, found by
+# parsing the files (no manim import; falls back to the container)
+TEMPLATES=($(python3 -m render_worker list-scenes --dir templates --modules 2>/dev/null \
+    || docker-compose run --rm -T manim python -m render_worker list-scenes --dir templates --modules))
 
 # Quality options
 QUALITY=${2:-"low"}
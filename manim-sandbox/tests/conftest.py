@@ -0,0 +1,20 @@
+"""
+Shared test set-up: the render worker and the templates' helper modules
+import by plain name, and caches go to a throwaway directory.
+
+    cd manim-sandbox && python -m pytest
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SANDBOX_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SANDBOX_DIR))
+sys.path.insert(0, str(SANDBOX_DIR / "templates"))
+
+# Read by render_worker.settings at import time
+_scratch = tempfile.mkdtemp(prefix="render_worker_tests_")
+os.environ.setdefault("RENDER_CACHE_HOME", os.path.join(_scratch, "cache"))
+os.environ.setdefault("RENDER_ROOT", os.path.join(_scratch, "render"))
@@ -0,0 +1,58 @@
+from render_worker.catalog import parse_scenes, scan
+
+
+SOURCE = '''
+from manim import *
+
+
+class Base(Scene):
+    """Shared set-up."""
+    title_text = "Base"
+    x_range = [-3, 3, 0.1]
+    colour = BLUE
+
+
+class Child(Base):
+    title_text: str = "Child"
+
+    def construct(self):
+        pass
+
+
+class Helper:
+    pass
+
+
+class ThreeD(ThreeDScene):
+    pass
+'''
+
+
+def test_parse_scenes_follows_local_bases(tmp_path):
+    path = tmp_path / "lesson.py"
+    path.write_text(SOURCE, encoding="utf-8")
+    scenes = {scene["scene"]: scene for scene in parse_scenes(path)}
+
+    assert set(scenes) == {"Base", "Child", "ThreeD"}
+    child = scenes["Child"]
+    assert child["module"] == "lesson"
+    assert child["bases"] == ["Base"]
+    # Inherited docstring and attributes, overridden where the child sets them
+    assert child["docstring"] == "Shared set-up."
+    assert child["attributes"] == {
+        "title_text": "Child",
+        "x_range": [-3, 3, 0.1],
+        "colour": {"expression": "BLUE"},
+    }
+    assert child["render_command"].endswith(f"{path} Child")
+
+
+def test_scan_caches_and_reports_syntax_errors(tmp_path):
+    (tmp_path / "good.py").write_text(SOURCE, encoding="utf-8")
+    (tmp_path / "broken.py").write_text("class Broken(Scene)\n", encoding="utf-8")
+
+    names = [scene["scene"] for scene in scan([tmp_path])]
+    assert names == ["Base", "Child", "ThreeD"]
+
+    (tmp_path / "good.py").write_text("class Only(Scene):\n    pass\n", encoding="utf-8")
+    assert [scene["scene"] for scene in scan([tmp_path])] == ["Only"]
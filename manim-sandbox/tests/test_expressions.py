@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from expressions import ExpressionError, compile_expression
+
+
+@pytest.mark.parametrize("source, x, expected", [
+    ("x**2", 3.0, 9.0),
+    ("2 * np.sin(x) + x**2", 0.0, 0.0),
+    ("sqrt(x) + math.pi", 4.0, 2.0 + np.pi),
+    ("numpy.exp(x) - e", 1.0, 0.0),
+    ("3", 5.0, 3.0),
+])
+def test_accepts_arithmetic_and_numpy_functions(source, x, expected):
+    assert compile_expression(source)(x) == pytest.approx(expected)
+
+
+def test_evaluates_arrays_in_one_call():
+    function = compile_expression("x**2 - 1")
+    x = np.linspace(-2, 2, 5)
+    np.testing.assert_allclose(function(x), x**2 - 1)
+    # Constant expressions still give one value per x
+    assert compile_expression("2")(x).shape == x.shape
+
+
+@pytest.mark.parametrize("source", [
+    "",
+    "__import__('os').system('true')",
+    "x.__class__",
+    "np.linalg.inv(x)",
+    "open('file')",
+    "[x][0]",
+    "lambda: x",
+    "y + 1",
+    "sin(x, 2)",
+    "round(x, ndigits=2)",
+    "x if x else 1",
+    "'text'",
+    "True + x",
+    "1/0 + x",
+    "x +",
+    "x" * 201,
+])
+def test_rejects_anything_outside_the_whitelist(source):
+    with pytest.raises(ExpressionError):
+        compile_expression(source)
+
+
+@pytest.mark.parametrize("source", ["(-8)**(1/3) + x", "(-1)**0.5 * x"])
+def test_rejects_complex_results(source):
+    with pytest.raises(ExpressionError, match="complex"):
+        compile_expression(source)
+
+
+def test_non_finite_points_are_nan_not_errors():
+    function = compile_expression("sqrt(x)")
+    assert np.isnan(function(-1.0))
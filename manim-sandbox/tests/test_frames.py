@@ -0,0 +1,43 @@
+import os
+import time
+
+from render_worker.frames import _wait_blocks
+
+
+def fork_child(seconds, failure=None):
+    """A stand-in for a block child: sleeps, then fails with `failure` or exits cleanly."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        time.sleep(seconds)
+        if failure:
+            os.write(write_fd, failure.encode("utf-8"))
+        os._exit(1 if failure else 0)
+    os.close(write_fd)
+    return pid, read_fd
+
+
+def test_all_blocks_succeed():
+    children = [fork_child(0), fork_child(0.1)]
+    assert _wait_blocks(children, time.monotonic() + 10, 10) is None
+
+
+def test_a_failed_block_kills_the_rest():
+    children = [fork_child(0, "Traceback: boom"), fork_child(60), fork_child(60)]
+    started = time.monotonic()
+    assert _wait_blocks(children, started + 120, 120) == "frame block 0: Traceback: boom"
+    assert time.monotonic() - started < 10
+    for pid, _ in children:
+        # Every child has been reaped
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            continue
+        raise AssertionError(f"block child {pid} is still running")
+
+
+def test_timeout_reports_the_job_timeout():
+    children = [fork_child(60)]
+    error = _wait_blocks(children, time.monotonic() + 0.2, 42)
+    assert error == "frame block 0: timed out after 42s"
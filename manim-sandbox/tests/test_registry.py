@@ -0,0 +1,66 @@
+import pytest
+
+from render_worker.registry import (
+    TEMPLATES, TemplateParamsError, parameterize, template_job, validate, validate_params,
+)
+
+
+def test_validate_accepts_matching_values():
+    schema = TEMPLATES["function_graph"]["schema"]
+    assert validate({"function": "x**2", "x_range": [-3, 3], "tangent_point": None}, schema) == []
+
+
+@pytest.mark.parametrize("params, error", [
+    ({}, "params.function: required"),
+    ({"function": "x", "colour": "red"}, "params.colour: unknown parameter"),
+    ({"function": 3}, "params.function: expected string"),
+    ({"function": ""}, "params.function: must not be empty"),
+    ({"function": "x", "x_range": [1]}, "params.x_range: needs at least 2 items"),
+    ({"function": "x", "x_range": [0, 1, 2, 3]}, "params.x_range: at most 3 items"),
+    ({"function": "x", "x_range": [0, 5000]}, "params.x_range[1]: must be <= 1000"),
+    ({"function": "x", "x_range": [0, True]}, "params.x_range[1]: expected number"),
+    ({"function": "x", "x_range": [0, float("nan")]}, "params.x_range[1]: expected number"),
+    ({"function": "x", "title": "t" * 81}, "params.title: at most 80 characters"),
+])
+def test_validate_reports_each_problem_with_its_path(params, error):
+    assert error in validate(params, TEMPLATES["function_graph"]["schema"])
+
+
+def test_validate_enum():
+    schema = TEMPLATES["geometry_diagram"]["schema"]
+    assert validate({"diagram_type": "circle"}, schema) == []
+    assert validate({"diagram_type": "hexagon"}, schema)[0].startswith("params.diagram_type: must be one of")
+
+
+def test_validate_nested_tree_depth():
+    schema = TEMPLATES["probability_tree"]["schema"]
+    leaf = {"label": "x", "prob": 1}
+    tree = [{**leaf, "children": [{**leaf, "children": [{**leaf, "children": [leaf]}]}]}]
+    assert validate({"tree": tree}, schema) == []
+    # A fifth level isn't in the schema
+    tree[0]["children"][0]["children"][0]["children"][0]["children"] = [leaf]
+    assert "unknown parameter" in " ".join(validate({"tree": tree}, schema))
+
+
+@pytest.mark.parametrize("name, params, error", [
+    ("function_graph", {"function": "__import__('os')"}, "params.function:"),
+    ("function_graph", {"function": "x", "x_range": [3, -3]}, "min must be less than max"),
+    ("function_graph", {"function": "x", "x_range": [-3, 3], "tangent_point": 5}, "inside x_range"),
+    # Checked against the template's own x_range when the params leave it out
+    ("function_graph", {"function": "x", "tangent_point": 5}, r"inside x_range \[-3, 3\]"),
+    ("probability_tree", {"tree": [{"label": "a", "prob": 0.5}]}, "must sum to 1"),
+    ("nonexistent", {}, "unknown template"),
+])
+def test_validate_params_runs_template_checks(name, params, error):
+    with pytest.raises(TemplateParamsError, match=error):
+        validate_params(name, params)
+
+
+def test_template_job_resolves_aliases_and_attributes():
+    job = template_job({"template": "FunctionGraphScene", "params": {"function": "x**2", "title": "Square"}})
+    assert (job["template"], job["scene"]) == ("function_graph", "FunctionGraphScene")
+
+    base = type("FunctionGraphScene", (), {"function_str": "x", "title_text": "Graph"})
+    variant = parameterize(base, "function_graph", {"function": "x**2", "title": "Square", "x_range": [-2, 2]})
+    assert issubclass(variant, base)
+    assert (variant.function_str, variant.title_text, variant.x_range) == ("x**2", "Square", [-2, 2, 0.1])
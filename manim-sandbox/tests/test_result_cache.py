@@ -0,0 +1,53 @@
+import pytest
+
+from render_worker import result_cache
+from render_worker.result_cache import canonical_params, result_key
+
+
+def test_canonical_params_sorts_keys_and_rounds_numbers():
+    assert canonical_params({"b": 1, "a": [1.0000000001, -0.0, True, "x"]}) == {
+        "a": [1.0, 0.0, True, "x"],
+        "b": 1.0,
+    }
+    assert list(canonical_params({"b": 1, "a": 2})) == ["a", "b"]
+
+
+@pytest.fixture
+def manim_version(monkeypatch):
+    # The key includes manim's version, which only has to be stable here
+    monkeypatch.setattr(result_cache.metadata, "version", lambda name: "0.0.test")
+
+
+def job(params, **extra):
+    return {"template": "function_graph", "scene": "FunctionGraphScene", "quality": "low",
+            "params": params, **extra}
+
+
+def test_equivalent_params_share_a_key(manim_version):
+    key = result_key(job({"function": "x**2", "x_range": [-3, 3]}))
+    assert result_key(job({"x_range": [-3.0, 3.0000000001], "function": "x**2"})) == key
+
+
+def test_key_changes_with_anything_that_changes_the_video(manim_version):
+    key = result_key(job({"function": "x**2"}))
+    assert result_key(job({"function": "x**3"})) != key
+    assert result_key(job({"function": "x**2"}, quality="high")) != key
+    assert result_key({**job({"function": "x**2"}), "scene": "SineWave"}) != key
+
+
+def test_only_whole_template_renders_are_cacheable():
+    assert result_cache.is_cacheable(job({"function": "x"}))
+    assert not result_cache.is_cacheable({"code": "class GeneratedScene: pass", "scene": "GeneratedScene"})
+    assert not result_cache.is_cacheable(job({"function": "x"}, upto_animation=2))
+    assert not result_cache.is_cacheable(job({"function": "x"}, result_cache=False))
+
+
+def test_source_hash_follows_imported_helpers(tmp_path):
+    helper = tmp_path / "helper.py"
+    helper.write_text("VALUE = 1\n", encoding="utf-8")
+    scene = tmp_path / "scene.py"
+    scene.write_text("from helper import VALUE\nimport numpy\n", encoding="utf-8")
+
+    first = result_cache.source_hash(scene)
+    helper.write_text("VALUE = 2\n", encoding="utf-8")
+    assert result_cache.source_hash(scene) != first
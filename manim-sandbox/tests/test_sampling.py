@@ -0,0 +1,51 @@
+import numpy as np
+
+from sampling import refine, simplify
+
+
+def graph(function):
+    """points_of for a plain y = f(x) graph in scene units."""
+    return lambda xs: np.stack([xs, function(xs), np.zeros_like(xs)], axis=1)
+
+
+def test_refine_splits_where_the_curve_bends():
+    xs, points = refine(graph(np.sin), -np.pi, np.pi, tolerance=0.001)
+    mids = (xs[:-1] + xs[1:]) / 2
+    chords = (points[:-1, 1] + points[1:, 1]) / 2
+    assert np.all(np.abs(np.sin(mids) - chords) <= 0.001)
+    assert np.all(np.diff(xs) > 0)
+
+
+def test_refine_leaves_lines_at_the_initial_grid():
+    xs, _ = refine(graph(lambda x: 2 * x - 1), -3, 3)
+    assert len(xs) == 9
+
+
+def test_refine_stops_at_max_depth():
+    xs, _ = refine(graph(lambda x: np.sign(x)), -1, 1, tolerance=1e-9, max_depth=3)
+    assert len(xs) <= 8 * 2 ** 3 + 1
+
+
+def test_simplify_collapses_straight_pieces():
+    xs = np.linspace(-3, 3, 50)
+    line = graph(lambda x: 2 * x - 1)(xs)
+    assert list(simplify(line)) == [0, 49]
+
+    # A corner keeps its vertex
+    corner = graph(np.abs)(xs[::7])
+    kept = simplify(corner)
+    assert kept[0] == 0 and kept[-1] == len(corner) - 1
+    assert 3 in kept or 4 in kept
+
+
+def test_simplify_stays_within_tolerance():
+    xs = np.linspace(0, 2 * np.pi, 400)
+    points = graph(np.sin)(xs)
+    kept = simplify(points, tolerance=0.01)
+    assert len(kept) < len(points) / 4
+    # Every dropped point lies within tolerance of the chord that replaced it
+    for first, last in zip(kept[:-1], kept[1:]):
+        chord = points[last] - points[first]
+        offsets = points[first:last + 1] - points[first]
+        distances = np.linalg.norm(np.cross(offsets, chord / np.linalg.norm(chord)), axis=1)
+        assert distances.max() <= 0.01
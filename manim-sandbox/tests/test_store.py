@@ -0,0 +1,60 @@
+import os
+
+from render_worker.store import ContentStore, content_key
+
+
+def age(path, seconds):
+    """Move `path`'s mtime `seconds` into the past."""
+    stat = path.stat()
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_content_key_separates_parts():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key("a", 1) == content_key("a", "1")
+
+
+def test_write_publishes_atomically(tmp_path):
+    store = ContentStore(tmp_path, 1 << 20)
+    key = content_key("entry")
+    path = store.write(key, b"video", ".mp4")
+
+    assert path == store.path_for(key, ".mp4")
+    assert path.read_bytes() == b"video"
+    # No temporary files are left behind
+    assert [entry.name for entry in path.parent.iterdir()] == [path.name]
+
+    target = tmp_path / "out" / "video.mp4"
+    assert store.fetch(key, target, ".mp4")
+    assert target.read_bytes() == b"video"
+    assert not store.fetch(content_key("missing"), tmp_path / "out" / "missing.mp4", ".mp4")
+    assert store.stats()["hits"] == 1
+    assert store.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    store = ContentStore(tmp_path, 35)
+    keys = [content_key(name) for name in ("a", "b", "c")]
+    for seconds, key in zip((300, 200, 100), keys):
+        age(store.write(key, b"x" * 10), seconds)
+
+    # A hit refreshes the oldest entry, so the next oldest goes instead
+    assert store.get(keys[0]) is not None
+    store.write(content_key("d"), b"x" * 10)
+
+    assert store.contains(keys[0])
+    assert not store.contains(keys[1])
+    assert store.stats()["bytes"] <= 35
+    assert store.stats()["evictions"] >= 1
+
+
+def test_unusable_store_directory_is_a_miss(tmp_path):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("", encoding="utf-8")
+    store = ContentStore(blocker / "store", 1 << 20)
+    key = content_key("entry")
+
+    assert store.write(key, b"video") is None
+    assert store.get(key) is None
+    assert not store.fetch(key, tmp_path / "out.mp4")
+    assert store.stats()["entries"] == 0
@@ -0,0 +1,60 @@
+import json
+
+from render_worker.tex_batch import (
+    BATCH_CLASS, STANDALONE_CLASS, batch_preamble, file_uses_tex, formulas_cached, uses_tex,
+)
+from render_worker.tex_cache import tex_store
+
+
+def scene_class(tmp_path, source):
+    """A class whose methods come from a file, as scenes.load_module leaves them."""
+    path = tmp_path / "scene.py"
+    path.write_text(source, encoding="utf-8")
+    namespace = {}
+    exec(compile(source, str(path), "exec"), namespace)
+    return namespace["GeneratedScene"]
+
+
+def test_scene_without_tex_skips_the_pre_pass(tmp_path):
+    scene_cls = scene_class(tmp_path, (
+        "class GeneratedScene:\n"
+        "    def construct(self):\n"
+        "        self.add(Text('hello'), NumberLine(include_numbers=False))\n"
+    ))
+    assert not uses_tex(scene_cls)
+
+
+def test_direct_and_indirect_tex_calls(tmp_path):
+    for call in ("MathTex('x^2')", "axes.get_axis_labels()", "DecimalNumber(3.5)",
+                 "NumberLine(include_numbers=True)"):
+        path = tmp_path / f"scene_{abs(hash(call))}.py"
+        path.write_text(f"def construct(axes):\n    return {call}\n", encoding="utf-8")
+        assert file_uses_tex(path), call
+
+
+def test_base_class_file_is_checked(tmp_path):
+    base = scene_class(tmp_path, (
+        "class GeneratedScene:\n"
+        "    def construct(self):\n"
+        "        self.add(Tex('base'))\n"
+    ))
+    # Like registry.job_scene_class: a subclass with attributes only
+    variant = type("Variant", (base,), {"title_text": "x"})
+    assert uses_tex(variant)
+
+
+def test_batch_preamble_only_changes_the_class_options():
+    preamble = f"{STANDALONE_CLASS}\n\\usepackage{{amsmath}}\n"
+    assert batch_preamble(preamble) == f"{BATCH_CLASS}\n\\usepackage{{amsmath}}\n"
+    assert batch_preamble("\\documentclass{article}\n") is None
+
+
+def test_recorded_formulas_skip_the_pre_pass_while_cached():
+    assert not formulas_cached("f" * 64)
+
+    tex_store.write("a" * 64, b"<svg/>")
+    tex_store.write("f" * 64, json.dumps(["a" * 64, "b" * 64]).encode("utf-8"), ".json")
+    assert not formulas_cached("f" * 64)
+
+    tex_store.write("b" * 64, b"<svg/>")
+    assert formulas_cached("f" * 64)
@@ -0,0 +1,134 @@
+import pytest
+
+from render_worker.timeline import admission, analyze_source
+
+
+def analyze(body, scene="GeneratedScene", extra=""):
+    source = f"from manim import *\n\n{extra}\nclass GeneratedScene(Scene):\n{body}"
+    return analyze_source(source, scene)
+
+
+def test_play_and_wait_defaults():
+    analysis = analyze(
+        "    def construct(self):\n"
+        "        self.play(Create(Circle()))\n"
+        "        self.play(DrawBorderThenFill(Square()), run_time=0.5)\n"
+        "        self.play(DrawBorderThenFill(Square()))\n"
+        "        self.wait()\n"
+        "        self.wait(2)\n"
+    )
+    assert [play["duration"] for play in analysis["timeline"]] == [1.0, 0.5, 2.0, 1.0, 2.0]
+    assert (analysis["plays"], analysis["waits"], analysis["wait_time"]) == (3, 2, 3.0)
+    assert analysis["duration"] == 6.5
+
+
+def test_known_loops_are_unrolled():
+    analysis = analyze(
+        "    def construct(self):\n"
+        "        values = [1, 2, 3]\n"
+        "        for value in values:\n"
+        "            self.play(FadeIn(Dot()), run_time=value)\n"
+        "        i = 0\n"
+        "        while i < 4:\n"
+        "            i += 1\n"
+        "            if i == 2:\n"
+        "                continue\n"
+        "            self.wait(0.5)\n"
+    )
+    assert analysis["duration"] == 6 + 1.5
+    assert analysis["plays"] == 3
+    assert analysis["waits"] == 3
+    assert analysis["notes"] == []
+
+
+def test_unknown_loops_count_once_and_are_noted():
+    analysis = analyze(
+        "    def construct(self):\n"
+        "        for mob in self.mobjects:\n"
+        "            self.play(FadeOut(mob))\n"
+    )
+    assert analysis["plays"] == 1
+    assert analysis["notes"]
+
+
+def test_helpers_are_inlined_with_their_arguments():
+    analysis = analyze(
+        "    def step(self, seconds, repeat=2):\n"
+        "        for _ in range(repeat):\n"
+        "            self.play(Indicate(Dot()), run_time=seconds)\n"
+        "\n"
+        "    def construct(self):\n"
+        "        def pause(n):\n"
+        "            self.wait(n)\n"
+        "        self.step(1.5)\n"
+        "        self.step(0.25, repeat=4)\n"
+        "        pause(3)\n"
+    )
+    assert analysis["plays"] == 6
+    assert analysis["duration"] == 3 + 1 + 3
+
+
+def test_group_timing():
+    analysis = analyze(
+        "    def construct(self):\n"
+        "        dots = [Dot() for _ in range(3)]\n"
+        "        self.play(AnimationGroup(*[FadeIn(d) for d in dots]))\n"
+        "        self.play(Succession(*[FadeIn(d) for d in dots]))\n"
+        "        self.play(LaggedStart(*[FadeIn(d) for d in dots], lag_ratio=0.5))\n"
+        "        self.play(LaggedStart(FadeIn(dots[0]), FadeIn(dots[1])))\n"
+    )
+    assert [play["duration"] for play in analysis["timeline"]] == pytest.approx([1.0, 3.0, 2.0, 1.05])
+
+
+def test_class_attributes_and_overrides():
+    body = (
+        "    steps = 2\n"
+        "    def construct(self):\n"
+        "        for _ in range(self.steps):\n"
+        "            self.wait()\n"
+    )
+    assert analyze(body)["duration"] == 2
+    source = f"from manim import *\n\nclass GeneratedScene(Scene):\n{body}"
+    assert analyze_source(source, attributes={"steps": 5})["duration"] == 5
+
+
+def test_missing_scene():
+    with pytest.raises(ValueError):
+        analyze("    pass\n", scene="Other")
+
+
+def test_admission_downgrades_long_scenes():
+    short = analyze("    def construct(self):\n        self.wait()\n")
+    assert admission(short, "medium", busy=0, workers=2)["decision"] == "admit"
+    long = analyze("    def construct(self):\n        self.play(FadeIn(Dot()), run_time=600)\n")
+    decision = admission(long, "high", busy=0, workers=2, budget=120)
+    assert decision["decision"] in ("downgrade", "reject")
+
+
+@pytest.mark.parametrize("body", [
+    # Each of these doubles (or worse) on every iteration
+    "        s = 'ab'\n        for i in range(64):\n            s = s + s\n",
+    "        s = [1, 2]\n        for i in range(64):\n            s += s\n",
+    "        s = [1]\n        for i in range(64):\n            s.extend(s)\n",
+    "        x = 3\n        for i in range(64):\n            x = x ** 64\n",
+    "        x = 3\n        for i in range(64):\n            x *= x\n",
+    "        a = [1]\n        for i in range(64):\n            a = [a, a]\n",
+    "        a = []\n        a.append(a)\n        b = a + [1]\n",
+    "        g = VGroup(Dot())\n        for i in range(64):\n            g.add(*g)\n",
+    "        s = '%*d' % (10 ** 9, 1)\n",
+    "        s = [0 for a in range(10000) for b in range(10000)]\n",
+])
+def test_values_that_explode_become_unknown(body):
+    analysis = analyze(
+        "    def construct(self):\n"
+        f"{body}"
+        "        self.wait(2)\n"
+    )
+    assert analysis["duration"] == 2
+
+
+def test_analysis_stops_at_the_time_budget(monkeypatch):
+    monkeypatch.setattr("render_worker.timeline.MAX_SECONDS", 0.0)
+    analysis = analyze("    def construct(self):\n        self.wait()\n        self.wait()\n")
+    assert analysis["timeline"] == []
+    assert "stopped after 0 s" in analysis["notes"][0]
@@ -0,0 +1,55 @@
+import pytest
+
+from render_worker.settings import TEMPLATES_DIR
+from render_worker.variants import common_prefix, plan_prefixes
+
+
+def test_common_prefix():
+    assert common_prefix([["a", "b", "c"], ["a", "b", "d"], ["a", "b"]]) == 2
+    assert common_prefix([["a"], ["b"]]) == 0
+
+
+def test_plan_prefixes_groups_by_first_play():
+    hash_lists = [["t", "x", "1"], ["t", "x", "2"], ["u", "y"], ["t", "z"], []]
+    assert plan_prefixes(hash_lists) == [([0, 1, 3], 1)]
+
+
+def play_hashes(template, scene_name, media_dir, params=None):
+    from manim import tempconfig
+
+    from render_worker.playback import play_scene
+    from render_worker.registry import parameterize
+    from render_worker.scenes import load_scene_class
+
+    with tempconfig({"media_dir": str(media_dir)}):
+        scene_cls = load_scene_class(TEMPLATES_DIR / f"{template}.py", scene_name)
+        if params is not None:
+            scene_cls = parameterize(scene_cls, template, params)
+        return [play["hash"] for play in play_scene(scene_cls, hashes=True)]
+
+
+def tree(p):
+    return {"tree": [{"label": "A", "prob": p}, {"label": "B", "prob": round(1 - p, 2)}]}
+
+
+@pytest.mark.parametrize("template, scenes", [
+    # Each opens with its own title
+    ("probability_tree", ["CoinFlipTree", "WeatherTree", "MedicalTestTree"]),
+    ("function_graph", ["FunctionGraphScene", "ParabolaWithTangent"]),
+])
+def test_differently_titled_variants_share_nothing(template, scenes, tmp_path):
+    pytest.importorskip("manim")
+    hash_lists = [play_hashes(template, scene, tmp_path) for scene in scenes]
+    assert plan_prefixes(hash_lists) == []
+
+
+@pytest.mark.parametrize("template, scene, variants, shared", [
+    # Title, wait, start node, wait
+    ("probability_tree", "ProbabilityTreeScene", [tree(0.5), tree(0.3)], 4),
+    # Title, axes
+    ("function_graph", "FunctionGraphScene", [{"function": "x**2"}, {"function": "x**3"}], 2),
+])
+def test_params_under_a_common_title_share_their_opening(template, scene, variants, shared, tmp_path):
+    pytest.importorskip("manim")
+    hash_lists = [play_hashes(template, scene, tmp_path, params) for params in variants]
+    assert plan_prefixes(hash_lists) == [(list(range(len(variants))), shared)]
@@ -1,6 +1,10 @@
 /**
  * Upload Pre-rendered Animations to Supabase Storage
  *
+ * Uploads the videos listed in pre-rendered/manifest.json (written by
+ * pre-render-library.sh) and the manifest itself. Videos whose hash matches
+ * the last upload (pre-rendered/.uploaded.json) are skipped.
+ *
  * Prerequisites:
  * 1. Run pre-render-library.sh first
  * 2. Create 'animations' bucket in Supabase (public-read)
@@ -13,8 +17,12 @@
 import * as fs from 'fs';
 import * as path from 'path';
 import { supabaseAdmin } from '@/lib/supabase-server';
+import { AnimationManifest, missingFromManifest } from '@/lib/animation-library';
 
 const PRE_RENDERED_DIR = path.join(__dirname, '../manim-sandbox/pre-rendered');
+const MANIFEST_FILE = path.join(PRE_RENDERED_DIR, 'manifest.json');
+// filename -> sha256 of the last successful upload
+const UPLOADED_FILE = path.join(PRE_RENDERED_DIR, '.uploaded.json');
 const BUCKET_NAME = 'animations';
 
 async function ensureBucketExists(): Promise<void> {
@@ -40,12 +48,12 @@ async function ensureBucketExists(): Promise<void> {
   }
 }
 
-async function uploadFile(filename: string): Promise<void> {
+async function uploadFile(filename: string, contentType: string = 'video/mp4'): Promise<boolean> {
   const filePath = path.join(PRE_RENDERED_DIR, filename);
 
   if (!fs.existsSync(filePath)) {
     console.log(`  ✗ File not found: ${filename}`);
-    return;
+    return false;
   }
 
   const fileBuffer = fs.readFileSync(filePath);
@@ -56,14 +64,23 @@ async function uploadFile(filename: string): Promise<void> {
   const { data, error } = await supabaseAdmin.storage
     .from(BUCKET_NAME)
     .upload(filename, fileBuffer, {
-      contentType: 'video/mp4',
+      contentType,
       upsert: true,  // Overwrite if exists
     });
 
   if (error) {
     console.log(`  ✗ Failed: ${error.message}`);
-  } else {
-    console.log(`  ✓ Uploaded successfully`);
+    return false;
+  }
+  console.log(`  ✓ Uploaded successfully`);
+  return true;
+}
+
+function readJson<T>(file: string, fallback: T): T {
+  try {
+    return JSON.parse(fs.readFileSync(file, 'utf-8'));
+  } catch {
+    return fallback;
   }
 }
 
@@ -71,49 +88,63 @@ async function main() {
   console.log('🎬 Animation Upload Script');
   console.log('');
 
-  // Check pre-rendered directory exists
-  if (!fs.existsSync(PRE_RENDERED_DIR)) {
-    console.error('Error: pre-rendered directory not found!');
+  // Check the manifest exists
+  if (!fs.existsSync(MANIFEST_FILE)) {
+    console.error('Error: pre-rendered/manifest.json not found!');
     console.error('Run ./scripts/pre-render-library.sh first');
     process.exit(1);
   }
 
-  // Get list of MP4 files
-  const files = fs
-    .readdirSync(PRE_RENDERED_DIR)
-    .filter((f) => f.endsWith('.mp4'))
-    .sort();
+  const manifest = readJson<AnimationManifest>(MANIFEST_FILE, { quality: '', manim_version: '', animations: {} });
+  const uploaded = readJson<Record<string, string>>(UPLOADED_FILE, {});
+  const entries = Object.values(manifest.animations).sort((a, b) => a.filename.localeCompare(b.filename));
 
-  if (files.length === 0) {
-    console.error('Error: No MP4 files found in pre-rendered directory!');
+  if (entries.length === 0) {
+    console.error('Error: The manifest lists no animations!');
     console.error('Run ./scripts/pre-render-library.sh first');
     process.exit(1);
   }
 
-  console.log(`Found ${files.length} animations to upload`);
+  const missing = missingFromManifest(manifest);
+  if (missing.length > 0) {
+    console.log(`⚠️  Not rendered yet: ${missing.join(', ')}`);
+  }
+
+  // Only videos that changed since the last upload
+  const files = entries.filter((entry) => uploaded[entry.filename] !== entry.sha256);
+  console.log(`Found ${entries.length} animations, ${files.length} changed since the last upload`);
   console.log('');
 
   // Ensure bucket exists
   await ensureBucketExists();
   console.log('');
 
-  // Upload each file
+  // Upload each changed file
   let successCount = 0;
   let failCount = 0;
 
   for (let i = 0; i < files.length; i++) {
-    const file = files[i];
-    console.log(`[${i + 1}/${files.length}] ${file}`);
+    const entry = files[i];
+    console.log(`[${i + 1}/${files.length}] ${entry.filename}`);
 
     try {
-      await uploadFile(file);
-      successCount++;
+      if (await uploadFile(entry.filename)) {
+        uploaded[entry.filename] = entry.sha256;
+        fs.writeFileSync(UPLOADED_FILE, JSON.stringify(uploaded, null, 2));
+        successCount++;
+      } else {
+        failCount++;
+      }
     } catch (error) {
       console.log(`  ✗ Error: ${error}`);
       failCount++;
     }
   }
 
+  // The app reads durations and cache-busting hashes from the manifest
+  console.log('manifest.json');
+  await uploadFile('manifest.json', 'application/json');
+
   console.log('');
   console.log('📊 Upload Summary');
   console.log(`  Success: ${successCount}`);
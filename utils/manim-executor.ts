@@ -7,17 +7,64 @@ import { supabaseAdmin } from '@/lib/supabase-server';
 
 const execAsync = promisify(exec);
 
+// Warm render worker (manim-sandbox/render_worker). When unset, every render
+// spawns a fresh `manim` CLI process instead.
+const MANIM_WORKER_URL = process.env.MANIM_WORKER_URL;
+const RENDER_TIMEOUT_MS = 180000; // 180 second timeout (3 minutes for complex animations)
+// Used by the CLI fallback for template renders
+const MANIM_SANDBOX_DIR = process.env.MANIM_SANDBOX_DIR || path.join(process.cwd(), 'manim-sandbox');
+
+// Renders that fell back to the CLI because the worker was unreachable.
+// A configured worker should never need this; GET /health reports it.
+const workerFallbacks = { count: 0, lastAt: null as string | null, lastError: null as string | null };
+
+export function getWorkerFallbacks() {
+  return { workerUrl: MANIM_WORKER_URL || null, ...workerFallbacks };
+}
+
 export interface ManimExecutionResult {
   success: boolean;
   videoPath?: string;
   error?: string;
   logs?: string;
+  // Template params rejected by the render worker's schema
+  invalidParams?: boolean;
+  // Generated code raised during the worker's preflight, before rendering
+  failedPreflight?: boolean;
 }
 
+// What to render: generated code, or a parameterised template
+// (see GET /templates on the render worker for the parameter schemas).
+// `preflight` has the worker run the code once without rendering first.
+export type RenderSource =
+  | { code: string; preflight?: boolean }
+  | { template: string; params: Record<string, unknown> };
+
 export async function executeManimCode(
   code: string,
   outputName: string = `animation_${Date.now()}`,
+  quality: 'low' | 'medium' | 'high' = 'medium',
+  options: { preflight?: boolean } = {}
+): Promise<ManimExecutionResult> {
+  return executeRender({ code, preflight: options.preflight }, outputName, quality);
+}
+
+/**
+ * Render a production template from JSON parameters, skipping code generation.
+ */
+export async function executeTemplate(
+  template: string,
+  params: Record<string, unknown>,
+  outputName: string = `animation_${Date.now()}`,
   quality: 'low' | 'medium' | 'high' = 'medium'
+): Promise<ManimExecutionResult> {
+  return executeRender({ template, params }, outputName, quality);
+}
+
+async function executeRender(
+  source: RenderSource,
+  outputName: string,
+  quality: 'low' | 'medium' | 'high'
 ): Promise<ManimExecutionResult> {
   const tempDir = path.join(os.tmpdir(), 'manim_render_' + Date.now());
   const sceneFile = path.join(tempDir, 'scene.py');
@@ -27,33 +74,34 @@ export async function executeManimCode(
     // Create temp directory
     fs.mkdirSync(tempDir, { recursive: true });
 
-    // Validate code before writing
-    if (!code.includes('class GeneratedScene')) {
-      throw new Error('Code must contain GeneratedScene class');
-    }
-
-    if (!code.includes('def construct')) {
-      throw new Error('Code must contain construct method');
-    }
+    if ('code' in source) {
+      const { code } = source;
 
-    // Write code to file
-    fs.writeFileSync(sceneFile, code);
+      // Validate code before writing
+      if (!code.includes('class GeneratedScene')) {
+        throw new Error('Code must contain GeneratedScene class');
+      }
 
-    console.log('Executing Manim code...');
-    console.log('Temp dir:', tempDir);
-    console.log('Code preview:', code.substring(0, 200) + '...');
+      if (!code.includes('def construct')) {
+        throw new Error('Code must contain construct method');
+      }
 
-    // Build Manim command with quality flag
-    const qualityFlag = quality === 'low' ? '-ql' : quality === 'high' ? '-qh' : '-qm';
-    const manimCommand = `cd "${tempDir}" && manim ${qualityFlag} --format=mp4 --media_dir="${outputDir}" scene.py GeneratedScene`;
+      // Write code to file
+      fs.writeFileSync(sceneFile, code);
 
-    console.log('Running command:', manimCommand);
+      console.log('Executing Manim code...');
+      console.log('Temp dir:', tempDir);
+      console.log('Code preview:', code.substring(0, 200) + '...');
+    } else {
+      // Template names end up in a shell command on the CLI path
+      if (!/^[A-Za-z0-9_]+$/.test(source.template)) {
+        throw new Error(`Invalid template name: ${source.template}`);
+      }
+      console.log('Rendering template:', source.template, JSON.stringify(source.params));
+    }
 
     try {
-      const { stdout, stderr } = await execAsync(manimCommand, {
-        timeout: 180000, // 180 second timeout (3 minutes for complex animations)
-        maxBuffer: 20 * 1024 * 1024, // 20MB buffer for output (Manim can be verbose)
-      });
+      const { stdout, stderr } = await runManim(source, quality, tempDir, outputDir);
 
       console.log('Manim execution completed');
       if (stderr) console.log('Manim stderr (progress info):', stderr.substring(0, 500));
@@ -124,6 +172,27 @@ export async function executeManimCode(
     } catch (execError: any) {
       console.error('❌ Manim execution error:', execError);
 
+      // Template params rejected before rendering
+      if (execError.invalidParams || execError.stdout?.includes('TemplateParamsError')) {
+        return {
+          success: false,
+          error: execError.message,
+          logs: execError.stdout || '',
+          invalidParams: true,
+        };
+      }
+
+      // Generated code raised when run without rendering
+      if (execError.failedPreflight) {
+        const line = execError.sceneLine ? ` (line ${execError.sceneLine})` : '';
+        return {
+          success: false,
+          error: `Scene failed before rendering${line}: ${execError.message}`,
+          logs: execError.stderr || execError.message,
+          failedPreflight: true,
+        };
+      }
+
       // Check for timeout
       if (execError.killed && execError.signal === 'SIGTERM') {
         return {
@@ -213,7 +282,7 @@ export async function executeManimCode(
       };
     }
   } catch (error: any) {
-    console.error('❌ Error in executeManimCode:', error);
+    console.error('❌ Error in executeRender:', error);
 
     // Cleanup on error
     if (fs.existsSync(tempDir)) {
@@ -232,6 +301,99 @@ export async function executeManimCode(
   }
 }
 
+/**
+ * Render the scene, preferring the warm worker pool and falling back to the CLI.
+ * Errors are thrown in the same shape as exec() errors (stdout/stderr/killed)
+ * so both paths share the error handling in executeManimCode.
+ */
+async function runManim(
+  source: RenderSource,
+  quality: 'low' | 'medium' | 'high',
+  tempDir: string,
+  outputDir: string
+): Promise<{ stdout: string; stderr: string }> {
+  if (MANIM_WORKER_URL) {
+    let response: Response | undefined;
+    try {
+      console.log('Rendering with warm worker:', MANIM_WORKER_URL);
+      response = await fetch(`${MANIM_WORKER_URL}/render`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        // Generated code is checked before it takes a render slot: its
+        // estimated render time must fit the timeout (else a lower quality is
+        // used), and when the caller asks, it is run once without rendering
+        // so a scene that raises fails in a second or two
+        body: JSON.stringify({
+          ...source,
+          quality,
+          media_dir: outputDir,
+          preflight: 'code' in source && Boolean(source.preflight),
+          admission: 'code' in source,
+        }),
+        signal: AbortSignal.timeout(RENDER_TIMEOUT_MS + 10000),
+      });
+    } catch (fetchError) {
+      workerFallbacks.count += 1;
+      workerFallbacks.lastAt = new Date().toISOString();
+      workerFallbacks.lastError = String(fetchError);
+      console.error(
+        `🚨 Render worker unreachable, falling back to manim CLI (${workerFallbacks.count} fallbacks so far):`,
+        fetchError
+      );
+    }
+
+    if (response) {
+      const result = await response.json();
+      if (result.admission?.decision === 'downgrade') {
+        console.warn(`⚠️ Rendered at ${result.admission.quality} quality to fit the render timeout`);
+      }
+      if (!result.success) {
+        const workerError: any = new Error(result.error || `Render worker returned ${response.status}`);
+        workerError.stdout = result.logs || '';
+        workerError.stderr = result.traceback || result.error || '';
+        if (response.status === 400) {
+          workerError.invalidParams = true;
+        }
+        if (result.preflight) {
+          workerError.failedPreflight = true;
+          workerError.sceneLine = result.scene_line;
+        }
+        if (result.timed_out) {
+          workerError.killed = true;
+          workerError.signal = 'SIGTERM';
+        }
+        throw workerError;
+      }
+      return { stdout: result.logs || '', stderr: '' };
+    }
+  }
+
+  if ('template' in source) {
+    // The render worker CLI validates and applies the params itself
+    const paramsFile = path.join(tempDir, 'params.json');
+    fs.writeFileSync(paramsFile, JSON.stringify(source.params));
+    const workerCommand = `cd "${MANIM_SANDBOX_DIR}" && python3 -m render_worker render --template "${source.template}" --params "@${paramsFile}" --quality ${quality} --media-dir "${outputDir}"`;
+
+    console.log('Running command:', workerCommand);
+
+    return execAsync(workerCommand, {
+      timeout: RENDER_TIMEOUT_MS,
+      maxBuffer: 20 * 1024 * 1024,
+    });
+  }
+
+  // Build Manim command with quality flag
+  const qualityFlag = quality === 'low' ? '-ql' : quality === 'high' ? '-qh' : '-qm';
+  const manimCommand = `cd "${tempDir}" && manim ${qualityFlag} --format=mp4 --media_dir="${outputDir}" scene.py GeneratedScene`;
+
+  console.log('Running command:', manimCommand);
+
+  return execAsync(manimCommand, {
+    timeout: RENDER_TIMEOUT_MS,
+    maxBuffer: 20 * 1024 * 1024, // 20MB buffer for output (Manim can be verbose)
+  });
+}
+
 function findVideoFiles(dir: string): string[] {
   const videoFiles: string[] = [];
 
@@ -1,5 +1,9 @@
 import { anthropic } from '@/lib/anthropic';
 
+// Render worker (manim-sandbox/render_worker). When set, timing checks use its
+// static timeline analysis instead of the regexes in regexDuration.
+const MANIM_WORKER_URL = process.env.MANIM_WORKER_URL;
+
 export interface ManimGenerationRequest {
   context: string;
   duration?: number; // Target duration in seconds
@@ -128,7 +132,7 @@ Return ONLY the Python code, no markdown formatting:`;
     code = cleanManimCode(code);
 
     // Validate the code
-    validateManimCode(code, duration);
+    await validateManimCode(code, duration);
 
     return code;
   } catch (error) {
@@ -171,7 +175,7 @@ function cleanManimCode(code: string): string {
   return cleaned;
 }
 
-function validateManimCode(code: string, expectedDuration: number): void {
+async function validateManimCode(code: string, expectedDuration: number): Promise<void> {
   // Check for required elements
   if (!code.includes('def construct(self):')) {
     throw new Error('Generated code must have a construct method');
@@ -181,13 +185,49 @@ function validateManimCode(code: string, expectedDuration: number): void {
     throw new Error('Generated code must contain at least one animation');
   }
 
-  // Rough timing validation: count animations and check timing
-  const playMatches = code.match(/self\.play\(/g);
-  const numPlays = playMatches ? playMatches.length : 0;
+  const totalRunTime = await estimateDuration(code);
+
+  // Check if timing is roughly correct (allow 30% margin)
+  const minDuration = expectedDuration * 0.6;
+  const maxDuration = expectedDuration * 1.5;
 
-  if (numPlays === 0) {
-    throw new Error('No animations found in generated code');
+  if (totalRunTime < minDuration || totalRunTime > maxDuration) {
+    console.warn(`⚠️  Generated animation timing (${totalRunTime.toFixed(1)}s) differs from expected (${expectedDuration}s)`);
   }
+}
+
+/**
+ * Total run time of the generated scene. The render worker's estimate follows
+ * default run_times, waits, loops and helper methods; without a worker the
+ * run_time= and self.wait(...) literals are summed.
+ */
+async function estimateDuration(code: string): Promise<number> {
+  if (MANIM_WORKER_URL) {
+    try {
+      const response = await fetch(`${MANIM_WORKER_URL}/estimate`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ code, quality: 'low' }),
+        signal: AbortSignal.timeout(5000),
+      });
+      const result = await response.json();
+      if (result.success) {
+        if (result.notes?.length) {
+          console.warn('⚠️  Timeline estimate is partial:', result.notes.join('; '));
+        }
+        return result.duration;
+      }
+    } catch (error) {
+      console.warn('⚠️ Render worker unreachable, estimating timing with regexes:', error);
+    }
+  }
+  return regexDuration(code);
+}
+
+function regexDuration(code: string): number {
+  // Rough timing: count animations and sum literal run times
+  const playMatches = code.match(/self\.play\(/g);
+  const numPlays = playMatches ? playMatches.length : 0;
 
   // Extract run_time values
   const runTimeMatches = code.match(/run_time\s*=\s*([\d.]+)/g);
@@ -216,13 +256,7 @@ function validateManimCode(code: string, expectedDuration: number): void {
     });
   }
 
-  // Check if timing is roughly correct (allow 30% margin)
-  const minDuration = expectedDuration * 0.6;
-  const maxDuration = expectedDuration * 1.5;
-
-  if (totalRunTime < minDuration || totalRunTime > maxDuration) {
-    console.warn(`⚠️  Generated animation timing (${totalRunTime.toFixed(1)}s) differs from expected (${expectedDuration}s)`);
-  }
+  return totalRunTime;
 }
 
 export function createFallbackAnimation(context: string, duration: number = 12): string {
@@ -115,7 +115,7 @@ export const ANIMATION_TEMPLATES: AnimationTemplate[] = [
 export function buildAnimationModePrompt(
   question: string,
   chunks: TranscriptChunk[],
-  prerenderedSuggestion?: { title: string; description: string; filename: string } | null
+  prerenderedSuggestion?: { title: string; description: string; filename: string; duration?: number } | null
 ): { system: string; user: string } {
   const templatesDesc = ANIMATION_TEMPLATES.map(
     (t) => `- ${t.name}: ${t.description} (params: ${t.parameters.join(', ')})`
@@ -126,7 +126,7 @@ export function buildAnimationModePrompt(
     ? `\n\n🎯 PRE-RENDERED MATCH FOUND (INSTANT, PREFERRED):
 Title: ${prerenderedSuggestion.title}
 Description: ${prerenderedSuggestion.description}
-Filename: ${prerenderedSuggestion.filename}
+Filename: ${prerenderedSuggestion.filename}${prerenderedSuggestion.duration ? `\nDuration: ${prerenderedSuggestion.duration.toFixed(0)} seconds` : ''}
 
 This animation is ALREADY RENDERED and can be served INSTANTLY. Only use custom rendering if this pre-rendered animation is clearly insufficient for the student's question.`
     : '';